@@ -0,0 +1,94 @@
+# src/benchmarks/calibration_capture_bench.py
+# Passo 'S' da calibração com olhar sintético (ruído dos landmarks,
+# micro-sacadas e piscadas que puxam o pitch para baixo): erro do offset
+# calculado com um único frame (clique do assistente num instante qualquer)
+# vs a captura automática (tracking/calibration_capture.py), e o tempo até
+# a captura terminar. O passo 'C' usa a mesma captura sobre outro sinal.
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.calibration_capture_bench --trials 500
+
+import argparse
+import random
+import sys
+
+import numpy as np
+
+from tracking.calibration_capture import CalibrationCapture, trimmed_mean
+
+FPS = 30.0
+MAX_SECONDS = 10.0
+
+
+def synthetic_frames(rng, noise_deg, blink_every, saccade_every):
+    """Gera (t, yaw, pitch, olhos abertos) com o olhar verdadeiro em (0, 0)."""
+    t = 0.0
+    offset = (0.0, 0.0)
+    blink_left = saccade_left = 0
+    while True:
+        t += 1.0 / FPS
+        if blink_left == 0 and rng.random() < 1.0 / (blink_every * FPS):
+            blink_left = 6  # ~200 ms
+        if saccade_left == 0 and rng.random() < 1.0 / (saccade_every * FPS):
+            saccade_left = 4
+            offset = (rng.uniform(-2.5, 2.5), rng.uniform(-2.5, 2.5))
+        yaw = rng.gauss(0, noise_deg)
+        pitch = rng.gauss(0, noise_deg)
+        closing = blink_left > 0
+        if closing:
+            pitch -= 8.0 * (1 - abs(blink_left - 3) / 3)  # Pálpebra puxa a íris para baixo
+            blink_left -= 1
+        if saccade_left > 0:
+            yaw, pitch = yaw + offset[0], pitch + offset[1]
+            saccade_left -= 1
+        eyes_open = not closing or blink_left in (0, 5)  # Primeiro/último frame ainda passam no EAR
+        yield t, yaw, pitch, eyes_open
+
+
+def run(rng, trials, noise_deg, blink_every, saccade_every):
+    single, auto, durations, restarts = [], [], [], []
+    for _ in range(trials):
+        frames = synthetic_frames(rng, noise_deg, blink_every, saccade_every)
+        click_at = rng.uniform(0.5, 3.0)  # Assistente clica num instante qualquer
+        capture = CalibrationCapture('S')
+        single_err = None
+        for t, yaw, pitch, eyes_open in frames:
+            if single_err is None and t >= click_at:
+                single_err = np.hypot(yaw, pitch)
+            if capture.update((yaw, pitch), (yaw, pitch), t, eyes_open) or t > MAX_SECONDS:
+                break
+        if capture.done:
+            auto.append(np.hypot(*trimmed_mean(capture.samples)))
+            durations.append(t)
+            restarts.append(capture.restarts)
+        if single_err is None:
+            single_err = np.hypot(yaw, pitch)
+        single.append(single_err)
+    return np.array(single), np.array(auto), np.array(durations), np.array(restarts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Captura automática da calibração vs frame único.")
+    parser.add_argument("--trials", type=int, default=500)
+    parser.add_argument("--noise", type=float, default=0.7, help="Ruído do olhar por frame (graus)")
+    parser.add_argument("--blink-every", type=float, default=3.0, help="Intervalo médio entre piscadas (s)")
+    parser.add_argument("--saccade-every", type=float, default=2.0, help="Intervalo médio entre micro-sacadas (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    single, auto, durations, restarts = run(random.Random(args.seed), args.trials, args.noise,
+                                            args.blink_every, args.saccade_every)
+    print("== passo S: erro do offset (graus) ==")
+    print(f"  frame único            média {single.mean():.2f}, p95 {np.percentile(single, 95):.2f}, "
+          f"máx {single.max():.2f}")
+    if len(auto):
+        print(f"  captura automática     média {auto.mean():.2f}, p95 {np.percentile(auto, 95):.2f}, "
+              f"máx {auto.max():.2f}")
+        print(f"  tempo até concluir     média {durations.mean():.2f} s, p95 {np.percentile(durations, 95):.2f} s")
+        print(f"  janelas descartadas    média {restarts.mean():.2f} por passo")
+    print(f"  capturas concluídas    {len(auto)}/{args.trials} (limite {MAX_SECONDS:.0f} s)")
+    return 0 if len(auto) == args.trials else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
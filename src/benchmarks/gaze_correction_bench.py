@@ -0,0 +1,91 @@
+# src/benchmarks/gaze_correction_bench.py
+# Recalibração implícita (tracking/gaze_correction.py) numa sessão simulada:
+# o olhar medido deriva (deslocamento que cresce + erro de ganho) e cada
+# clique num widget vira amostra; parte dos cliques é no widget vizinho
+# (rótulo errado). Compara o erro na tela sem correção e com a correção RLS.
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.gaze_correction_bench --clicks 400 --mislabel 0.1
+
+import argparse
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+from tracking import monitor_core as mc
+from tracking.gaze_correction import GazeCorrection
+
+SCREEN = (1920, 1080)
+GRID = (6, 4)  # Widgets (colunas x linhas) espalhados pela tela
+
+
+def widget_centers():
+    cols, rows = GRID
+    return [((i + 0.5) * SCREEN[0] / cols, (j + 0.5) * SCREEN[1] / rows)
+            for i in range(cols) for j in range(rows)]
+
+
+def drift(t):
+    """Deriva do olhar medido no instante t (0..1 da sessão): (ganho yaw, ganho pitch, bias yaw, bias pitch)."""
+    return 1.0 + 0.08 * t, 1.0 - 0.05 * t, 2.5 * t, -1.2 * t + 0.4 * math.sin(6 * t)
+
+
+def angle_error_px(yaw, pitch, target):
+    """Distância (px) entre o ponto dos ângulos e o alvo, sem o clamp da borda."""
+    tx, ty = target
+    x = (yaw + mc.SCREEN_YAW_HALF_RANGE_DEG) / (2 * mc.SCREEN_YAW_HALF_RANGE_DEG) * SCREEN[0]
+    y = (mc.SCREEN_PITCH_HALF_RANGE_DEG - pitch) / (2 * mc.SCREEN_PITCH_HALF_RANGE_DEG) * SCREEN[1]
+    return math.hypot(x - tx, y - ty)
+
+
+def run(rng, n_clicks, mislabel, noise_deg):
+    centers = widget_centers()
+    correction = GazeCorrection()
+    raw_err, corrected_err = [], []
+    update_s = 0.0
+    for k in range(n_clicks):
+        t = k / max(1, n_clicks - 1)
+        gain_yaw, gain_pitch, bias_yaw, bias_pitch = drift(t)
+        target = rng.choice(centers)
+        true_yaw, true_pitch = mc.screen_to_gaze_angles(*target)
+        yaw = gain_yaw * true_yaw + bias_yaw + rng.gauss(0, noise_deg)
+        pitch = gain_pitch * true_pitch + bias_pitch + rng.gauss(0, noise_deg)
+
+        raw_err.append(angle_error_px(yaw, pitch, target))
+        corrected_err.append(angle_error_px(*correction.apply(yaw, pitch), target))
+
+        # O clique confirmado às vezes cai no vizinho: rótulo errado
+        label = target
+        if rng.random() < mislabel:
+            label = min((c for c in centers if c != target),
+                        key=lambda c: math.hypot(c[0] - target[0], c[1] - target[1]))
+        t0 = time.perf_counter()
+        correction.update(yaw, pitch, *mc.screen_to_gaze_angles(*label))
+        update_s += time.perf_counter() - t0
+    return np.array(raw_err), np.array(corrected_err), correction, update_s / n_clicks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da recalibração implícita por cliques.")
+    parser.add_argument("--clicks", type=int, default=400)
+    parser.add_argument("--mislabel", type=float, default=0.1, help="Fração de cliques no widget vizinho")
+    parser.add_argument("--noise", type=float, default=0.4, help="Ruído do olhar (graus, desvio padrão)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    mc.MONITOR_WIDTH, mc.MONITOR_HEIGHT = SCREEN  # Sem consultar a tela real
+    raw, corrected, correction, update_s = run(random.Random(args.seed), args.clicks, args.mislabel, args.noise)
+    last = slice(len(raw) // 2, None)  # Segunda metade: deriva já grande
+    print("== recalibração implícita ==")
+    print(f"  erro sem correção      média {raw.mean():.0f} px, 2ª metade {raw[last].mean():.0f} px")
+    print(f"  erro com correção      média {corrected.mean():.0f} px, 2ª metade {corrected[last].mean():.0f} px")
+    print(f"  amostras               {correction.samples} aceitas, {correction.rejected} descartadas")
+    print(f"  custo por clique       {1e6 * update_s:.1f} µs")
+    return 0 if corrected[last].mean() < raw[last].mean() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# src/benchmarks/gaze_history_bench.py
+# GazeHistory (tracking/gaze_history.py) com um escritor e vários leitores
+# em threads: custo do append e das consultas por tempo, e verificação de
+# que nenhuma view lida tem amostras incompletas ou fora de ordem.
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.gaze_history_bench --seconds 3 --readers 3
+
+import argparse
+import sys
+import threading
+import time
+
+import numpy as np
+
+from tracking.gaze_history import GazeHistory
+
+
+def writer(history, stop, stats):
+    """Escreve amostras em que todos os campos derivam do instante (para checar consistência)."""
+    n = 0
+    t0 = time.perf_counter()
+    while not stop.is_set():
+        t = n / 30.0
+        history.append(t, (t, t, t), t, t, t, t, True)
+        n += 1
+        if n % 64 == 0:
+            time.sleep(0)  # Cede a vez aos leitores
+    stats["writes"] = n
+    stats["append_us"] = 1e6 * (time.perf_counter() - t0) / max(1, n)
+
+
+def reader(history, stop, stats, key):
+    reads = bad = 0
+    elapsed = 0.0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        view = history.last_ms(2000)
+        elapsed += time.perf_counter() - t0
+        if len(view) == 0:
+            continue
+        ts = view["t"]
+        consistent = (np.all(np.diff(ts) > 0) and np.array_equal(view["x"], ts.astype(np.float32))
+                      and np.array_equal(view["dir"][:, 2], ts.astype(np.float32)))
+        bad += not consistent
+        reads += 1
+    stats[key] = (reads, bad, 1e6 * elapsed / max(1, reads))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do histórico do olhar.")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--readers", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    history = GazeHistory()
+    stop = threading.Event()
+    stats = {}
+    threads = [threading.Thread(target=writer, args=(history, stop, stats))]
+    threads += [threading.Thread(target=reader, args=(history, stop, stats, f"reader{i}"))
+                for i in range(args.readers)]
+    for th in threads:
+        th.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for th in threads:
+        th.join()
+
+    view = history.last_ms(2000)
+    print("== histórico do olhar ==")
+    print(f"  amostras escritas      {stats['writes']} ({stats['append_us']:.1f} µs por append)")
+    print(f"  janela de 2 s          {len(view)} amostras, view sem cópia: {view.base is not None}")
+    total_bad = 0
+    for i in range(args.readers):
+        reads, bad, us = stats[f"reader{i}"]
+        total_bad += bad
+        print(f"  leitor {i}               {reads} leituras, {bad} inconsistentes, {us:.1f} µs por consulta")
+    return 1 if total_bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
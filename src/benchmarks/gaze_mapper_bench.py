@@ -0,0 +1,226 @@
+# src/benchmarks/gaze_mapper_bench.py
+# Compara os mapeadores olhar -> tela (tracking/gaze_mappers.py) sobre
+# sessões de calibração multiponto gravadas (profiles/*_pontos.npz, salvas
+# ao fim de cada calibração com pontos) ou, sem gravações, sobre sessões
+# sintéticas: monitor real (53x30 cm a ~60 cm) diferente do plano virtual do
+# passo C (60x40 cm a 50 cm), cabeça mexendo e ruído no olhar de cada olho.
+# Cada mapeador é ajustado deixando um ponto de fora e avaliado nele (erro
+# em px, média e p95), e o custo de map() é medido por frame.
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.gaze_mapper_bench                      # gravações ou sintético
+#   python -m benchmarks.gaze_mapper_bench --sessions a.npz b.npz
+#   python -m benchmarks.gaze_mapper_bench --synthetic 50 --points 16
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from tracking import monitor_core as mc
+from tracking import calibration
+from tracking.gaze_mappers import GazeFrame, GAZE_MAPPERS, gaze_features
+from tracking.screen_mapping import calibration_points
+
+SCREEN = (1920, 1080)
+FRAME = (640, 480)
+UNITS_PER_CM = 5.0     # Escala do plano do passo C sem landmarks (create_monitor_plane)
+FRAMES_PER_POINT = 20  # Mesma janela da captura (calibration_capture.CAPTURE_FRAMES)
+
+
+# --- Sessões ---
+
+def load_session(path):
+    """Sessão gravada pelo tracker (EyeTracker.save_calibration_session)."""
+    data = np.load(path)
+    frames = [GazeFrame(d, tuple(a), o, f) for d, a, o, f in
+              zip(data["direction"], data["angles"], data["origin"], data["features"])]
+    return {"name": os.path.basename(path), "frames": frames, "target": data["target"],
+            "point": data["point"], "calibration": json.loads(str(data["calibration"]))}
+
+
+def _rotation(yaw_deg, pitch_deg):
+    """Rotação (yaw em torno de y, depois pitch em torno de x)."""
+    cy, sy = np.cos(np.radians(yaw_deg)), np.sin(np.radians(yaw_deg))
+    cp, sp = np.cos(np.radians(pitch_deg)), np.sin(np.radians(pitch_deg))
+    return np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]]) @ np.array([[1, 0, 0], [0, cp, -sp], [0, sp, cp]])
+
+
+def synthetic_session(rng, n_points, noise_deg, head_cm):
+    """
+    Calibração sintética no referencial do tracker (x para a direita da
+    imagem, y para baixo, -z para a tela). O plano do passo C sai de
+    create_monitor_plane com a cabeça de frente; o monitor real tem outro
+    tamanho, distância e posição, e o olho tem um desvio próprio (kappa).
+    """
+    upc = UNITS_PER_CM
+    head0 = np.array([0.0, 0.0, 0.0])
+    corners, center, normal, _ = mc.create_monitor_plane(head0, np.eye(3), None, *FRAME)
+
+    distance = rng.uniform(55, 70) * upc
+    screen_center = np.array([rng.uniform(-4, 4), rng.uniform(-6, 0), -distance / upc]) * upc
+    screen_cm = np.array([53.0, 30.0]) * rng.uniform(0.9, 1.1)
+    kappa = rng.normal(0, 2.0, 2)  # Desvio do eixo visual (graus)
+
+    def screen_point(u, v):
+        # Tela vista da câmera: u cresce para -x do mundo, v para +y
+        return screen_center + upc * np.array([-(u - 0.5) * screen_cm[0], (v - 0.5) * screen_cm[1], 0.0])
+
+    def gaze_frame(u, v):
+        head = head0 + rng.normal(0, head_cm * upc, 3)
+        R = _rotation(*rng.normal(0, 3.0, 2))
+        dirs = []
+        for eye_x in (-3.2, 3.2):  # Olhos a ~6.4 cm um do outro
+            eye = head + R @ np.array([eye_x * upc, 0.0, 0.0])
+            ideal = mc._normalize(screen_point(u, v) - eye)
+            dirs.append(mc._normalize(_rotation(*(kappa + rng.normal(0, noise_deg, 2))) @ ideal))
+        direction = mc._normalize(dirs[0] + dirs[1])
+        scale = (distance - head[2]) / distance
+        features = gaze_features(dirs[0], dirs[1], (FRAME[0] / 2 + head[0], FRAME[1] / 2 + head[1]),
+                                 R, scale, *FRAME)
+        return GazeFrame(direction, mc.gaze_direction_to_angles(direction), head, features)
+
+    # Passo S: offsets pela média do olhar no centro
+    center_angles = np.mean([gaze_frame(0.5, 0.5).angles for _ in range(FRAMES_PER_POINT)], axis=0)
+    targets = calibration_points(n_points)
+    frames, target, point = [], [], []
+    for i, (u, v) in enumerate(targets):
+        for _ in range(FRAMES_PER_POINT):
+            frames.append(gaze_frame(u, v))
+            target.append((u, v))
+            point.append(i)
+    calib = {"calibration_offsets": {"yaw": -center_angles[0], "pitch": -center_angles[1]},
+             "monitor_plane": {"corners": np.array(corners).tolist(), "center": center.tolist(),
+                               "normal": normal.tolist(), "units_per_cm": upc}}
+    return {"name": "sintética", "frames": frames, "target": np.array(target), "point": np.array(point),
+            "calibration": calib}
+
+
+def session_context(calib):
+    """TrackerContext da sessão: offsets do passo S e plano do passo C gravados."""
+    ctx = mc.TrackerContext()
+    ctx.calibration_offset_yaw = float(calib["calibration_offsets"]["yaw"])
+    ctx.calibration_offset_pitch = float(calib["calibration_offsets"]["pitch"])
+    plane = calib["monitor_plane"]
+    ctx.set_monitor_plane(plane["corners"], plane["center"], plane["normal"], plane["units_per_cm"])
+    return ctx
+
+
+# --- Avaliação ---
+
+def error_px(mapper, frames, targets, ctx):
+    errors = []
+    for frame, (u, v) in zip(frames, targets):
+        uv = mapper.map(frame, ctx)
+        if uv is None:
+            errors.append(np.hypot(*SCREEN))  # Sem resposta conta como o pior caso
+            continue
+        pu, pv = np.clip(uv[0], 0, 1), np.clip(uv[1], 0, 1)  # O tracker também limita à tela
+        errors.append(np.hypot((pu - u) * SCREEN[0], (pv - v) * SCREEN[1]))
+    return errors
+
+
+def leave_one_point_out(kind, session, ctx):
+    """Erros (px) de cada frame com o mapeador ajustado sem o ponto do frame."""
+    frames, targets, points = session["frames"], session["target"], session["point"]
+    errors = []
+    for p in np.unique(points):
+        train = points != p
+        mapper = GAZE_MAPPERS[kind]()
+        try:
+            ok = mapper.fit([f for f, t in zip(frames, train) if t], [tuple(t) for t in targets[train]], ctx)
+        except (ValueError, np.linalg.LinAlgError):
+            ok = False
+        if not ok:
+            return None
+        test = ~train
+        errors += error_px(mapper, [f for f, t in zip(frames, test) if t], targets[test], ctx)
+    return errors
+
+
+def map_cost_us(mapper, frames, ctx, repeat=5):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            mapper.map(frame, ctx)
+    return 1e6 * (time.perf_counter() - t0) / (repeat * len(frames))
+
+
+def evaluate_session(session):
+    """Erros (px) por linha da tabela e custo de map() por mapeador, só com o contexto da sessão."""
+    ctx = session_context(session["calibration"])
+    frames, targets = session["frames"], session["target"]
+    rows, costs, notes = {}, {}, []
+    for kind in ("angular", "ray_plane"):
+        rows[f"{GAZE_MAPPERS[kind].label} (sem ajuste)"] = error_px(GAZE_MAPPERS[kind](), frames, targets, ctx)
+    for kind, cls in GAZE_MAPPERS.items():
+        errors = leave_one_point_out(kind, session, ctx)
+        if errors is None:
+            notes.append(f"  {session['name']}: '{kind}' não ajustável com {len(np.unique(session['point']))} pontos")
+            continue
+        rows[cls.label] = errors
+        mapper = cls()
+        mapper.fit(frames, [tuple(t) for t in targets], ctx)
+        costs[kind] = map_cost_us(mapper, frames, ctx)
+    return rows, costs, notes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara os mapeadores olhar -> tela.")
+    parser.add_argument("--sessions", nargs="*", help="Sessões .npz (padrão: profiles/*_pontos.npz)")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Sessões sintéticas (padrão: 30 se não houver gravações)")
+    parser.add_argument("--points", type=int, default=9, help="Pontos das sessões sintéticas (5, 9 ou 16)")
+    parser.add_argument("--noise", type=float, default=0.7, help="Ruído do olhar de cada olho (graus)")
+    parser.add_argument("--head", type=float, default=1.0, help="Movimento da cabeça (cm, desvio padrão)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Sessões avaliadas em paralelo (threads; o custo de map() passa a incluir a disputa)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paths = args.sessions
+    if paths is None:
+        paths = sorted(glob.glob(os.path.join(calibration.PROFILES_DIR, "*_pontos.npz")))
+    sessions = [load_session(p) for p in paths]
+    n_synthetic = args.synthetic or (0 if sessions else 30)
+    rng = np.random.default_rng(args.seed)
+    sessions += [synthetic_session(rng, args.points, args.noise, args.head) for _ in range(n_synthetic)]
+    if not sessions:
+        print("Nenhuma sessão para avaliar.")
+        return 1
+    print(f"{len(sessions) - n_synthetic} sessões gravadas, {n_synthetic} sintéticas")
+
+    # Cada sessão tem o próprio TrackerContext: as threads não compartilham estado
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        results = list(pool.map(evaluate_session, sessions))
+
+    rows = {f"{GAZE_MAPPERS[k].label} (sem ajuste)": [] for k in ("angular", "ray_plane")}
+    rows.update({GAZE_MAPPERS[k].label: [] for k in GAZE_MAPPERS})
+    costs = {k: [] for k in GAZE_MAPPERS}
+    for session_rows, session_costs, notes in results:
+        for name, errors in session_rows.items():
+            rows[name] += errors
+        for kind, cost in session_costs.items():
+            costs[kind].append(cost)
+        for note in notes:
+            print(note)
+
+    print("== erro na tela (px), ponto avaliado fora do ajuste ==")
+    for name, errors in rows.items():
+        if errors:
+            errors = np.array(errors)
+            print(f"  {name:<40} média {errors.mean():6.1f}, p95 {np.percentile(errors, 95):6.1f}")
+    print("== custo de map() ==")
+    for kind, values in costs.items():
+        if values:
+            print(f"  {GAZE_MAPPERS[kind].label:<40} {np.mean(values):6.1f} µs por frame")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
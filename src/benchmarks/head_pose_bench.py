@@ -0,0 +1,196 @@
+# src/benchmarks/head_pose_bench.py
+# Pose da cabeça pela PCA do nariz (monitor_core.pca_orientation, com a
+# estabilização por R_ref_nose) vs solvePnP contra o modelo 3D do rosto
+# (tracking/head_pose.py), iterativo com chute do frame anterior e SQPnP.
+# Mede o custo por frame e o jitter (variação da pose entre frames). Com
+# landmarks gravados não há pose verdadeira: o jitter inclui o movimento
+# real (grave com a cabeça parada). Sem gravação, gera um rosto sintético
+# (diferente do modelo canônico) com movimento conhecido e ruído nos
+# landmarks, e mede também o erro em relação à pose verdadeira.
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.head_pose_bench                          # sintético
+#   python -m benchmarks.head_pose_bench --record rosto.npz --camera 0 --frames 300
+#   python -m benchmarks.head_pose_bench --video rosto.mp4 --record rosto.npz
+#   python -m benchmarks.head_pose_bench --landmarks rosto.npz
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from tracking import monitor_core as mc
+from tracking.head_pose import PnPHeadPose, FACE_MODEL_INDICES, FACE_MODEL_POINTS
+
+FRAME = (640, 480)
+N_LANDMARKS = 478
+MM_PER_MODEL_UNIT = 0.21  # Modelo canônico em mm (nariz -> queixo ~ 70 mm)
+
+
+# --- Dados ---
+
+def record_landmarks(source, n_frames):
+    """Landmarks do FaceMesh (mesma configuração do tracker) de um vídeo ou câmera."""
+    import cv2
+    from tracking.face_mesh_warmup import create_face_mesh
+    cap = cv2.VideoCapture(source)
+    face_mesh = create_face_mesh()
+    frames = []
+    size = None
+    while len(frames) < n_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        size = frame.shape[1], frame.shape[0]
+        results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if results.multi_face_landmarks:
+            frames.append([(p.x, p.y, p.z) for p in results.multi_face_landmarks[0].landmark])
+    cap.release()
+    print(f"{len(frames)} frames com rosto gravados")
+    return np.array(frames), size
+
+
+def synthetic_landmarks(rng, n_frames, noise_px, depth_noise_px):
+    """
+    Rosto sintético a ~60 cm: os pontos do modelo canônico com proporções
+    e desvios próprios, e um nariz (24 pontos) em forma de cunha. A cabeça
+    fica parada no primeiro terço e depois gira (yaw ±25°, pitch ±15°,
+    roll ±8°). Devolve os landmarks normalizados como os do MediaPipe
+    (x, y em fração do frame; z em escala de x, relativo ao rosto) e as
+    rotações verdadeiras (cabeça -> câmera).
+    """
+    face = {}
+    scale = rng.uniform(0.9, 1.1, 3)
+    for index, point in zip(FACE_MODEL_INDICES, FACE_MODEL_POINTS):
+        face[index] = point * MM_PER_MODEL_UNIT * scale + rng.normal(0, 3.0, 3)
+    for index in mc.nose_indices:
+        if index in face:
+            continue
+        x = rng.uniform(-17, 17)   # Das asas do nariz...
+        y = rng.uniform(-38, 5)    # ...e da raiz (acima) até embaixo da ponta
+        face[index] = np.array([x, y, 25 * abs(x) / 17 + 8 * abs(y) / 38])  # Atrás da ponta (z = 0)
+    indices = np.array(list(face))
+    points = np.array([face[i] for i in indices])
+
+    f = FRAME[0]
+    distance = 600.0
+    t = np.arange(n_frames) / 30.0
+    moving = np.clip((np.arange(n_frames) - n_frames // 3) / (n_frames - n_frames // 3), 0, 1) > 0
+    angles = np.zeros((n_frames, 3))
+    angles[moving, 0] = 25 * np.sin(2 * np.pi * 0.25 * t[moving])
+    angles[moving, 1] = 15 * np.sin(2 * np.pi * 0.17 * t[moving])
+    angles[moving, 2] = 8 * np.sin(2 * np.pi * 0.11 * t[moving])
+
+    landmarks = np.zeros((n_frames, N_LANDMARKS, 3))
+    rotations = []
+    for k, (yaw, pitch, roll) in enumerate(np.radians(angles)):
+        cy, sy, cp, sp, cr, sr = np.cos(yaw), np.sin(yaw), np.cos(pitch), np.sin(pitch), np.cos(roll), np.sin(roll)
+        R = (np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]]) @ np.array([[1, 0, 0], [0, cp, -sp], [0, sp, cp]])
+             @ np.array([[cr, -sr, 0], [sr, cr, 0], [0, 0, 1]]))
+        rotations.append(R)
+        cam = points @ R.T + np.array([0.0, 0.0, distance])
+        u = f * cam[:, 0] / cam[:, 2] + FRAME[0] / 2 + rng.normal(0, noise_px, len(cam))
+        v = f * cam[:, 1] / cam[:, 2] + FRAME[1] / 2 + rng.normal(0, noise_px, len(cam))
+        z = f * (cam[:, 2] - distance) / distance + rng.normal(0, depth_noise_px, len(cam))
+        landmarks[k, indices] = np.stack([u / FRAME[0], v / FRAME[1], z / FRAME[0]], axis=1)
+    return landmarks, np.array(rotations)
+
+
+# --- Estimadores ---
+
+def run_pca(landmarks, size):
+    w, h = size
+    ref = [None]
+    rotations = []
+    t0 = time.perf_counter()
+    for frame in landmarks:
+        points = frame[mc.nose_indices] * (w, h, w)
+        rotations.append(mc.pca_orientation(points, ref))
+    return np.array(rotations), 1e6 * (time.perf_counter() - t0) / len(landmarks)
+
+
+def run_pnp(landmarks, size, method):
+    w, h = size
+    estimator = PnPHeadPose(method)
+    rotations = []
+    t0 = time.perf_counter()
+    for frame in landmarks:
+        rotation = estimator.estimate(frame[list(FACE_MODEL_INDICES), :2] * (w, h), w, h)
+        rotations.append(np.eye(3) if rotation is None else rotation)
+    return np.array(rotations), 1e6 * (time.perf_counter() - t0) / len(landmarks)
+
+
+def rotation_angle_deg(R):
+    """Ângulo (graus) de uma ou várias rotações."""
+    cos = (np.trace(R, axis1=-2, axis2=-1) - 1) / 2
+    return np.degrees(np.arccos(np.clip(cos, -1, 1)))
+
+
+def frame_to_frame_deg(rotations):
+    return rotation_angle_deg(np.einsum("nji,njk->nik", rotations[:-1], rotations[1:]))
+
+
+def error_to_truth_deg(rotations, truth):
+    """
+    Erro em relação à pose verdadeira, depois de alinhar o referencial do
+    estimador (cada um tem seus eixos: R_est = R_true @ C, C constante).
+    """
+    M = np.einsum("nji,njk->ik", truth, rotations) / len(truth)
+    U, _, Vt = np.linalg.svd(M)
+    C = U @ np.diag([1, 1, np.linalg.det(U @ Vt)]) @ Vt
+    residual = np.einsum("nji,njk->nik", truth, rotations) @ C.T
+    return rotation_angle_deg(residual), residual
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pose da cabeça: PCA do nariz vs solvePnP.")
+    parser.add_argument("--landmarks", help="Landmarks gravados (.npz de --record)")
+    parser.add_argument("--video", help="Vídeo para gravar landmarks (com --record)")
+    parser.add_argument("--camera", type=int, help="Câmera para gravar landmarks (com --record)")
+    parser.add_argument("--record", help="Grava os landmarks do vídeo/câmera neste .npz")
+    parser.add_argument("--frames", type=int, default=900)
+    parser.add_argument("--noise", type=float, default=0.7, help="Ruído sintético em x/y (px)")
+    parser.add_argument("--depth-noise", type=float, default=2.0, help="Ruído sintético em z (px)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    truth = None
+    if args.video is not None or args.camera is not None:
+        landmarks, size = record_landmarks(args.video if args.video is not None else args.camera, args.frames)
+        if args.record:
+            np.savez_compressed(args.record, landmarks=landmarks, frame_size=size)
+            print(f"Landmarks gravados em {args.record}")
+    elif args.landmarks:
+        data = np.load(args.landmarks)
+        landmarks, size = data["landmarks"], tuple(int(v) for v in data["frame_size"])
+    else:
+        landmarks, truth = synthetic_landmarks(np.random.default_rng(args.seed), args.frames,
+                                               args.noise, args.depth_noise)
+        size = FRAME
+    if len(landmarks) < 2:
+        print("Landmarks insuficientes.")
+        return 1
+
+    print(f"{len(landmarks)} frames {'sintéticos' if truth is not None else 'gravados'} ({size[0]}x{size[1]})")
+    runs = {"PCA do nariz": run_pca(landmarks, size),
+            "solvePnP iterativo (chute)": run_pnp(landmarks, size, "iterative"),
+            "solvePnP SQPnP": run_pnp(landmarks, size, "sqpnp")}
+    static = slice(0, len(landmarks) // 3)
+    for name, (rotations, cost_us) in runs.items():
+        line = f"  {name:<28} {cost_us:7.1f} µs/frame"
+        if truth is None:
+            step = frame_to_frame_deg(rotations)
+            line += f", variação entre frames {np.sqrt(np.mean(step ** 2)):5.2f}° rms (p95 {np.percentile(step, 95):5.2f}°)"
+        else:
+            error, residual = error_to_truth_deg(rotations, truth)
+            jitter = frame_to_frame_deg(residual)
+            still = frame_to_frame_deg(rotations[static])
+            line += (f", erro {error.mean():5.2f}° (p95 {np.percentile(error, 95):5.2f}°), "
+                     f"jitter {np.sqrt(np.mean(jitter ** 2)):5.2f}° rms, parado {np.sqrt(np.mean(still ** 2)):5.2f}° rms")
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
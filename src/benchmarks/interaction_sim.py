@@ -0,0 +1,236 @@
+# src/benchmarks/interaction_sim.py
+# Simula sessões de interação sem câmera nem Tk: séries de EAR sintéticas
+# -> GestureRecognizer -> máquinas de estado, tudo num SimulatedClock.
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.interaction_sim --sessions 2000
+
+import argparse
+import random
+import sys
+import time
+
+from interaction.state_machines import (
+    DashboardClickMachine, ScanMachine, SimulatedClock, configure_gesture_holds,
+    build_scan_layout, SCAN_LAYOUTS, SCAN_ROW_COLUMN, DEFAULT_TIMINGS, ACTION_CLICK, ACTION_INVOKE,
+)
+from interaction.scan_order import KeyFrequencyModel, order_layout, expected_steps, item_weights
+from interaction.scan_adaptation import ScanSpeedAdapter
+from tracking.gestures import GestureRecognizer
+from tracking.gaze_history import GazeHistory
+from ui.notepad_view import KEY_ROWS
+
+FPS = 30.0
+EAR_OPEN = 0.32
+EAR_CLOSED = 0.12
+EAR_THRESHOLD = 0.22
+
+
+class SimulatedEyes:
+    """Gera EAR por frame e alimenta o reconhecedor, avançando o relógio."""
+
+    def __init__(self, clock, recognizer, rng, noise=0.015):
+        self.clock = clock
+        self.recognizer = recognizer
+        self.rng = rng
+        self.noise = noise
+
+    def frames(self, seconds, left_closed=False, right_closed=False):
+        """Avança `seconds` de frames; devolve os eventos de cada frame."""
+        for _ in range(max(1, int(round(seconds * FPS)))):
+            t = self.clock.advance(1.0 / FPS)
+            left = (EAR_CLOSED if left_closed else EAR_OPEN) + self.rng.gauss(0, self.noise)
+            right = (EAR_CLOSED if right_closed else EAR_OPEN) + self.rng.gauss(0, self.noise)
+            yield self.recognizer.update(left, right, t, EAR_THRESHOLD, EAR_THRESHOLD)
+
+
+def dashboard_session(rng, timings=None):
+    """Uma sessão: piscadas naturais curtas + uma piscada longa intencional."""
+    clock = SimulatedClock()
+    recognizer = GestureRecognizer()
+    configure_gesture_holds(recognizer, timings)
+    machine = DashboardClickMachine(clock, timings)
+    eyes = SimulatedEyes(clock, recognizer, rng)
+
+    clicks = {"false": 0, "hit": 0}
+    intended = False
+
+    def run(seconds, closed):
+        for events in eyes.frames(seconds, closed, closed):
+            for action in machine.step(events, "alvo"):
+                if action.kind == ACTION_CLICK:
+                    clicks["hit" if intended else "false"] += 1
+
+    for _ in range(rng.randint(2, 6)):
+        run(rng.uniform(1.0, 4.0), False)
+        run(rng.uniform(0.08, 0.4), True)   # Piscada natural
+    intended = True
+    run(0.5, False)
+    run(max(0.2, rng.gauss(1.3, 0.2)), True)  # Piscada de clique
+    run(0.5, False)
+    return clicks, clock.now()
+
+
+def preblink_target_session(rng, spacing=90.0, n_targets=6, noise=12.0, drift=45.0, drift_s=0.1,
+                            window=0.25, guard=0.1, ui_tick=0.05):
+    """
+    Alvos numa coluna (centros a cada `spacing` px). O olhar fixa um alvo
+    com ruído e, nos `drift_s` segundos antes da piscada, desce até `drift`
+    px (a pálpebra puxa a íris). Compara o alvo escolhido pelo snap do
+    último tick da UI com o resolvido pelo histórico antes da piscada.
+    Retorna (acerto do snap, acerto do histórico).
+    """
+    history = GazeHistory()
+    centers = [spacing * i for i in range(n_targets)]
+    target = rng.randrange(1, n_targets - 1)
+    t = 0.0
+    onset = rng.uniform(0.8, 1.5)
+    snapped_y = None
+    next_tick = rng.uniform(0, ui_tick)
+    while t < onset:
+        t += 1.0 / FPS
+        pull = drift * max(0.0, 1.0 - (onset - t) / drift_s) if onset - t < drift_s else 0.0
+        y = centers[target] + pull + rng.gauss(0, noise)
+        history.append(t, None, 0.0, y, EAR_OPEN, EAR_OPEN, True)
+        if t >= next_tick:  # A UI só vê o olhar a cada tick
+            snapped_y = y
+            next_tick += ui_tick
+
+    def nearest(y):
+        return min(range(n_targets), key=lambda i: abs(centers[i] - y))
+
+    point = history.point_before(onset, window, guard)
+    resolved = nearest(point[1]) if point else nearest(snapped_y)
+    return nearest(snapped_y) == target, resolved == target
+
+
+def keyboard_rows(key_rows=KEY_ROWS):
+    """Linhas de índices com o mesmo formato de NotepadFrame.get_scan_rows()."""
+    rows, i = [], 0
+    for row in key_rows:
+        rows.append(list(range(i, i + len(row))))
+        i += len(row)
+    return rows
+
+
+def scanner_session(rng, layout, target, reaction=(0.35, 0.08), timings=None, limit=300.0, adapter=None):
+    """
+    Seleciona `target`: espera o destaque chegar num grupo/tecla que o contém,
+    reage após um tempo aleatório e pisca até a seleção; repete em cada nível.
+    Com `adapter`, o passo do scanner é aprendido ao longo das sessões.
+    Retorna (acertou, tempo simulado).
+    """
+    clock = SimulatedClock()
+    recognizer = GestureRecognizer()
+    configure_gesture_holds(recognizer, timings)
+    machine = ScanMachine(clock, timings, adapter=adapter)
+    eyes = SimulatedEyes(clock, recognizer, rng)
+    machine.start(layout)
+
+    invoked = None
+    while invoked is None and clock.now() < limit:
+        # Espera o alvo ficar destacado + tempo de reação
+        rt = max(0.05, rng.gauss(*reaction))
+        last, since = None, None
+        for events in eyes.frames(limit):
+            machine.step(events)
+            current = machine.highlighted()
+            if current != last:
+                last = current
+                since = clock.now() if target in current else None
+            if since is not None and clock.now() - since >= rt:
+                break
+        # Pisca com os dois olhos até a seleção (entrar no grupo ou acionar a tecla)
+        depth = machine.depth
+        for events in eyes.frames(2.0, True, True):
+            for action in machine.step(events):
+                if action.kind == ACTION_INVOKE:
+                    invoked = action.arg
+            if invoked is not None or machine.depth != depth:
+                break
+        for events in eyes.frames(0.2):
+            machine.step(events)
+    return invoked == target, clock.now()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação das máquinas de interação.")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    t0 = time.perf_counter()
+    false_clicks = hits = 0
+    simulated = 0.0
+    for _ in range(args.sessions):
+        clicks, duration = dashboard_session(rng)
+        false_clicks += clicks["false"]
+        hits += 1 if clicks["hit"] else 0
+        simulated += duration
+    wall = time.perf_counter() - t0
+    print(f"== dashboard: {args.sessions} sessões ==")
+    print(f"  cliques corretos     {hits}/{args.sessions}")
+    print(f"  cliques falsos       {false_clicks}")
+    print(f"  tempo simulado       {simulated:.0f} s em {wall:.2f} s reais ({simulated / wall:.0f}x)")
+
+    snap_hits = history_hits = 0
+    for _ in range(args.sessions):
+        snap_ok, history_ok = preblink_target_session(rng)
+        snap_hits += snap_ok
+        history_hits += history_ok
+    print(f"== alvo do clique (deriva antes da piscada): {args.sessions} cliques ==")
+    print(f"  snap no último tick    {snap_hits}/{args.sessions} corretos")
+    print(f"  olhar antes da piscada {history_hits}/{args.sessions} corretos")
+
+    rows = keyboard_rows()
+    labels = [key for row in KEY_ROWS for key in row]
+    model = KeyFrequencyModel()
+    weights = item_weights(labels, model)
+    baseline = None
+    for mode in SCAN_LAYOUTS:
+        natural = build_scan_layout(rows, mode)
+        for ordered in (False, True):
+            layout = order_layout(natural, labels, model) if ordered else natural
+            name = f"{mode}{' +freq' if ordered else ''}"
+            t0 = time.perf_counter()
+            correct = 0
+            simulated = 0.0
+            for _ in range(args.sessions):
+                # Alvos sorteados pela frequência das teclas em português
+                target = rng.choices(range(len(labels)), weights)[0]
+                ok, duration = scanner_session(rng, layout, target)
+                correct += ok
+                simulated += duration
+            wall = time.perf_counter() - t0
+            mean = simulated / args.sessions
+            baseline = baseline or mean
+            print(f"== scanner {name}: {args.sessions} seleções ==")
+            print(f"  seleções corretas    {correct}/{args.sessions}")
+            print(f"  passos esperados     {expected_steps(layout, labels, model):.2f}")
+            print(f"  tempo por caractere  {mean:.2f} s ({baseline / mean:.1f}x vs linear)")
+            print(f"  tempo simulado       {simulated:.0f} s em {wall:.2f} s reais ({simulated / wall:.0f}x)")
+
+    # Passo adaptativo: usuários com tempos de reação diferentes, partindo do passo padrão
+    layout = order_layout(build_scan_layout(rows, SCAN_ROW_COLUMN), labels, model)
+    for name, reaction in (("treinado", (0.3, 0.05)), ("padrão", (0.45, 0.1)), ("cansado", (0.8, 0.2))):
+        adapter = ScanSpeedAdapter(DEFAULT_TIMINGS["scan_delay"])
+        results = {}
+        for phase, adaptive in (("fixo", None), ("adaptativo", adapter)):
+            correct = 0
+            simulated = 0.0
+            for _ in range(args.sessions):
+                target = rng.choices(range(len(labels)), weights)[0]
+                ok, duration = scanner_session(rng, layout, target, reaction, adapter=adaptive)
+                correct += ok
+                simulated += duration
+            results[phase] = (correct, simulated / args.sessions)
+        print(f"== scanner adaptativo, usuário {name} (reação {reaction[0]:.2f}±{reaction[1]:.2f} s) ==")
+        for phase, (correct, mean) in results.items():
+            print(f"  {phase:<12} {mean:.2f} s por caractere, {correct}/{args.sessions} corretas")
+        print(f"  passo final          {adapter.scan_delay:.2f} s (overshoots {100 * adapter.overshoot_rate:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
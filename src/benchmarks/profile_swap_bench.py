@@ -0,0 +1,77 @@
+# src/benchmarks/profile_swap_bench.py
+# Custo da troca de perfil a quente (EyeTracker.load_calibration com o
+# tracker rodando): leitura/validação do perfil na thread da UI e aplicação
+# entre dois frames no loop, comparado com o que um tracker novo paga só
+# para recriar o FaceMesh (a reabertura da câmera fica de fora: depende do
+# dispositivo e costuma custar mais ainda).
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.profile_swap_bench --profiles 2 --swaps 2000
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from tracking import calibration
+from tracking.eye_tracker import EyeTracker
+from tracking.face_mesh_warmup import create_face_mesh
+
+
+def synthetic_profile(rng):
+    """Perfil com a mesma estrutura dos salvos (valores quaisquer)."""
+    corners = rng.normal(0, 100, (4, 3))
+    return {
+        "calibration_offsets": {"yaw": rng.normal(0, 5), "pitch": rng.normal(0, 5)},
+        "ear_thresholds": {"left": rng.uniform(0.15, 0.3), "right": rng.uniform(0.15, 0.3)},
+        "monitor_plane": {"corners": corners.tolist(), "center": corners.mean(axis=0).tolist(),
+                          "normal": [0.0, 0.0, -1.0], "units_per_cm": rng.uniform(4, 6)},
+        "left_sphere_local_offset": rng.normal(0, 20, 3).tolist(),
+        "right_sphere_local_offset": rng.normal(0, 20, 3).tolist(),
+        "left_calibration_nose_scale": rng.uniform(40, 60),
+        "right_calibration_nose_scale": rng.uniform(40, 60),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Troca de perfil a quente vs tracker novo.")
+    parser.add_argument("--profiles", type=int, default=2, help="Perfis sintéticos alternados")
+    parser.add_argument("--saved", action="store_true", help="Usa os perfis salvos em profiles/")
+    parser.add_argument("--swaps", type=int, default=2000)
+    parser.add_argument("--face-mesh", type=int, default=3, help="FaceMesh criados para a comparação")
+    args = parser.parse_args(argv)
+
+    if args.saved:
+        profiles = [p for p in (calibration.load_profile(n) for n in calibration.list_profiles()) if p]
+    else:
+        rng = np.random.default_rng(0)
+        profiles = [synthetic_profile(rng) for _ in range(args.profiles)]
+    if not profiles:
+        print("Nenhum perfil para trocar.")
+        return 1
+
+    tracker = EyeTracker()
+    parse_s = apply_s = 0.0
+    for i in range(args.swaps):
+        t0 = time.perf_counter()
+        state = tracker._parse_calibration(profiles[i % len(profiles)])
+        t1 = time.perf_counter()
+        tracker._apply_calibration(state)
+        apply_s += time.perf_counter() - t1
+        parse_s += t1 - t0
+
+    t0 = time.perf_counter()
+    for _ in range(args.face_mesh):
+        create_face_mesh().close()
+    face_mesh_ms = 1e3 * (time.perf_counter() - t0) / max(1, args.face_mesh)
+
+    print(f"{len(profiles)} perfis, {args.swaps} trocas")
+    print(f"  troca a quente: leitura {1e6 * parse_s / args.swaps:7.1f} µs (UI), "
+          f"aplicação {1e6 * apply_s / args.swaps:7.1f} µs (entre dois frames)")
+    print(f"  tracker novo:   FaceMesh {face_mesh_ms:7.1f} ms (+ reabertura da câmera)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# src/benchmarks/screen_mapping_bench.py
+# Calibração só no centro (regra linear de ±15° yaw / ±5° pitch) vs o
+# mapeamento multiponto (tracking/screen_mapping.py) com 5, 9 e 16 pontos,
+# num usuário sintético: tela plana vista de uma distância qualquer (ângulos
+# não lineares nas bordas), ganho e inclinação próprios e ruído na captura.
+# Mede o erro em px numa grade densa (toda a tela e só as bordas) e o custo
+# do mapeador por amostra, escalar e vetorizado.
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.screen_mapping_bench --users 200
+
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from tracking import monitor_core as mc
+from tracking.screen_mapping import ScreenMapping, calibration_points, CALIBRATION_POINT_COUNTS
+
+SCREEN = (1920, 1080)
+SCREEN_CM = (53.0, 30.0)  # Monitor de ~24"
+
+
+def synthetic_user(rng):
+    """Função (u, v) -> (yaw, pitch) medidos do usuário, em graus (sem ruído)."""
+    distance = rng.uniform(45, 80)           # cm até a tela
+    gain = rng.uniform(0.8, 1.25), rng.uniform(0.8, 1.25)
+    tilt = rng.uniform(-0.08, 0.08)          # Cabeça levemente inclinada
+    eye = rng.uniform(-3, 3), rng.uniform(-4, 4)  # Olho fora do centro da tela (cm)
+
+    def angles(u, v):
+        x = (u - 0.5) * SCREEN_CM[0] - eye[0]
+        y = (0.5 - v) * SCREEN_CM[1] - eye[1]
+        yaw = np.degrees(np.arctan2(x, distance)) * gain[0]
+        pitch = np.degrees(np.arctan2(y, np.hypot(x, distance))) * gain[1]
+        return yaw + tilt * pitch, pitch - tilt * yaw
+    return angles
+
+
+def capture(angles, targets, rng, noise_deg):
+    yaw, pitch = angles(targets[:, 0], targets[:, 1])
+    return yaw + rng.normal(0, noise_deg, len(yaw)), pitch + rng.normal(0, noise_deg, len(pitch))
+
+
+def error_px(pu, pv, u, v):
+    pu, pv = np.clip(pu, 0, 1), np.clip(pv, 0, 1)  # O tracker também limita à tela
+    return np.hypot((pu - u) * SCREEN[0], (pv - v) * SCREEN[1])
+
+
+def linear_center(angles, rng, noise_deg):
+    """Regra atual: offsets do passo S no centro e faixas fixas."""
+    yaw0, pitch0 = capture(angles, np.array([[0.5, 0.5]]), rng, noise_deg)
+
+    def predict(yaw, pitch):
+        yaw, pitch = yaw - yaw0[0], pitch - pitch0[0]
+        return ((yaw + mc.SCREEN_YAW_HALF_RANGE_DEG) / (2 * mc.SCREEN_YAW_HALF_RANGE_DEG),
+                (mc.SCREEN_PITCH_HALF_RANGE_DEG - pitch) / (2 * mc.SCREEN_PITCH_HALF_RANGE_DEG))
+    return predict
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibração só no centro vs multiponto.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--noise", type=float, default=0.25, help="Ruído do ângulo capturado por ponto (graus)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng_py = random.Random(args.seed)
+    rng = np.random.default_rng(args.seed)
+    grid = np.linspace(0.02, 0.98, 25)
+    eval_u, eval_v = [a.ravel() for a in np.meshgrid(grid, grid)]
+    edge = (np.minimum(eval_u, 1 - eval_u) < 0.15) | (np.minimum(eval_v, 1 - eval_v) < 0.15)
+
+    methods = ["só o centro"] + [f"{n} pontos" for n in CALIBRATION_POINT_COUNTS]
+    errors = {m: [] for m in methods}
+    last_mapping = None
+    for _ in range(args.users):
+        angles = synthetic_user(rng_py)
+        eval_yaw, eval_pitch = angles(eval_u, eval_v)
+        predict = linear_center(angles, rng, args.noise)
+        errors[methods[0]].append(error_px(*predict(eval_yaw, eval_pitch), eval_u, eval_v))
+        for n, name in zip(CALIBRATION_POINT_COUNTS, methods[1:]):
+            targets = calibration_points(n)
+            yaw, pitch = capture(angles, targets, rng, args.noise)
+            last_mapping = ScreenMapping.fit(yaw, pitch, targets[:, 0], targets[:, 1])
+            errors[name].append(error_px(*last_mapping.map(eval_yaw, eval_pitch), eval_u, eval_v))
+
+    print("== erro na tela (px) ==")
+    for name in methods:
+        err = np.array(errors[name])
+        print(f"  {name:<14} média {err.mean():6.1f}, p95 {np.percentile(err, 95):6.1f}, "
+              f"bordas {err[:, edge].mean():6.1f}")
+
+    # Custo do mapeador: um frame por vez (loop do tracker) e uma sessão inteira de uma vez
+    yaw, pitch = rng.normal(0, 8, 30000), rng.normal(0, 3, 30000)
+    t0 = time.perf_counter()
+    for y, p in zip(yaw[:3000], pitch[:3000]):
+        last_mapping.map(y, p)
+    scalar_us = 1e6 * (time.perf_counter() - t0) / 3000
+    t0 = time.perf_counter()
+    last_mapping.map(yaw, pitch)
+    vector_us = 1e6 * (time.perf_counter() - t0) / len(yaw)
+    print(f"  custo '{last_mapping.kind}'  {scalar_us:.1f} µs por frame, {vector_us:.3f} µs por amostra vetorizado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
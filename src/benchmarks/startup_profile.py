@@ -0,0 +1,122 @@
+# src/benchmarks/startup_profile.py
+# Relatório de inicialização: custo de importação por módulo (-X importtime)
+# e tempo até a primeira janela / primeiro frame da câmera.
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.startup_profile
+#   python -m benchmarks.startup_profile --budget-ms 2500   # falha (exit 1) se estourar
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Orçamento padrão do "cold start" até o primeiro frame (ms)
+DEFAULT_BUDGET_MS = 3000.0
+# Orçamento para `import main` (nada pesado deve ser carregado aqui)
+DEFAULT_IMPORT_BUDGET_MS = 1500.0
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+\d+\s+\|\s*(\S+)")
+_STARTUP_RE = re.compile(r"(\w+)=([\d.]+)ms")
+
+
+def import_breakdown(module="main"):
+    """
+    Roda `python -X importtime -c "import <module>"` e soma o tempo próprio
+    (self) de cada módulo no seu pacote de topo (cv2, numpy, PIL, ...).
+
+    Returns:
+        (total_ms, [(pacote, ms), ...] em ordem decrescente, erro), onde erro
+        é None ou a última linha do stderr se o import falhou (o total, então,
+        é parcial)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR, capture_output=True, text=True,
+    )
+    per_package = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+        self_us, name = int(m.group(1)), m.group(2)
+        top = name.split(".")[0]
+        per_package[top] = per_package.get(top, 0) + self_us
+        total_us += self_us
+    ranking = sorted(((k, v / 1000.0) for k, v in per_package.items()), key=lambda kv: -kv[1])
+    error = None
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import falhou"
+    return total_us / 1000.0, ranking, error
+
+
+def measure_first_frame(timeout_s=30.0):
+    """Abre o app em modo de perfil e retorna os marcos impressos em [Startup]."""
+    env = dict(os.environ)
+    env["WBET_STARTUP_PROFILE"] = "1"
+    try:
+        proc = subprocess.run(
+            [sys.executable, "main.py"], cwd=SRC_DIR, env=env,
+            capture_output=True, text=True, timeout=timeout_s,
+        )
+    except subprocess.TimeoutExpired:
+        return {}
+    for line in proc.stdout.splitlines():
+        if line.startswith("[Startup]"):
+            return {k: float(v) for k, v in _STARTUP_RE.findall(line)}
+    return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perfil de inicialização do app.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Tempo máximo até o primeiro frame (ms).")
+    parser.add_argument("--import-budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                        help="Tempo máximo de `import main` (ms).")
+    parser.add_argument("--top", type=int, default=15, help="Quantos pacotes listar.")
+    parser.add_argument("--imports-only", action="store_true",
+                        help="Não abre o app (útil sem display/câmera).")
+    args = parser.parse_args(argv)
+
+    failures = []
+
+    total_ms, ranking, error = import_breakdown()
+    print(f"== import main: {total_ms:.1f} ms{' (parcial)' if error else ''} ==")
+    for name, ms in ranking[:args.top]:
+        print(f"  {name:<28} {ms:9.1f} ms")
+    if error:
+        # Total parcial não é comparado com o orçamento
+        failures.append(f"import main falhou: {error}")
+    elif total_ms > args.import_budget_ms:
+        failures.append(f"import main {total_ms:.1f} ms > {args.import_budget_ms:.0f} ms")
+
+    if not args.imports_only:
+        marks = measure_first_frame()
+        print("== marcos de inicialização ==")
+        for name in ("imports", "first_window", "first_frame"):
+            value = marks.get(name)
+            print(f"  {name:<28} " + (f"{value:9.1f} ms" if value is not None else "      n/a"))
+        if "first_frame" in marks:
+            if marks["first_frame"] > args.budget_ms:
+                failures.append(f"first_frame {marks['first_frame']:.1f} ms > {args.budget_ms:.0f} ms")
+        elif "first_window" in marks:
+            print("  (sem câmera: orçamento aplicado à primeira janela)")
+            if marks["first_window"] > args.budget_ms:
+                failures.append(f"first_window {marks['first_window']:.1f} ms > {args.budget_ms:.0f} ms")
+        else:
+            failures.append("o app não reportou os marcos de inicialização")
+
+    if failures:
+        for f in failures:
+            print(f"FALHOU: {f}")
+        return 1
+    print("OK: dentro do orçamento.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+# src/benchmarks/text_entry_bench.py
+# Vazão de digitação por varredura, offline: um usuário simulado (tempo de
+# reação ex-gaussiano + taxa de erro) digita um corpus de frases com a
+# ScanMachine num SimulatedClock, corrigindo os erros com Backspace.
+# Para cada configuração (layout, ordem por frequência, boost, passo
+# adaptativo) relata caracteres por minuto (CPM), teclas por caractere
+# (KSPC) e taxa de erro. Com boost, o usuário simulado liga o passo rápido
+# nos percursos longos da varredura linear e o desliga perto do alvo.
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.text_entry_bench
+#   python -m benchmarks.text_entry_bench --json resultados.json
+#   python -m benchmarks.text_entry_bench --baseline resultados.json   # falha (exit 1) se o CPM cair
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import unicodedata
+
+from benchmarks.interaction_sim import SimulatedEyes, keyboard_rows
+from interaction.scan_adaptation import ScanSpeedAdapter
+from interaction.scan_order import KeyFrequencyModel, order_layout
+from interaction.state_machines import (
+    ScanMachine, SimulatedClock, configure_gesture_holds, build_scan_layout,
+    DEFAULT_TIMINGS, SCAN_LINEAR, SCAN_ROW_COLUMN, SCAN_BLOCK_ROW_COLUMN, ACTION_INVOKE,
+)
+from tracking.gestures import GestureRecognizer
+from ui.notepad_view import KEY_ROWS
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frases_pt.txt")
+
+# nome -> (modo, ordem por frequência, boost ligado, passo adaptativo)
+CONFIGS = {
+    "linear": (SCAN_LINEAR, False, False, False),
+    "linear+boost": (SCAN_LINEAR, False, True, False),
+    "row_column": (SCAN_ROW_COLUMN, False, False, False),
+    "row_column+freq": (SCAN_ROW_COLUMN, True, False, False),
+    "block_row_column+freq": (SCAN_BLOCK_ROW_COLUMN, True, False, False),
+    "row_column+freq+adapt": (SCAN_ROW_COLUMN, True, False, True),
+}
+# Tolerância da comparação com --baseline (queda relativa de CPM)
+DEFAULT_TOLERANCE = 0.10
+# Tempo simulado máximo por caractere antes de desistir da frase (s)
+CHAR_TIME_LIMIT = 120.0
+# Uso do boost na varredura linear (em passos até o alvo): liga para
+# percursos longos e desliga ao ver o destaque a BOOST_LEAD_STEPS do alvo,
+# que ainda chega no passo normal
+BOOST_MIN_STEPS = 8
+BOOST_LEAD_STEPS = 5
+
+KEY_CHARS = {"Space": " ", "Enter": "\n", "Tab": "\t"}
+
+
+def load_corpus(path=CORPUS_FILE, limit=None):
+    """Frases do corpus, sem acentos (o teclado não os tem)."""
+    sentences = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            line = unicodedata.normalize("NFKD", line).encode("ascii", "ignore").decode("ascii")
+            sentences.append(line)
+    return sentences[:limit] if limit else sentences
+
+
+class UserModel:
+    """
+    Usuário simulado: tempo de reação ex-gaussiano (normal + exponencial,
+    o formato típico de tempos de reação) e, com probabilidade `error_rate`,
+    um deslize que faz a piscada começar um passo atrasada (seleciona o
+    item seguinte ao pretendido).
+    """
+
+    def __init__(self, rng, mu=0.35, sigma=0.06, tau=0.1, error_rate=0.03):
+        self.rng = rng
+        self.mu, self.sigma, self.tau = mu, sigma, tau
+        self.error_rate = error_rate
+
+    def reaction(self):
+        return max(0.08, self.rng.gauss(self.mu, self.sigma) + self.rng.expovariate(1.0 / self.tau))
+
+    def slips(self):
+        return self.rng.random() < self.error_rate
+
+
+class ScanTypist:
+    """Digita frases com a ScanMachine, reproduzindo o efeito das teclas do Bloco de Notas."""
+
+    def __init__(self, rng, user, layout, labels, restart_on_select=False, boost=False,
+                 adapter=None, timings=None):
+        self.user = user
+        self.labels = labels
+        self.clock = SimulatedClock()
+        recognizer = GestureRecognizer()
+        configure_gesture_holds(recognizer, timings)
+        self.machine = ScanMachine(self.clock, timings, adapter=adapter)
+        self.eyes = SimulatedEyes(self.clock, recognizer, rng)
+        self.machine.start(layout, restart_on_select)
+        self.boost = boost
+        self.text = ""
+        self.shift = False
+        self.caps = False
+        self.keystrokes = 0     # Teclas acionadas (inclui erros e correções)
+        self.activations = 0    # Piscadas de seleção (grupos + teclas)
+        self.errors = 0         # Teclas acionadas diferentes da pretendida
+
+    def _run(self, seconds, closed=False, right_closed=False):
+        for events in self.eyes.frames(seconds, closed, closed or right_closed):
+            for action in self.machine.step(events):
+                if action.kind == ACTION_INVOKE:
+                    return action.arg
+        return None
+
+    def _wink(self, hold):
+        """Wink direito segurado por `hold` segundos (mais a margem do reconhecedor)."""
+        self._run(hold + 0.1, right_closed=True)
+        self._run(1.0 / 30.0)
+
+    def _steer_boost(self, target):
+        """
+        Boost como o usuário o usa na varredura linear: liga o passo rápido
+        quando o alvo está longe e, ao ver o destaque chegando perto, reage e
+        desliga, para selecionar no passo normal.
+        """
+        machine = self.machine
+        if machine.depth or not machine.highlighted() or target not in machine.group:
+            return
+        distance = (machine.group.index(target) - machine.index) % len(machine.group)
+        if not machine.is_boost_active and distance > BOOST_MIN_STEPS:
+            self._wink(machine.timings["boost_on"])
+        elif machine.is_boost_active and distance <= BOOST_LEAD_STEPS:
+            self._run(self.user.reaction())
+            self._wink(machine.timings["boost_off"])
+
+    def _apply(self, label):
+        """Mesmo efeito de NotepadFrame._on_key_press sobre o texto."""
+        if label == "Backspace":
+            self.text = self.text[:-1]
+        elif label == "Shift":
+            self.shift = not self.shift
+        elif label == "Caps":
+            self.caps = not self.caps
+        elif label in KEY_CHARS:
+            self.text += KEY_CHARS[label]
+        else:
+            self.text += label.upper() if label.isalpha() and (self.shift ^ self.caps) else label
+            self.shift = False
+
+    def _next_key(self, target_text):
+        """Próxima tecla do plano: corrige o que diverge, senão digita o próximo caractere."""
+        if not target_text.startswith(self.text):
+            return "Backspace"
+        if self.caps:
+            return "Caps"  # Caps ligado por engano: desliga
+        char = target_text[len(self.text)]
+        if char.isalpha():
+            if char.isupper() != self.shift:
+                return "Shift"
+            return char.lower()
+        for label, value in KEY_CHARS.items():
+            if value == char:
+                return label
+        return char
+
+    def _select(self, target, limit):
+        """Espera o destaque, reage e pisca até acionar uma tecla. Devolve o índice acionado."""
+        machine, clock = self.machine, self.clock
+        while clock.now() < limit:
+            # Espera um destaque que contenha o alvo; a piscada é programada
+            # para destaque + reação e acontece mesmo que o destaque já tenha andado
+            blink_at, last = None, None
+            while blink_at is None or clock.now() < blink_at:
+                if clock.now() >= limit:
+                    return None
+                invoked = self._run(1.0 / 30.0)
+                if invoked is not None:
+                    return invoked
+                if self.boost and blink_at is None:
+                    self._steer_boost(target)
+                current = machine.highlighted()
+                if blink_at is None and current != last:
+                    last = current
+                    if target in current:
+                        rt = self.user.reaction()
+                        if self.user.slips():
+                            rt += machine.delay
+                        blink_at = clock.now() + rt
+            depth = machine.depth
+            invoked = None
+            for events in self.eyes.frames(2.0, True, True):
+                for action in machine.step(events):
+                    if action.kind == ACTION_INVOKE:
+                        invoked = action.arg
+                if invoked is not None or machine.depth != depth:
+                    break
+            if invoked is not None or machine.depth != depth:
+                self.activations += 1
+            self._run(0.2)
+            if invoked is not None:
+                return invoked
+        return None
+
+    def type_sentence(self, sentence):
+        """Digita `sentence` (com correções). Devolve True se terminou dentro do limite."""
+        self.text = ""
+        limit = self.clock.now() + CHAR_TIME_LIMIT * max(1, len(sentence))
+        while self.text != sentence:
+            label = self._next_key(sentence)
+            if label not in self.labels:
+                print(f"[Digitação] Caractere sem tecla, ignorando a frase: {label!r}")
+                return False
+            invoked = self._select(self.labels.index(label), limit)
+            if invoked is None:
+                return False
+            self.keystrokes += 1
+            if self.labels[invoked] != label:
+                self.errors += 1
+            self._apply(self.labels[invoked])
+        return True
+
+
+def run_config(name, sentences, seed, user_params, timings=None):
+    mode, by_frequency, boost, adaptive = CONFIGS[name]
+    rng = random.Random(seed)
+    labels = [key for row in KEY_ROWS for key in row]
+    layout = build_scan_layout(keyboard_rows(), mode)
+    if by_frequency:
+        layout = order_layout(layout, labels, KeyFrequencyModel())
+    adapter = ScanSpeedAdapter(DEFAULT_TIMINGS["scan_delay"]) if adaptive else None
+    typist = ScanTypist(rng, UserModel(rng, **user_params), layout, labels,
+                        restart_on_select=by_frequency, boost=boost, adapter=adapter, timings=timings)
+
+    t0 = time.perf_counter()
+    start = typist.clock.now()
+    chars = completed = 0
+    for sentence in sentences:
+        if typist.type_sentence(sentence):
+            completed += 1
+            chars += len(sentence)
+    simulated = typist.clock.now() - start
+    return {
+        "cpm": 60.0 * chars / simulated if simulated else 0.0,
+        "kspc": typist.keystrokes / chars if chars else 0.0,
+        "activations_per_char": typist.activations / chars if chars else 0.0,
+        "error_rate": typist.errors / typist.keystrokes if typist.keystrokes else 0.0,
+        "sentences": f"{completed}/{len(sentences)}",
+        "simulated_s": round(simulated, 1),
+        "wall_s": round(time.perf_counter() - t0, 2),
+        "final_scan_delay": round(adapter.scan_delay, 2) if adapter else None,
+    }
+
+
+def compare_baseline(results, baseline, tolerance):
+    """Lista as configurações cujo CPM caiu mais que `tolerance` em relação ao baseline."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name, {}).get("cpm")
+        if old and result["cpm"] < old * (1.0 - tolerance):
+            regressions.append(f"{name}: {old:.2f} -> {result['cpm']:.2f} CPM")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de digitação por varredura (CPM, KSPC, erros).")
+    parser.add_argument("--corpus", default=CORPUS_FILE)
+    parser.add_argument("--sentences", type=int, default=None, help="Usa só as N primeiras frases")
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=list(CONFIGS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reaction", type=float, default=0.35, help="Média da parte normal do tempo de reação (s)")
+    parser.add_argument("--reaction-sd", type=float, default=0.06)
+    parser.add_argument("--reaction-tail", type=float, default=0.1, help="Média da cauda exponencial (s)")
+    parser.add_argument("--error-rate", type=float, default=0.03)
+    parser.add_argument("--json", help="Salva os resultados neste arquivo")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    sentences = load_corpus(args.corpus, args.sentences)
+    user_params = {"mu": args.reaction, "sigma": args.reaction_sd, "tau": args.reaction_tail,
+                   "error_rate": args.error_rate}
+    n_chars = sum(len(s) for s in sentences)
+    print(f"== digitação por varredura: {len(sentences)} frases, {n_chars} caracteres ==")
+    print(f"   reação {args.reaction:.2f}±{args.reaction_sd:.2f} s + cauda {args.reaction_tail:.2f} s, "
+          f"deslizes {100 * args.error_rate:.0f}%")
+    print(f"  {'configuração':<24}{'CPM':>7}{'KSPC':>7}{'sel/car':>9}{'erros':>8}{'frases':>8}{'real':>8}")
+
+    results = {}
+    for name in args.configs:
+        r = run_config(name, sentences, args.seed, user_params)
+        results[name] = r
+        extra = f"  (passo final {r['final_scan_delay']:.2f} s)" if r["final_scan_delay"] else ""
+        print(f"  {name:<24}{r['cpm']:>7.2f}{r['kspc']:>7.2f}{r['activations_per_char']:>9.2f}"
+              f"{100 * r['error_rate']:>7.1f}%{r['sentences']:>8}{r['wall_s']:>7.1f}s{extra}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"user": user_params, "seed": args.seed, "results": results}, f, indent=2)
+        print(f"Resultados salvos em {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+        regressions = compare_baseline(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSÃO: {line}")
+        if regressions:
+            return 1
+        print(f"Sem regressões de CPM (tolerância {100 * args.tolerance:.0f}%).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# src/benchmarks/word_prediction_bench.py
+# Mede a predição de palavras: tempo de construção/abertura do modelo e
+# latência de suggest() por tecla, com prefixos sorteados da lista base.
+#
+# Uso (a partir de src/):
+#   python -m benchmarks.word_prediction_bench --queries 20000
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from interaction.word_prediction import WordPredictor, WORD_LIST_FILE
+
+
+def _load_words(path):
+    words = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                words.append(line.split()[0])
+    return words
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da predição de palavras.")
+    parser.add_argument("--queries", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    words = _load_words(WORD_LIST_FILE)
+
+    with tempfile.TemporaryDirectory() as docs_dir:
+        # Um "documento salvo" sintético para gerar bigramas
+        with open(os.path.join(docs_dir, "documento_1.txt"), "w", encoding="utf-8") as f:
+            f.write(" ".join(rng.choice(words) for _ in range(5000)))
+
+        predictor = WordPredictor(os.path.join(docs_dir, ".modelo_predicao"), docs_dir)
+        t0 = time.perf_counter()
+        predictor.start_loading()
+        predictor._thread.join()
+        build = time.perf_counter() - t0
+
+        latencies = np.empty(args.queries)
+        for i in range(args.queries):
+            word = rng.choice(words)
+            prefix = word[:rng.randint(0, len(word))]
+            prev = rng.choice(words)
+            t = time.perf_counter()
+            predictor.suggest(prefix, prev)
+            latencies[i] = time.perf_counter() - t
+
+        # Incorporação incremental de um novo documento
+        with open(os.path.join(docs_dir, "documento_2.txt"), "w", encoding="utf-8") as f:
+            f.write("palavranova " * 20)
+        t0 = time.perf_counter()
+        predictor.add_new_documents()
+        incremental = time.perf_counter() - t0
+        found = "palavranova" in predictor.suggest("palavran")
+
+    ms = 1000 * latencies
+    print("== predição de palavras ==")
+    print(f"  construção + abertura    {1000 * build:.0f} ms")
+    print(f"  suggest() média          {ms.mean():.3f} ms")
+    print(f"  suggest() p99            {np.percentile(ms, 99):.3f} ms")
+    print(f"  novo documento           {1000 * incremental:.0f} ms (palavra aprendida: {found})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
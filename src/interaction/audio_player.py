@@ -0,0 +1,168 @@
+# src/interaction/audio_player.py
+# Worker de áudio único: sons pré-decodificados + fila limitada de disparos.
+
+import queue
+import threading
+import time
+from collections import deque
+
+# Políticas para quando um som é disparado enquanto o anterior ainda toca
+POLICY_RESTART = "restart"  # Interrompe o som atual e toca de novo
+POLICY_QUEUE = "queue"      # Fila própria por som (toca cada disparo, em ordem, após o atual)
+POLICY_DROP = "drop"        # Ignora o novo disparo (comportamento antigo)
+POLICIES = (POLICY_RESTART, POLICY_QUEUE, POLICY_DROP)
+
+PENDING_POLL_SECONDS = 0.005  # Intervalo de verificação dos canais com sons na fila (POLICY_QUEUE)
+
+
+class AudioPlayer(threading.Thread):
+    """
+    Thread de longa duração que toca os sons de feedback (clique, tecla).
+
+    O pygame é importado e os sons são decodificados para PCM uma única vez,
+    já dentro da thread (não atrasa a abertura da janela). A UI só chama
+    `play()`, que coloca o pedido numa fila limitada e retorna imediatamente;
+    cada som tem um canal dedicado do mixer.
+
+    Com POLICY_QUEUE cada som tem uma fila FIFO própria (até `max_pending`
+    disparos) servida pelo worker quando o canal fica livre: o
+    `Channel.queue` do pygame guarda um único som e trocaria o pendente
+    pelo novo, perdendo cliques. Fila cheia conta como descarte.
+    """
+
+    def __init__(self, sounds: dict, policy: str = POLICY_RESTART, max_pending: int = 8):
+        super().__init__(daemon=True, name="AudioPlayerThread")
+        if policy not in POLICIES:
+            raise ValueError(f"Política de áudio inválida: {policy}")
+        self.sound_paths = dict(sounds)
+        self.policy = policy
+        self.running = False
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._sounds = {}
+        self._channels = {}
+        self._max_pending = max_pending
+        self._pending = {name: deque() for name in self.sound_paths}  # Instantes dos disparos à espera
+        self._dropped = 0
+        self._pygame = None
+
+        # Latência disparo -> Channel.play (segundos), últimas 200 amostras
+        self._latencies = deque(maxlen=200)
+        self._lat_lock = threading.Lock()
+
+    def _load_sounds(self):
+        """Inicializa o mixer e decodifica todos os sons (um canal por som)."""
+        import pygame
+        self._pygame = pygame
+        pygame.mixer.init()
+        pygame.mixer.set_num_channels(max(2, len(self.sound_paths)))
+        for i, (name, path) in enumerate(self.sound_paths.items()):
+            self._sounds[name] = pygame.mixer.Sound(path)
+            self._channels[name] = pygame.mixer.Channel(i)
+        print(f"[Audio] {len(self._sounds)} sons carregados (política: {self.policy}).")
+
+    def start(self):
+        if self.is_alive():
+            return
+        self.running = True
+        super().start()
+
+    def play(self, name: str):
+        """Pede a reprodução de um som. Nunca bloqueia a thread chamadora."""
+        if not self.running or name not in self.sound_paths:
+            return
+        try:
+            self._queue.put_nowait((name, time.perf_counter()))
+        except queue.Full:
+            self._dropped += 1
+
+    def run(self):
+        try:
+            self._load_sounds()
+        except Exception as e:
+            print(f"[Audio] ERRO ao inicializar ou carregar sons: {e}")
+            self.running = False
+            return
+
+        while self.running:
+            # Com sons na fila, acorda periodicamente para tocá-los quando o canal liberar
+            waiting = any(self._pending.values())
+            try:
+                item = self._queue.get(timeout=PENDING_POLL_SECONDS if waiting else None)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                break
+            if item:
+                self._trigger(*item)
+            if waiting:
+                self._serve_pending()
+
+    def _trigger(self, name, t_trigger):
+        channel = self._channels[name]
+        try:
+            if channel.get_busy() or self._pending[name]:
+                if self.policy == POLICY_DROP:
+                    self._dropped += 1
+                    return
+                if self.policy == POLICY_QUEUE:
+                    if len(self._pending[name]) >= self._max_pending:
+                        self._dropped += 1
+                    else:
+                        self._pending[name].append(t_trigger)
+                    return
+                channel.stop()  # POLICY_RESTART
+            channel.play(self._sounds[name])
+            self._record_latency(t_trigger)
+        except self._pygame.error as e:
+            print(f"[Audio] Erro ao tocar '{name}': {e}")
+
+    def _serve_pending(self):
+        """Toca o próximo disparo enfileirado de cada canal que ficou livre."""
+        for name, pending in self._pending.items():
+            if not pending:
+                continue
+            channel = self._channels[name]
+            try:
+                if channel.get_busy():
+                    continue
+                t_trigger = pending.popleft()
+                channel.play(self._sounds[name])
+                self._record_latency(t_trigger)  # Disparo -> início real da reprodução
+            except self._pygame.error as e:
+                print(f"[Audio] Erro ao tocar '{name}': {e}")
+
+    def _record_latency(self, t_trigger):
+        with self._lat_lock:
+            self._latencies.append(time.perf_counter() - t_trigger)
+
+    def get_latency_stats(self):
+        """Retorna estatísticas (ms) da latência disparo -> reprodução."""
+        with self._lat_lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        n = len(samples)
+        return {
+            "count": n,
+            "mean_ms": 1000.0 * sum(samples) / n,
+            "p95_ms": 1000.0 * samples[min(n - 1, int(0.95 * n))],
+            "max_ms": 1000.0 * samples[-1],
+            "dropped": self._dropped,
+        }
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        try:
+            self._queue.put_nowait(None)  # Acorda o worker
+        except queue.Full:
+            pass
+        self.join(timeout=0.5)
+        if self._pygame:
+            self._pygame.mixer.quit()
+        stats = self.get_latency_stats()
+        if stats:
+            print(f"[Audio] Latência disparo->play: média {stats['mean_ms']:.2f} ms, "
+                  f"p95 {stats['p95_ms']:.2f} ms, máx {stats['max_ms']:.2f} ms "
+                  f"({stats['count']} sons, {stats['dropped']} descartados)")
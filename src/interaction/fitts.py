@@ -0,0 +1,164 @@
+# src/interaction/fitts.py
+# Teste de aquisição de alvos (lei de Fitts, tarefa multidirecional da
+# ISO 9241-9): sequência de alvos num círculo, registro de cada seleção e
+# vazão efetiva (bits/s) por condição de distância x largura.
+# Sem Tk: a tela (ui/fitts_view.py) informa as seleções e o olhar.
+
+import math
+import time
+
+import numpy as np
+
+FITTS_WIDTHS = (90, 160)            # Largura dos alvos (px)
+FITTS_DISTANCES = (350, 700)        # Diâmetro do círculo de alvos (px)
+FITTS_TARGETS = 9                   # Alvos por círculo (ímpar: a sequência cruza o círculo)
+FITTS_TRIAL_TIMEOUT = 15.0          # Sem seleção nesse tempo = erro, passa ao próximo alvo
+EFFECTIVE_WIDTH_FACTOR = 4.133      # We = 4.133 * desvio padrão dos pontos finais
+MAX_SAVED_SESSIONS = 20             # Sessões guardadas por perfil
+
+
+def iso_sequence(n):
+    """Ordem ISO 9241-9: cada alvo é o oposto (quase) do anterior no círculo."""
+    step = (n + 1) // 2
+    return [(i * step) % n for i in range(n)]
+
+
+def circle_positions(center, diameter, n):
+    """Centros de `n` alvos num círculo (o primeiro no topo, sentido horário)."""
+    cx, cy = center
+    r = diameter / 2.0
+    return [(cx + r * math.sin(2 * math.pi * i / n), cy - r * math.cos(2 * math.pi * i / n))
+            for i in range(n)]
+
+
+def effective_throughput(trials):
+    """
+    Vazão efetiva de uma condição (ISO 9241-9). Cada tentativa tem "from" e
+    "target" (centros) e "end" (olhar no início da piscada, ou None).
+      - dx: ponto final projetado no eixo da tarefa, relativo ao alvo;
+      - We = 4.133 * std(dx); De = distância média percorrida no eixo;
+      - IDe = log2(De / We + 1); TPe = IDe / MT médio.
+    Retorna dict com IDe, We, De, MT e TPe (None se houver poucos pontos).
+    """
+    dx, de, mt = [], [], []
+    for t in trials:
+        mt.append(t["mt"])
+        if t["end"] is None:
+            continue
+        start, target, end = (np.asarray(t[k], dtype=float) for k in ("from", "target", "end"))
+        axis = target - start
+        length = np.linalg.norm(axis)
+        if length < 1e-6:
+            continue
+        along = float(np.dot(end - start, axis / length))
+        dx.append(along - length)
+        de.append(along)
+    out = {"n": len(trials), "mt": float(np.mean(mt)) if mt else None,
+           "we": None, "de": None, "ide": None, "tpe": None}
+    if len(dx) < 3 or not mt:
+        return out
+    we = EFFECTIVE_WIDTH_FACTOR * float(np.std(dx, ddof=1))
+    de_mean = float(np.mean(de))
+    if we <= 0:
+        return out
+    ide = math.log2(max(de_mean, 0.0) / we + 1.0)
+    out.update(we=we, de=de_mean, ide=ide, tpe=ide / out["mt"] if out["mt"] else None)
+    return out
+
+
+class FittsSession:
+    """
+    Sequência de condições (distância x largura) e o registro das seleções.
+
+    Em cada círculo a primeira seleção só inicia a contagem (não entra nas
+    estatísticas); a partir dela, cada alvo é medido do momento em que foi
+    apresentado até o clique.
+    """
+
+    def __init__(self, center, widths=FITTS_WIDTHS, distances=FITTS_DISTANCES,
+                 n_targets=FITTS_TARGETS, clock=time.monotonic):
+        self.center = center
+        self.n_targets = n_targets
+        self.clock = clock
+        self.conditions = [(d, w) for d in distances for w in widths]
+        self.sequence = iso_sequence(n_targets)
+        self.trials = []            # Tentativas medidas (todas as condições)
+        self.condition_index = 0
+        self.step = 0               # Posição na sequência do círculo atual (0 = alvo inicial)
+        self.presented_at = None
+
+    @property
+    def finished(self):
+        return self.condition_index >= len(self.conditions)
+
+    @property
+    def condition(self):
+        return self.conditions[self.condition_index]
+
+    def positions(self):
+        distance, _ = self.condition
+        return circle_positions(self.center, distance, self.n_targets)
+
+    def target_index(self):
+        return self.sequence[self.step % self.n_targets]
+
+    def present(self):
+        """Chamado quando o alvo atual aparece na tela."""
+        self.presented_at = self.clock()
+
+    def timed_out(self):
+        return (self.step > 0 and self.presented_at is not None
+                and self.clock() - self.presented_at > FITTS_TRIAL_TIMEOUT)
+
+    def record(self, clicked_index, end_point, latency=None):
+        """
+        Registra uma seleção (ou um timeout, com clicked_index=None) e avança.
+        Devolve True se o alvo certo foi selecionado.
+        """
+        target = self.target_index()
+        hit = clicked_index == target
+        if self.step == 0:
+            if not hit:
+                return False  # O alvo inicial precisa ser selecionado para começar
+        else:
+            positions = self.positions()
+            distance, width = self.condition
+            previous = self.sequence[(self.step - 1) % self.n_targets]
+            self.trials.append({
+                "distance": distance, "width": width,
+                "from": positions[previous], "target": positions[target],
+                "end": tuple(end_point) if end_point is not None else None,
+                "mt": self.clock() - self.presented_at,
+                "hit": hit, "timeout": clicked_index is None,
+                "latency": latency,
+            })
+
+        self.step += 1
+        if self.step > self.n_targets:  # Inicial + uma volta completa medida
+            self.condition_index += 1
+            self.step = 0
+        self.present()
+        return hit
+
+    def summary(self):
+        """Resumo serializável: por condição e geral (média das vazões das condições)."""
+        conditions = []
+        for distance, width in self.conditions:
+            trials = [t for t in self.trials if t["distance"] == distance and t["width"] == width]
+            if not trials:
+                continue
+            stats = effective_throughput(trials)
+            stats.update(distance=distance, width=width,
+                         id=math.log2(distance / width + 1.0),
+                         error_rate=sum(not t["hit"] for t in trials) / len(trials))
+            conditions.append(stats)
+        tpes = [c["tpe"] for c in conditions if c["tpe"] is not None]
+        latencies = [t["latency"] for t in self.trials if t["latency"] is not None]
+        return {
+            "throughput_bps": float(np.mean(tpes)) if tpes else None,
+            "error_rate": (sum(not t["hit"] for t in self.trials) / len(self.trials)) if self.trials else None,
+            "mean_mt": float(np.mean([t["mt"] for t in self.trials])) if self.trials else None,
+            "tracker_latency_ms": 1000 * float(np.mean(latencies)) if latencies else None,
+            "trials": len(self.trials),
+            "conditions": conditions,
+        }
@@ -0,0 +1,88 @@
+# src/interaction/scan_adaptation.py
+# Velocidade adaptativa do scanner: mede o tempo de reação do usuário (do
+# destaque até o início da piscada de seleção) e as seleções que caem um
+# item depois do pretendido, e ajusta o passo do scanner dentro de limites
+# seguros. O estado é salvo no perfil ("scan_adaptation").
+
+import numpy as np
+
+from tracking.streaming_stats import RingBuffer
+
+MIN_SCAN_DELAY = 0.45      # Passo mínimo (s), mesmo para usuários muito rápidos
+MAX_SCAN_DELAY = 2.5       # Passo máximo (s)
+ADAPT_WINDOW = 20          # Seleções recentes consideradas (acompanha o cansaço)
+MIN_SAMPLES = 5            # Seleções antes do primeiro ajuste
+REACTION_QUANTILE = 90     # O passo cobre 90% das reações recentes...
+REACTION_MARGIN = 0.2      # ...mais uma folga (s)
+OVERSHOOT_RT = 0.12        # Piscada iniciada até 120 ms após o destaque mudar = mirava o anterior
+OVERSHOOT_PENALTY = 1.5    # Cada 10% de overshoots alonga o passo em 15%
+SMOOTHING = 0.3            # Fração do caminho até o alvo a cada seleção
+
+
+class ScanSpeedAdapter:
+    """
+    Passo do scanner aprendido por perfil.
+
+    `observe(reaction)` recebe, a cada seleção confirmada, o tempo entre o
+    destaque do item e o início da piscada. Reações abaixo de OVERSHOOT_RT
+    (ou negativas: a piscada começou antes do destaque mudar) são contadas
+    como overshoot: o usuário reagia ao item anterior e a seleção caiu um
+    item depois. O passo alvo é o quantil REACTION_QUANTILE das reações
+    válidas + REACTION_MARGIN, alongado pela taxa de overshoots.
+    """
+
+    def __init__(self, scan_delay: float, min_delay: float = MIN_SCAN_DELAY,
+                 max_delay: float = MAX_SCAN_DELAY):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.scan_delay = float(np.clip(scan_delay, min_delay, max_delay))
+        self.reactions = RingBuffer(ADAPT_WINDOW)
+        self.overshoots = RingBuffer(ADAPT_WINDOW)  # 1.0 = overshoot, 0.0 = seleção normal
+        self.selections = 0
+        self.dirty = False
+
+    @property
+    def overshoot_rate(self):
+        return float(self.overshoots.values().mean()) if len(self.overshoots) else 0.0
+
+    def target_delay(self):
+        """Passo ideal com os dados atuais (None enquanto há poucas seleções)."""
+        if len(self.reactions) < MIN_SAMPLES:
+            return None
+        reaction = float(np.percentile(self.reactions.values(), REACTION_QUANTILE))
+        target = (reaction + REACTION_MARGIN) * (1.0 + OVERSHOOT_PENALTY * self.overshoot_rate)
+        return float(np.clip(target, self.min_delay, self.max_delay))
+
+    def observe(self, reaction: float) -> float:
+        """Registra uma seleção e devolve o novo passo do scanner."""
+        overshoot = reaction < OVERSHOOT_RT
+        self.overshoots.append(1.0 if overshoot else 0.0)
+        if not overshoot:
+            self.reactions.append(reaction)
+        self.selections += 1
+        self.dirty = True
+
+        target = self.target_delay()
+        if target is not None:
+            self.scan_delay += SMOOTHING * (target - self.scan_delay)
+        return self.scan_delay
+
+    def to_dict(self):
+        """Formato salvo no perfil."""
+        return {
+            "scan_delay": round(self.scan_delay, 3),
+            "selections": self.selections,
+            "reactions": [round(float(r), 3) for r in self.reactions.values()],
+            "overshoots": [int(o) for o in self.overshoots.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data, default_delay: float):
+        data = data or {}
+        adapter = cls(float(data.get("scan_delay", default_delay)))
+        for r in data.get("reactions", [])[-ADAPT_WINDOW:]:
+            adapter.reactions.append(float(r))
+        for o in data.get("overshoots", [])[-ADAPT_WINDOW:]:
+            adapter.overshoots.append(float(o))
+        adapter.selections = int(data.get("selections", 0))
+        return adapter
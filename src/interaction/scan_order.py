@@ -0,0 +1,105 @@
+# src/interaction/scan_order.py
+# Ordem de varredura adaptativa: teclas (e grupos) mais usados são destacados
+# primeiro. As frequências começam num perfil do português e são aprendidas
+# com as teclas que o usuário realmente aciona no Bloco de Notas.
+
+from interaction.state_machines import scan_leaves
+
+# Rótulo comum dos botões da linha de sugestões (o texto deles muda a cada tecla)
+SUGGESTION_LABEL = "Sugestão"
+
+# Frequência aproximada (%) dos caracteres em textos em português, por rótulo de tecla
+PORTUGUESE_KEY_FREQUENCIES = {
+    "Space": 17.0,
+    "a": 12.1, "e": 10.4, "o": 8.9, "s": 6.5, "r": 5.4, "i": 5.1, "n": 4.1,
+    "d": 4.1, "m": 3.9, "u": 3.8, "t": 3.6, "c": 3.2, "l": 2.3, "p": 2.1,
+    "v": 1.4, "g": 1.1, "h": 1.1, "q": 1.0, "b": 0.9, "f": 0.8, "z": 0.4,
+    "j": 0.3, "x": 0.2, "k": 0.02, "w": 0.02, "y": 0.02,
+    ",": 1.0, ".": 0.8, "Backspace": 2.0, "Enter": 0.4, "Shift": 0.5, "Caps": 0.05,
+    SUGGESTION_LABEL: 2.5,  # Por botão; uma sugestão aceita vale várias letras
+}
+# Peso do perfil inicial, em "teclas equivalentes" (quanto o uso real precisa para dominar)
+PRIOR_WEIGHT = 200.0
+# Frequência mínima (teclas raras nunca ficam com probabilidade zero)
+MIN_FREQUENCY = 0.01
+
+
+class KeyFrequencyModel:
+    """Contagem incremental de teclas acionadas + perfil inicial do português."""
+
+    def __init__(self, counts: dict = None, prior: dict = None, prior_weight: float = PRIOR_WEIGHT):
+        self.counts = dict(counts or {})
+        prior = PORTUGUESE_KEY_FREQUENCIES if prior is None else prior
+        total = sum(prior.values()) or 1.0
+        self.prior = {k: prior_weight * v / total for k, v in prior.items()}
+        self.dirty = False  # Há contagens novas ainda não salvas no perfil
+
+    def record(self, label: str):
+        """Registra uma tecla acionada (rótulo do botão; letras em minúsculo)."""
+        label = label.lower() if len(label) == 1 else label
+        self.counts[label] = self.counts.get(label, 0) + 1
+        self.dirty = True
+
+    def frequency(self, label: str) -> float:
+        label = label.lower() if len(label) == 1 else label
+        return max(MIN_FREQUENCY, self.prior.get(label, 0.0) + self.counts.get(label, 0))
+
+    @property
+    def total_recorded(self):
+        return sum(self.counts.values())
+
+    def to_dict(self):
+        """Formato salvo no perfil (só as contagens aprendidas)."""
+        return dict(self.counts)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(counts={k: int(v) for k, v in (data or {}).items()})
+
+
+def item_weights(labels, model):
+    """Peso de cada item; rótulos repetidos (os dois Shift) dividem a frequência."""
+    dup = {}
+    for label in labels:
+        dup[label] = dup.get(label, 0) + 1
+    return [model.frequency(label) / dup[label] for label in labels]
+
+
+def order_layout(layout, labels, model):
+    """
+    Reordena a árvore de varredura (build_scan_layout) por frequência: dentro
+    de cada grupo, os filhos com maior peso total vêm primeiro. A estrutura
+    (linhas/blocos) é mantida; só muda a ordem em que são destacados.
+    """
+    weights = item_weights(labels, model)
+
+    def weight(node):
+        return sum(weights[i] for i in scan_leaves(node))
+
+    def order(node):
+        if not isinstance(node, list):
+            return node
+        return sorted((order(child) for child in node), key=weight, reverse=True)
+
+    return order(layout)
+
+
+def expected_steps(layout, labels, model):
+    """
+    Número esperado de passos do scanner por caractere: soma, em cada nível,
+    da posição (1 = primeiro destaque) do nó que contém a tecla, ponderada
+    pela probabilidade da tecla.
+    """
+    weights = item_weights(labels, model)
+    total = sum(weights) or 1.0
+    steps = [0] * len(labels)
+
+    def walk(node, depth_steps):
+        if not isinstance(node, list):
+            steps[node] = depth_steps
+            return
+        for pos, child in enumerate(node):
+            walk(child, depth_steps + pos + 1)
+
+    walk(layout, 0)
+    return sum(w * s for w, s in zip(weights, steps)) / total
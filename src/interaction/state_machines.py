@@ -0,0 +1,422 @@
+# src/interaction/state_machines.py
+# Máquinas de estado puras da interação (clique do dashboard e scanner).
+#
+# Não conhecem Tk nem câmera: recebem os eventos de gesto do tracker
+# (tracking/gestures.py), leem o tempo de um relógio injetável e devolvem
+# ações abstratas que o App executa. Com um SimulatedClock, milhares de
+# sessões rodam mais rápido que o tempo real (ver benchmarks/).
+
+import time
+from collections import namedtuple
+
+from tracking.gestures import BLINK, RIGHT_WINK, LEFT_WINK
+
+# kind: uma das constantes ACTION_*; arg: alvo/índice/nome, conforme o tipo
+Action = namedtuple("Action", "kind arg")
+
+ACTION_MOVE_TO = "move_to"        # arg: alvo (widget) sob o olhar -> centraliza o cursor
+ACTION_CLICK = "click"            # arg: alvo a ser clicado
+ACTION_HIGHLIGHT = "highlight"    # arg: tupla com os índices dos itens destacados (linha/bloco/tecla)
+ACTION_UNHIGHLIGHT = "unhighlight"
+ACTION_INVOKE = "invoke"          # arg: índice do item do scanner
+ACTION_SOUND = "sound"            # arg: nome do som
+ACTION_BOOST = "boost"            # arg: True (ligou) / False (desligou)
+ACTION_EXIT = "exit_scan"
+
+# Modos de varredura (ver build_scan_layout)
+SCAN_LINEAR = "linear"
+SCAN_ROW_COLUMN = "row_column"
+SCAN_BLOCK_ROW_COLUMN = "block_row_column"
+SCAN_LAYOUTS = (SCAN_LINEAR, SCAN_ROW_COLUMN, SCAN_BLOCK_ROW_COLUMN)
+
+# Estados do clique do dashboard
+IDLE = "IDLE"
+PRE_LOCKED = "PRE_LOCKED"
+LOCKED = "LOCKED"
+
+# Tempos (segundos). O App sobrescreve com as suas constantes.
+DEFAULT_TIMINGS = {
+    "dashboard_click": 1.0,  # Piscada longa que clica no dashboard
+    "click_freeze": 5.0,     # Congelamento do olhar após um clique
+    "scan_dwell": 0.7,       # Piscada que pausa o scanner
+    "scan_click": 1.0,       # Piscada que aciona o item destacado
+    "boost_on": 1.5,         # Wink direito que liga o boost
+    "boost_off": 0.1,        # Wink direito que desliga o boost
+    "scan_escape": 1.5,      # Wink esquerdo que sai do scanner
+    "scan_delay": 1.1,       # Passo normal do scanner
+    "boost_delay": 0.2,      # Passo do scanner com boost
+}
+
+
+def build_scan_layout(rows, mode=SCAN_ROW_COLUMN, block_size=4):
+    """
+    Monta a árvore de varredura a partir das linhas do teclado (listas de
+    índices dos itens). Cada nó é um índice (item) ou uma lista (grupo).
+
+      linear:           todos os itens em sequência
+      row_column:       linhas -> itens da linha
+      block_row_column: linhas -> blocos de até `block_size` itens -> itens
+                        (o teclado tem só 5 linhas, então os blocos dividem
+                        as linhas longas, que são o gargalo)
+
+    Grupos com um único filho são colapsados (a barra de espaço é selecionada
+    direto no nível das linhas).
+    """
+    if mode not in SCAN_LAYOUTS:
+        raise ValueError(f"Modo de varredura inválido: {mode}")
+    if mode == SCAN_LINEAR:
+        return [i for row in rows for i in row]
+
+    def collapse(node):
+        if isinstance(node, list):
+            node = [collapse(child) for child in node]
+            return node[0] if len(node) == 1 else node
+        return node
+
+    layout = []
+    for row in rows:
+        if mode == SCAN_BLOCK_ROW_COLUMN and len(row) > block_size:
+            n_blocks = -(-len(row) // block_size)
+            size = -(-len(row) // n_blocks)  # Blocos de tamanho parecido
+            row = [row[i:i + size] for i in range(0, len(row), size)]
+        layout.append(collapse(list(row)))
+    return [node for node in layout if node != []]
+
+
+def scan_leaves(node):
+    """Tupla com todos os itens (folhas) sob um nó da árvore de varredura."""
+    if isinstance(node, list):
+        return tuple(i for child in node for i in scan_leaves(child))
+    return (node,)
+
+
+def configure_gesture_holds(recognizer, timings=None):
+    """Registra no GestureRecognizer os limiares "_held" usados pelas máquinas."""
+    t = dict(DEFAULT_TIMINGS, **(timings or {}))
+    recognizer.set_holds(BLINK, {
+        "dashboard_click": t["dashboard_click"],
+        "scan_dwell": t["scan_dwell"],
+        "scan_click": t["scan_click"],
+    })
+    recognizer.set_holds(RIGHT_WINK, {"boost_off": t["boost_off"], "boost_on": t["boost_on"]})
+    recognizer.set_holds(LEFT_WINK, {"scan_escape": t["scan_escape"]})
+
+
+class MonotonicClock:
+    """Relógio real (mesma base dos timestamps de captura da câmera)."""
+
+    def now(self):
+        return time.monotonic()
+
+
+class SimulatedClock:
+    """Relógio manual para simulações e benchmarks."""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def advance(self, seconds: float):
+        self._now += seconds
+        return self._now
+
+    def set(self, t: float):
+        self._now = t
+
+
+class DashboardClickMachine:
+    """
+    Clique por piscada longa: IDLE -> PRE_LOCKED (piscou; cursor vai ao alvo)
+    -> LOCKED (limiar "dashboard_click" atingido; clica) -> IDLE (abriu os olhos).
+    Depois de um clique, os gestos são descartados por `click_freeze` segundos.
+
+    O alvo é congelado no início da piscada. Com `target_at(onset)`, ele é
+    resolvido pelo olhar de antes desse instante (histórico do tracker);
+    se não houver resposta, vale o alvo sob o olhar no momento.
+    """
+
+    def __init__(self, clock=None, timings=None, log=None):
+        self.clock = clock or MonotonicClock()
+        self.timings = dict(DEFAULT_TIMINGS, **(timings or {}))
+        self.log = log
+        self.reset()
+
+    def reset(self):
+        self.state = IDLE
+        self.blink_start_time = 0.0
+        self.clicked_time = None
+        self.locked_target = None
+
+    @property
+    def frozen(self):
+        if self.clicked_time is None:
+            return False
+        if self.clock.now() - self.clicked_time < self.timings["click_freeze"]:
+            return True
+        self.clicked_time = None
+        return False
+
+    @property
+    def blocks_movement(self):
+        """Durante o congelamento ou uma intenção de clique o olhar não move o cursor."""
+        return self.frozen or self.state != IDLE
+
+    def step(self, events, target, target_at=None):
+        """
+        Processa os eventos de gesto; `target` é o alvo atualmente sob o olhar
+        e `target_at(onset)` (opcional) o alvo do olhar antes da piscada.
+        """
+        if self.frozen:
+            return []
+
+        actions = []
+        for event in events:
+            if event.kind == "blink_start" and self.state == IDLE:
+                self.state = PRE_LOCKED
+                self.blink_start_time = event.timestamp
+                resolved = target_at(event.timestamp) if target_at else None
+                self.locked_target = resolved if resolved is not None else target
+                if self.locked_target is not None:
+                    actions.append(Action(ACTION_MOVE_TO, self.locked_target))
+
+            elif event.kind == "blink_held" and event.hold == "dashboard_click":
+                if self.state == PRE_LOCKED:
+                    self.state = LOCKED  # Espera abrir o olho
+                    if self.locked_target is not None:
+                        actions.append(Action(ACTION_CLICK, self.locked_target))
+                        self.state = IDLE
+                        self.locked_target = None
+                        self.clicked_time = self.clock.now()
+                        return actions  # Gestos restantes caem no congelamento
+
+            elif event.kind == "blink_end":
+                self.state = IDLE
+                self.locked_target = None
+        return actions
+
+
+class ScanMachine:
+    """
+    Varredura (linear ou por grupos) com gestos:
+      - piscada: "scan_dwell" pausa, "scan_click" seleciona (uma vez por piscada).
+        Num grupo (linha/bloco), entra nele; num item, aciona e volta ao topo;
+      - wink direito: liga ("boost_on") ou desliga ("boost_off") o passo rápido;
+      - wink esquerdo: "scan_escape" sai do scanner.
+    Enquanto uma piscada ou o wink esquerdo estão ativos, o scanner não avança.
+    Dentro de um grupo, após `max_group_cycles` voltas sem seleção, retorna ao topo.
+
+    Com um `adapter` (interaction/scan_adaptation.py), cada seleção informa o
+    tempo de reação (destaque -> início da piscada) e o passo normal passa a
+    ser o aprendido por ele; o passo do boost continua fixo.
+    """
+
+    def __init__(self, clock=None, timings=None, log=None, max_group_cycles=2, adapter=None):
+        self.clock = clock or MonotonicClock()
+        self.timings = dict(DEFAULT_TIMINGS, **(timings or {}))
+        self.log = log
+        self.max_group_cycles = max_group_cycles
+        self.adapter = adapter
+        self.active = False
+        self.layout = []
+        self.restart_on_select = False
+        self._reset_state()
+
+    def _reset_state(self):
+        self._stack = [self.layout]  # Grupo atual = _stack[-1]
+        self._cycles = 0
+        self.index = -1
+        self.last_step_time = 0.0
+        self.highlight_time = 0.0         # Quando o destaque atual apareceu
+        self.blink_start_time = 0.0       # Piscada em andamento (pré-timer)
+        self.is_dwell_clicking = False    # Pausa confirmada ("scan_dwell")
+        self.is_boost_pre_dwelling = False
+        self.is_boost_active = False
+        self.escape_start_time = 0.0
+
+    def _log(self, msg):
+        if self.log:
+            self.log(msg)
+
+    @property
+    def delay(self):
+        if self.is_boost_active:
+            return self.timings["boost_delay"]
+        return self.adapter.scan_delay if self.adapter else self.timings["scan_delay"]
+
+    @property
+    def paused(self):
+        return bool(self.blink_start_time or self.escape_start_time)
+
+    @property
+    def group(self):
+        return self._stack[-1]
+
+    @property
+    def depth(self):
+        """0 no nível de topo; 1 dentro de uma linha; 2 dentro de um bloco."""
+        return len(self._stack) - 1
+
+    def highlighted(self):
+        """Itens atualmente destacados (tupla vazia se nenhum)."""
+        if 0 <= self.index < len(self.group):
+            return scan_leaves(self.group[self.index])
+        return ()
+
+    def start(self, layout, restart_on_select=False):
+        """
+        Entra no modo de varredura. `layout` é o número de itens (varredura
+        linear) ou a árvore de build_scan_layout. O primeiro destaque sai no
+        próximo passo.
+
+        Após acionar um item dentro de um grupo a varredura sempre volta ao
+        topo; no nível de topo ela continua do item acionado, a não ser com
+        `restart_on_select` (ordem por frequência: o início é o mais provável).
+        """
+        self.layout = list(range(layout)) if isinstance(layout, int) else layout
+        self.restart_on_select = restart_on_select
+        self._reset_state()
+        self.active = True
+        self.last_step_time = self.clock.now() - self.delay
+        return []
+
+    def stop(self):
+        """Sai do modo de varredura e devolve a limpeza do destaque."""
+        actions = []
+        if self.highlighted():
+            actions.append(Action(ACTION_UNHIGHLIGHT, self.highlighted()))
+        self.active = False
+        self._reset_state()
+        return actions
+
+    def _select(self, actions):
+        """Seleção pela piscada: entra no grupo destacado ou aciona o item."""
+        now = self.clock.now()
+        self.last_step_time = now  # Reinicia o passo após o clique
+        if not 0 <= self.index < len(self.group):
+            return
+        node = self.group[self.index]
+        if isinstance(node, list):
+            actions.append(Action(ACTION_UNHIGHLIGHT, scan_leaves(node)))
+            self._stack.append(node)
+            self._cycles = 0
+            self.index = 0
+            self.highlight_time = now
+            actions.append(Action(ACTION_HIGHLIGHT, scan_leaves(node[0])))
+            return
+
+        actions.append(Action(ACTION_INVOKE, node))
+        if self.depth or (self.restart_on_select and self.index):
+            # Volta ao topo já destacando o primeiro grupo
+            actions.append(Action(ACTION_UNHIGHLIGHT, (node,)))
+            self._stack = [self.layout]
+            self._cycles = 0
+            self.index = 0
+            self.highlight_time = now
+            actions.append(Action(ACTION_HIGHLIGHT, scan_leaves(self.layout[0])))
+
+    def step(self, events):
+        """Processa os eventos na ordem em que aconteceram e avança a varredura."""
+        if not self.active:
+            return []
+        actions = []
+        for event in events:
+            kind, hold = event.kind, event.hold
+
+            # Escape (olho esquerdo) - reseta as outras intenções para não conflitar
+            if kind == "left_wink_start":
+                self.is_boost_pre_dwelling = False
+                self.blink_start_time = 0.0
+                self.is_dwell_clicking = False
+                self.escape_start_time = event.timestamp
+                self._log("[Scanner] Iniciando timer ESCAPE (Esquerda)...")
+
+            elif kind == "left_wink_held" and hold == "scan_escape":
+                self._log("[Scanner] ESCAPE CONFIRMADO! Saindo do teclado.")
+                actions.append(Action(ACTION_SOUND, "key"))
+                actions.append(Action(ACTION_EXIT, None))
+                return actions
+
+            elif kind == "left_wink_end":
+                self.escape_start_time = 0.0
+
+            # Clique: piscada com os DOIS olhos (mantém o estado do boost)
+            elif kind == "blink_start":
+                self.is_boost_pre_dwelling = False
+                self.blink_start_time = event.timestamp
+
+            elif kind == "blink_held" and hold == "scan_dwell":
+                self.is_dwell_clicking = True
+                self._log(f"[Scanner] Dwell ({self.timings['scan_dwell']}s) detectado. Pausando scan.")
+
+            elif kind == "blink_held" and hold == "scan_click":
+                self._log("[Scanner] CLIQUE!")
+                self._observe_reaction()
+                self._select(actions)
+                self.is_dwell_clicking = False
+
+            elif kind == "blink_end":
+                self.blink_start_time = 0.0
+                self.is_dwell_clicking = False
+                # De olhos fechados o usuário não viu o destaque: o passo e a
+                # medida da reação recomeçam quando os olhos abrem
+                if self.highlight_time:
+                    self.highlight_time = max(self.highlight_time, event.timestamp)
+                    self.last_step_time = max(self.last_step_time, event.timestamp)
+
+            # Boost: cada wink só liga OU desliga; o estado no início do wink decide
+            elif kind == "right_wink_start":
+                if not self.is_boost_active:
+                    self.is_boost_pre_dwelling = True
+                    self._log("[Scanner] Iniciando timer para ATIVAR Boost...")
+                else:
+                    self._log("[Scanner] Iniciando timer para DESATIVAR Boost...")
+
+            elif kind == "right_wink_held" and hold == "boost_on":
+                if self.is_boost_pre_dwelling and not self.is_boost_active:
+                    self.is_boost_active = True
+                    self.is_boost_pre_dwelling = False
+                    self._log("[Scanner] BOOST ATIVADO (Modo Rápido)")
+                    actions.append(Action(ACTION_BOOST, True))
+                    actions.append(Action(ACTION_SOUND, "key"))
+
+            elif kind == "right_wink_held" and hold == "boost_off":
+                if self.is_boost_active and not self.is_boost_pre_dwelling:
+                    self.is_boost_active = False
+                    self._log("[Scanner] BOOST DESATIVADO (Modo Normal)")
+                    actions.append(Action(ACTION_BOOST, False))
+                    actions.append(Action(ACTION_SOUND, "key"))
+
+            elif kind == "right_wink_end":
+                self.is_boost_pre_dwelling = False
+
+        if self.paused or not self.layout:
+            return actions
+
+        now = self.clock.now()
+        if now - self.last_step_time >= self.delay:
+            if self.highlighted():
+                actions.append(Action(ACTION_UNHIGHLIGHT, self.highlighted()))
+            self.index += 1
+            if self.index >= len(self.group):
+                self.index = 0
+                if self.depth:
+                    self._cycles += 1
+                    if self._cycles >= self.max_group_cycles:
+                        self._stack = [self.layout]  # Desistiu do grupo: volta ao topo
+                        self._cycles = 0
+            actions.append(Action(ACTION_HIGHLIGHT, self.highlighted()))
+            self.last_step_time = now
+            self.highlight_time = now
+        return actions
+
+    def _observe_reaction(self):
+        """Informa ao adaptador o tempo de reação da seleção (só no passo normal)."""
+        if not self.adapter or self.is_boost_active or not self.highlight_time:
+            return
+        old = self.adapter.scan_delay
+        new = self.adapter.observe(self.blink_start_time - self.highlight_time)
+        if abs(new - old) >= 0.01:
+            self._log(f"[Scanner] Passo adaptado: {old:.2f}s -> {new:.2f}s "
+                      f"(overshoots {100 * self.adapter.overshoot_rate:.0f}%)")
@@ -0,0 +1,316 @@
+# src/interaction/word_prediction.py
+# Predição/complemento de palavras para o Bloco de Notas.
+#
+# Modelo persistido num diretório de arrays .npy abertos com mmap (abre na
+# hora, sem desserializar):
+#   words_blob.npy / words_offsets.npy  palavras em UTF-8, ordenadas por bytes.
+#                                       É um trie compacto em forma de array:
+#                                       cada prefixo corresponde a um intervalo
+#                                       contíguo de ids, achado por busca binária.
+#   unigrams.npy                        contagem de cada palavra (uint32)
+#   bigrams.npy                         linhas (anterior, próxima, contagem), ordenadas
+#   meta.json                           versão e documentos já incorporados
+#
+# Fontes: lista de palavras do português (resources/words) + documentos salvos
+# pelo Bloco de Notas. Documentos novos são somados ao modelo de forma
+# incremental; o texto em edição entra numa camada em memória.
+
+import bisect
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+import numpy as np
+
+MODEL_VERSION = 1
+WORD_LIST_FILE = os.path.join("resources", "words", "pt_br.txt")
+DOC_WORD_WEIGHT = 5        # Cada ocorrência num documento do usuário vale 5 na lista base
+BIGRAM_WEIGHT = 0.7        # Interpolação P(w|anterior) x P(w)
+MAX_SUGGESTIONS = 4
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+def tokenize(text: str):
+    """Palavras (só letras) em minúsculo, na ordem do texto."""
+    return _WORD_RE.findall(text.lower())
+
+
+class _WordView:
+    """Sequência de bytes das palavras sobre o blob mapeado (para o bisect)."""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+
+def _count_documents(paths, unigrams, bigrams):
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"[Predição] Ignorando '{path}': {e}")
+            continue
+        prev = None
+        for word in tokenize(text):
+            unigrams[word] = unigrams.get(word, 0) + DOC_WORD_WEIGHT
+            if prev is not None:
+                bigrams[(prev, word)] = bigrams.get((prev, word), 0) + 1
+            prev = word
+
+
+def _write_model(model_dir, unigrams: dict, bigrams: dict, meta: dict):
+    """Grava o modelo num diretório temporário e troca pelo atual."""
+    words = sorted(unigrams, key=lambda w: w.encode("utf-8"))
+    ids = {w: i for i, w in enumerate(words)}
+    encoded = [w.encode("utf-8") for w in words]
+    offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    counts = np.array([unigrams[w] for w in words], dtype=np.uint32)
+    rows = sorted((ids[a], ids[b], c) for (a, b), c in bigrams.items() if a in ids and b in ids)
+    big = np.array(rows, dtype=np.uint32).reshape(-1, 3)
+
+    tmp_dir = model_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    np.save(os.path.join(tmp_dir, "words_blob.npy"), blob)
+    np.save(os.path.join(tmp_dir, "words_offsets.npy"), offsets)
+    np.save(os.path.join(tmp_dir, "unigrams.npy"), counts)
+    np.save(os.path.join(tmp_dir, "bigrams.npy"), big)
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    shutil.rmtree(model_dir, ignore_errors=True)
+    os.replace(tmp_dir, model_dir)
+
+
+class WordPredictor:
+    """
+    Sugestões por prefixo + palavra anterior. `suggest()` é chamado a cada
+    tecla; carregamento e incorporação de documentos rodam em segundo plano
+    (`start_loading`), e até lá as sugestões ficam vazias.
+    """
+
+    def __init__(self, model_dir: str, docs_dir: str, word_list: str = WORD_LIST_FILE):
+        self.model_dir = model_dir
+        self.docs_dir = docs_dir
+        self.word_list = word_list
+        self.ready = False
+        self._lock = threading.Lock()          # Protege a troca dos arrays mapeados
+        self._update_lock = threading.Lock()   # Serializa reescritas do modelo
+        self._thread = None
+        self._meta = {}
+        self._words = None
+        self._unigrams = None
+        self._bigrams = None
+        self._total = 1
+        # Camada em memória: o que está sendo digitado agora (ainda não salvo)
+        self._session_unigrams = {}
+        self._session_bigrams = {}
+
+    # --- Carregamento / construção ---
+
+    def start_loading(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load, daemon=True, name="WordPredictorLoad")
+            self._thread.start()
+
+    def _load(self):
+        t0 = time.perf_counter()
+        try:
+            if not self._read_meta() or self._meta.get("version") != MODEL_VERSION:
+                self._build()
+            self._open()
+            self.add_new_documents()
+            self.ready = True
+            print(f"[Predição] {len(self._words)} palavras, {len(self._bigrams)} bigramas "
+                  f"({1000 * (time.perf_counter() - t0):.0f} ms).")
+        except Exception as e:
+            print(f"[Predição] ERRO ao carregar o modelo: {e}")
+
+    def _read_meta(self):
+        try:
+            with open(os.path.join(self.model_dir, "meta.json"), "r", encoding="utf-8") as f:
+                self._meta = json.load(f)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _build(self):
+        """Construção completa: lista base + todos os documentos salvos."""
+        unigrams = {}
+        with open(self.word_list, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("#") or not line.strip():
+                    continue
+                word, count = line.split()
+                unigrams[word.lower()] = unigrams.get(word.lower(), 0) + int(count)
+        bigrams = {}
+        docs = self._list_documents()
+        _count_documents(docs.values(), unigrams, bigrams)
+        self._meta = {"version": MODEL_VERSION, "documents": {k: os.path.getmtime(p) for k, p in docs.items()}}
+        _write_model(self.model_dir, unigrams, bigrams, self._meta)
+
+    def _open(self):
+        """Abre os arrays com mmap (troca atômica sob o lock)."""
+        load = lambda name: np.load(os.path.join(self.model_dir, name), mmap_mode="r")
+        words = _WordView(load("words_blob.npy"), load("words_offsets.npy"))
+        unigrams = load("unigrams.npy")
+        bigrams = load("bigrams.npy")
+        with self._lock:
+            self._words, self._unigrams, self._bigrams = words, unigrams, bigrams
+            self._total = max(1, int(unigrams.sum(dtype=np.uint64)))
+
+    def _close(self):
+        with self._lock:
+            self._words = self._unigrams = self._bigrams = None
+
+    def _list_documents(self):
+        if not os.path.isdir(self.docs_dir):
+            return {}
+        return {name: os.path.join(self.docs_dir, name)
+                for name in sorted(os.listdir(self.docs_dir)) if name.endswith(".txt")}
+
+    def refresh_async(self):
+        """Incorpora documentos recém-salvos sem travar a UI."""
+        if self.ready:
+            threading.Thread(target=self.add_new_documents, daemon=True, name="WordPredictorUpdate").start()
+
+    def add_new_documents(self):
+        """Soma ao modelo os documentos salvos ainda não incorporados (incremental)."""
+        with self._update_lock:
+            return self._add_new_documents()
+
+    def _add_new_documents(self):
+        known = self._meta.get("documents", {})
+        docs = self._list_documents()
+        # Documento salvo de novo com o mesmo nome: as contagens antigas dele
+        # não ficam separadas no modelo, então ele é reconstruído do zero
+        changed = [k for k, p in docs.items() if k in known and os.path.getmtime(p) != known[k]]
+        if changed:
+            self._close()
+            self._build()
+            self._open()
+            print(f"[Predição] {len(changed)} documento(s) alterado(s): modelo reconstruído.")
+            return len(changed) + len([k for k in docs if k not in known])
+        new = {k: p for k, p in docs.items() if k not in known}
+        if not new:
+            return 0
+        with self._lock:
+            words = [self._words[i].decode("utf-8") for i in range(len(self._words))]
+            unigrams = dict(zip(words, self._unigrams.tolist()))
+            bigrams = {(words[a], words[b]): c for a, b, c in self._bigrams.tolist()}
+        _count_documents(new.values(), unigrams, bigrams)
+        known.update({k: os.path.getmtime(p) for k, p in new.items()})
+        self._meta["documents"] = known
+        self._close()  # Libera o mmap antes de substituir os arquivos
+        _write_model(self.model_dir, unigrams, bigrams, self._meta)
+        self._open()
+        print(f"[Predição] {len(new)} documento(s) incorporado(s) ao modelo.")
+        return len(new)
+
+    # --- Camada da sessão ---
+
+    def learn(self, prev, word):
+        """Registra uma palavra concluída no texto em edição."""
+        if not word:
+            return
+        self._session_unigrams[word] = self._session_unigrams.get(word, 0) + DOC_WORD_WEIGHT
+        if prev:
+            self._session_bigrams[(prev, word)] = self._session_bigrams.get((prev, word), 0) + 1
+
+    def reset_session(self):
+        """Esquece o texto em edição (salvo como documento ou descartado)."""
+        self._session_unigrams.clear()
+        self._session_bigrams.clear()
+
+    # --- Consulta ---
+
+    def _find(self, word_bytes):
+        """Id da palavra exata (ou None)."""
+        i = bisect.bisect_left(self._words, word_bytes)
+        if i < len(self._words) and self._words[i] == word_bytes:
+            return i
+        return None
+
+    def suggest(self, prefix: str, prev: str = None, k: int = MAX_SUGGESTIONS):
+        """Até `k` palavras que começam com `prefix`, considerando a palavra anterior."""
+        if not self.ready:
+            return []
+        prefix = prefix.lower()
+        prev = prev.lower() if prev else None
+        candidates = {}
+        with self._lock:
+            if self._words is not None:  # None só durante a troca dos arquivos
+                candidates = self._suggest_base(prefix, prev, k)
+
+        # Camada da sessão
+        for word, c in self._session_unigrams.items():
+            if word.startswith(prefix):
+                candidates.setdefault(word, [0, 0])[0] += c
+        if prev is not None:
+            for (a, word), c in self._session_bigrams.items():
+                if a == prev and word.startswith(prefix):
+                    candidates.setdefault(word, [0, 0])[1] += c
+
+        prev_total = sum(v[1] for v in candidates.values())
+        lam = BIGRAM_WEIGHT if prev_total else 0.0
+
+        def score(item):
+            uni, big = item[1]
+            return lam * big / max(1, prev_total) + (1 - lam) * uni / self._total
+
+        ranked = sorted(((w, v) for w, v in candidates.items() if w != prefix), key=score, reverse=True)
+        return [w for w, _ in ranked[:k]]
+
+    def _suggest_base(self, prefix, prev, k):
+        """Candidatos do modelo mapeado: {palavra: [contagem, contagem do bigrama]}."""
+        words, unigrams, bigrams = self._words, self._unigrams, self._bigrams
+        scores = {}
+        pb = prefix.encode("utf-8")
+        lo = bisect.bisect_left(words, pb)
+        hi = bisect.bisect_left(words, pb + b"\xff", lo)  # 0xFF não existe em UTF-8
+
+        # Unigramas: as melhores do intervalo do prefixo
+        if hi > lo:
+            span = np.asarray(unigrams[lo:hi])
+            top = min(len(span), 4 * k)
+            best = np.argpartition(-span.astype(np.int64), top - 1)[:top]
+            for j in best:
+                scores[lo + int(j)] = [int(span[j]), 0]
+
+        # Bigramas: linhas da palavra anterior cuja próxima está no intervalo
+        if prev is not None and len(bigrams):
+            prev_id = self._find(prev.encode("utf-8"))
+            if prev_id is not None:
+                col = bigrams[:, 0]
+                a = int(np.searchsorted(col, prev_id, "left"))
+                b = int(np.searchsorted(col, prev_id, "right"))
+                for _, nxt, c in np.asarray(bigrams[a:b]).tolist():
+                    if lo <= nxt < hi:
+                        entry = scores.setdefault(nxt, [int(unigrams[nxt]), 0])
+                        entry[1] += c
+        return {words[i].decode("utf-8"): v for i, v in scores.items()}
+
+
+def split_context(text_before_cursor: str):
+    """
+    Separa o texto antes do cursor em (prefixo da palavra atual, palavra anterior).
+    Depois de pontuação final a palavra anterior é descartada (novo período).
+    """
+    m = re.search(r"([^\W\d_]*)$", text_before_cursor)
+    prefix = m.group(1)
+    rest = text_before_cursor[:m.start()]
+    if re.search(r"[.!?\n]\s*$", rest):
+        return prefix, None
+    words = tokenize(rest[-80:])
+    return prefix, (words[-1] if words and re.search(r"[^\W\d_]\s*$", rest) else None)
@@ -1,4 +1,6 @@
 # src/main.py
+import time
+_T_START = time.perf_counter()  # Referência do relatório de inicialização
 import tkinter as tk
 from tkinter import messagebox
 import threading
@@ -10,51 +12,91 @@ from PIL import Image, ImageTk
 import pyautogui
 import screeninfo
 import cv2
-import time
 import os
-import pygame
 
 # --- Importações das Views ---
 from ui.dashboard_view import DashboardFrame
 from ui.calibrator_view import CalibratorFrame
 from ui.notepad_view import NotepadFrame
 from ui.calibration_screen_view import CalibrationScreenFrame
+from ui.fitts_view import FittsFrame
 
 from tracking.eye_tracker import EyeTracker
 from tracking import calibration
+from tracking import camera_probe
+from tracking import monitor_core as mc
+from tracking.fixations import FIXATION_END
+from tracking.screen_mapping import calibration_points
+from tracking.head_pose import HEAD_POSE_ESTIMATORS, DEFAULT_HEAD_POSE
+from tracking.camera_manager import acquire_camera, get_camera_manager
+from tracking.face_mesh_warmup import start_face_mesh_warmup
+from interaction.audio_player import AudioPlayer
+from interaction.scan_order import KeyFrequencyModel, order_layout, expected_steps, SUGGESTION_LABEL
+from interaction.word_prediction import WordPredictor, split_context
+from interaction.scan_adaptation import ScanSpeedAdapter
+from interaction.fitts import MAX_SAVED_SESSIONS
+from interaction.state_machines import (
+    DashboardClickMachine, ScanMachine, MonotonicClock, configure_gesture_holds, build_scan_layout,
+    ACTION_MOVE_TO, ACTION_CLICK, ACTION_HIGHLIGHT, ACTION_UNHIGHLIGHT, ACTION_INVOKE,
+    ACTION_SOUND, ACTION_EXIT,
+)
 
 # --- CONSTANTES ---
 SNAP_THRESHOLD_PIXELS = 300
 CAM_PROBE_MAX = 4
 PREVIEW_SIZE = (320, 240)  # Usado pela tela de startup
 GAZE_MOVE_DELAY = 5
-GAZE_STABILITY_DELAY = 1.5
-GAZE_TOLERANCE_PX = 80
+FIXATION_DISPERSION_PX = 150  # Dispersão máxima de uma fixação, (max-min) em x + em y (I-DT)
+FIXATION_MIN_DURATION = 0.2   # Fixação confirmada após 200 ms (antes: 1.5 s de olhar estável)
+PRE_BLINK_WINDOW = 0.25       # Janela de olhar usada para resolver o alvo do clique (s)...
+PRE_BLINK_GUARD = 0.1         # ...terminando esse tempo antes do início da piscada (pálpebra já desce)
+GAZE_CORRECTION_MAX_WIDGET_PX = 400  # Widgets maiores (teclado, texto) não rotulam o olhar pelo centro
+CALIB_POINT_SETTLE_SECONDS = 0.6  # Calibração multiponto: espera o olhar chegar ao novo '+' antes de capturar
+FIXATION_REFINE_PX = 25       # Durante a fixação, o cursor só segue o centróide se ele andar mais que isso
 SCAN_DELAY_SECONDS = 1.1  # Tempo de varredura (3 segundos)
 # --- CONSTANTES FASE 4 (BOOST) ---
 SCAN_BOOST_DELAY_SECONDS = 0.2  # Velocidade do boost (100ms)
 SCAN_BOOST_PRE_TIMER_SECONDS = 1.5 # de olho direito fechado para ATIVAR
 SCAN_BOOST_STOP_TIMER_SECONDS = 0.1
 SCAN_ESC_PRE_TIMER_SECONDS = 1.5
+# Varredura por grupos: "linear", "row_column" ou "block_row_column"
+SCAN_LAYOUT_MODE = "row_column"
+SCAN_BLOCK_SIZE = 4  # Teclas por bloco no modo block_row_column
+SCAN_FREQUENCY_ORDER = True  # Teclas/grupos mais usados são destacados primeiro
+SCAN_ADAPTIVE_SPEED = True  # Passo do scanner aprendido pelos tempos de reação (por perfil)
+PREDICTION_MODEL_DIRNAME = ".modelo_predicao"  # Dentro de notepad_save_dir
+WORD_BOUNDARY_KEYS = ("Space", "Enter", "Tab", ",", ".", ";", "/")
 # --- CONSTANTES DE AUDIO ---
 SOUND_DIR = "resources/sounds"
 MOUSE_CLICK_SOUND = os.path.join(SOUND_DIR, "mouse_click.mp3")
 KEY_TAP_SOUND = os.path.join(SOUND_DIR, "key_tap.mp3")
+AUDIO_OVERLAP_POLICY = "restart"  # restart, queue ou drop
+# --- PERFIL DE INICIALIZAÇÃO ---
+# Com WBET_STARTUP_PROFILE=1 o app imprime os tempos e fecha após o 1º frame
+STARTUP_PROFILE_ENV = "WBET_STARTUP_PROFILE"
+STARTUP_PROFILE_TIMEOUT_MS = 15000
 
 # --- CLASSE PRINCIPAL (CONTROLLER) ---
 class App(tk.Tk):
     def __init__(self):
+        # Marcos de tempo da inicialização (ms desde o início do processo)
+        self.startup_marks = {"imports": (time.perf_counter() - _T_START) * 1000.0}
+        self._startup_profile = os.environ.get(STARTUP_PROFILE_ENV) == "1"
+        self._startup_reported = False
         super().__init__()
         pyautogui.FAILSAFE = False
 
         # --- Estado do Gaze ---
         self.last_gaze_move_time = 0
-        self.last_gaze_pos = None
-        self.last_stable_time = time.time()
+        self.current_fixation = None  # Último FixationEvent (start/update) da fixação em curso
         self.last_cursor_pos = None
-        self.just_clicked_time = 0
+        self.blink_gaze_point = None  # Olhar (tela) antes da última piscada de clique
+        self.blink_onset = None       # Início dessa piscada (instante da captura)
         self.current_profile_name = "N/A"
-        self.calib_step = "START" # Estado: START, C, S, DONE
+        self.calib_step = "START" # Estado: START, C, S, P, E1..E3, DONE
+        self.calib_targets = None     # Alvos (u, v) da calibração multiponto (None = só o centro)
+        self.calib_point_index = 0
+        self._calib_point_shown_at = 0.0
         self.current_camera_index = 0
 
         self.title("Assistente de Acessibilidade Ocular")
@@ -80,25 +122,31 @@ class App(tk.Tk):
         self.scan_mode_active = False
         self.keyboard_frame_widget = None # Referência ao frame do teclado
         self.scan_key_list = []           # Lista de teclas em ordem
-        self.scan_index = -1              # Índice da tecla selecionada
-        self.last_scan_time = 0           # Timer para o scanner
-        # --- Timers de Dwell (Fase 3 e 4) ---
-        self.is_dwell_clicking = False    # Pausa o scanner
-        self.dwell_start_time = 0         # Timer da piscada de 2s
-        self.blink_pre_dwell_start_time = 0 # Timer da piscada de 1s
-        self.is_boost_pre_dwelling = False    # Timer de 3s do boost
-        self.is_boost_active = False          # Boost está ATIVO
-        self.boost_pre_dwell_start_time = 0   # Timer de 3s do boost
-        self.boost_stop_start_time = 0        # Timer para DESLIGAR
-        self.boost_needs_release = False
-        self.escape_start_time = 0     
-
-        # --- Estado de Clique (Substitui click_request) ---
-        self.blink_state = "IDLE" # IDLE, PRE_LOCKED, LOCKED
-        self.blink_start_time = 0
+        self.scan_key_rows = []           # Linhas do teclado (índices em scan_key_list)
+        self.scan_key_labels = []         # Rótulo de cada tecla (frequência de uso)
+        self.key_model = KeyFrequencyModel()  # Frequência das teclas (salva no perfil)
+        self.scan_speed = ScanSpeedAdapter(SCAN_DELAY_SECONDS)  # Passo adaptativo (salvo no perfil)
+
+        # --- Tempos dos gestos (clique do dashboard, dwell/boost/escape do scanner) ---
         self.BLINK_CLICK_DURATION_DASHBOARD = 1.0 # O 1seg antigo
         self.BLINK_CLICK_DURATION_SCANNER = 0.3   # 0.3s (seu valor)
         self.SCAN_DWELL_PRE_TIMER_SECONDS = 0.7   # 0.7s (seu valor)
+        self.interaction_timings = {
+            "dashboard_click": self.BLINK_CLICK_DURATION_DASHBOARD,
+            "click_freeze": GAZE_MOVE_DELAY,
+            "scan_dwell": self.SCAN_DWELL_PRE_TIMER_SECONDS,
+            "scan_click": self.SCAN_DWELL_PRE_TIMER_SECONDS + self.BLINK_CLICK_DURATION_SCANNER,
+            "boost_on": SCAN_BOOST_PRE_TIMER_SECONDS,
+            "boost_off": SCAN_BOOST_STOP_TIMER_SECONDS,
+            "scan_escape": SCAN_ESC_PRE_TIMER_SECONDS,
+            "scan_delay": SCAN_DELAY_SECONDS,
+            "boost_delay": SCAN_BOOST_DELAY_SECONDS,
+        }
+
+        # --- Máquinas de estado da interação (relógio na mesma base da câmera) ---
+        self.click_machine = DashboardClickMachine(MonotonicClock(), self.interaction_timings, log=print)
+        self.scanner = ScanMachine(MonotonicClock(), self.interaction_timings, log=print,
+                                   adapter=self.scan_speed if SCAN_ADAPTIVE_SPEED else None)
 
         # --- CONSTANTES DE COR DO SCANNER ---
         self.KEY_STYLE_BG = "#EEEEEE"
@@ -110,13 +158,18 @@ class App(tk.Tk):
         self.profile_var = None
         self.monitor_var = None
         self.camera_var = None
+        self.calib_points_var = None
+        self.head_pose_var = None
 
         # Monitores e Câmeras
         self.available_monitors = self._get_monitores_com_fallback()
         print("Monitores detectados:")
         for i, m in enumerate(self.available_monitors):
             print(f"  {i}: {m.width}x{m.height} @ ({m.x},{m.y})")
-        self._camera_list = self._probe_cameras(CAM_PROBE_MAX)
+        # Câmeras: usa o cache do disco na hora; a sondagem roda em segundo plano
+        self._camera_list = camera_probe.load_camera_cache()
+        self._camera_prober = None
+        self._camera_probe_job = None
 
         # --- Estado do Preview da Tela Inicial ---
         self._preview_cap = None
@@ -130,17 +183,22 @@ class App(tk.Tk):
         self.notepad_last_save_content = ""
         self.notepad_save_dir = os.path.join(os.path.expanduser("~"), "Documentos", "SimpleEyeTracker")
         self.shift_btn_ref = None  # Referências para botões do teclado
+        self.predictor = None           # WordPredictor (criado na 1ª abertura do Bloco de Notas)
+        self.current_suggestions = []   # Palavras exibidas na linha de sugestões
         self.caps_btn_ref = None
 
         # --- Recursos (Ícones) ---
+        # Carregados na primeira abertura do Bloco de Notas (único que os usa)
         self.icon_home = None
         self.icon_notepad = None
-        self._load_sidebar_icons()
 
         self._init_audio()
 
         # Tela inicial
         self._build_startup_frame()
+        self.bind("<Map>", self._on_first_map, add="+")
+        if self._startup_profile:
+            self.after(STARTUP_PROFILE_TIMEOUT_MS, self._finish_startup_profile)
 
     # -------- Utilidades de Hardware/OS ----------
     def _get_monitores_com_fallback(self):
@@ -171,24 +229,76 @@ class App(tk.Tk):
             except Exception:
                 pass
 
-    def _probe_cameras(self, max_test=4):
-        cams = []
-        for i in range(max_test):
-            cap = cv2.VideoCapture(i)
-            if not cap or not cap.isOpened():
-                if cap:
-                    cap.release()
-                continue
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
-            label = f"Câmera {i}"
-            if width and height:
-                label += f" ({width}x{height})"
-            cams.append({"index": i, "label": label})
-            cap.release()
-        if not cams:
-            cams = [{"index": 0, "label": "Câmera 0"}]
-        return cams
+    def _start_camera_probe(self, skip=()):
+        """Sonda (ou revalida) as câmeras em paralelo sem bloquear a UI."""
+        self._camera_prober = camera_probe.CameraProber(range(CAM_PROBE_MAX), skip=skip)
+        self._camera_prober.start()
+        self._poll_camera_probe()
+
+    def _poll_camera_probe(self):
+        """Consome os resultados da sondagem e atualiza a lista/menus."""
+        self._camera_probe_job = None
+        prober = self._camera_prober
+        if prober is None:
+            return
+        while not prober.events.empty():
+            kind, payload = prober.events.get_nowait()
+            if kind == "found":
+                if not any(c["index"] == payload["index"] for c in self._camera_list):
+                    self._camera_list.append(payload)
+                    self._camera_list.sort(key=lambda c: c["index"])
+                    self._refresh_start_camera_menu()
+            elif kind == "done":
+                # Mantém as câmeras puladas (em uso) e as do cache que só estouraram o
+                # timeout (ocupadas, USB lento: marcadas "stale"); sai só quem falhou
+                found = {c["index"] for c in payload}
+                kept = []
+                for c in self._camera_list:
+                    if c["index"] in found:
+                        continue
+                    if c["index"] in prober.timed_out:
+                        c["stale"] = True
+                    elif c["index"] in prober.indices:
+                        continue
+                    kept.append(c)
+                cams = sorted(kept + payload, key=lambda c: c["index"])
+                camera_probe.save_camera_cache(cams)
+                if not cams:
+                    cams = [{"index": 0, "label": "Câmera 0"}]
+                changed = [c["label"] for c in cams] != [c["label"] for c in self._camera_list]
+                self._camera_list = cams
+                if changed:
+                    self._refresh_start_camera_menu()
+                print(f"[Câmeras] Sondagem concluída: {[c['label'] for c in cams]}")
+                self._camera_prober = None
+                return
+        self._camera_probe_job = self.after(100, self._poll_camera_probe)
+
+    # -------- Perfil de Inicialização ----------
+    def _mark_startup(self, name):
+        """Registra um marco de inicialização (só o primeiro de cada nome vale)."""
+        if name in self.startup_marks:
+            return
+        self.startup_marks[name] = (time.perf_counter() - _T_START) * 1000.0
+        if "first_window" in self.startup_marks and "first_frame" in self.startup_marks:
+            self._finish_startup_profile()
+
+    def _on_first_map(self, event=None):
+        if event is None or event.widget is self:
+            self._mark_startup("first_window")
+
+    def _finish_startup_profile(self):
+        """Imprime o relatório (formato lido por benchmarks/startup_profile.py)."""
+        if self._startup_reported:
+            return
+        self._startup_reported = True
+        marks = " ".join(
+            f"{name}={self.startup_marks[name]:.1f}ms" if name in self.startup_marks else f"{name}=n/a"
+            for name in ("imports", "first_window", "first_frame")
+        )
+        print(f"[Startup] {marks}")
+        if self._startup_profile:
+            self.after(0, self.quit_app)
 
     def _load_sidebar_icons(self):
         """Carrega e redimensiona ícones para as views usarem."""
@@ -209,34 +319,16 @@ class App(tk.Tk):
             print(f"Erro ao carregar ícone 'notepad' para sidebar: {e}")
 
     def _init_audio(self):
-        """Inicializa o mixer do pygame e carrega os sons."""
-        self._mouse_click_sound = None
-        self._key_tap_sound = None
-        try:
-            pygame.mixer.init()
-            # Carrega sons
-            self._mouse_click_sound = pygame.mixer.Sound(MOUSE_CLICK_SOUND)
-            self._key_tap_sound = pygame.mixer.Sound(KEY_TAP_SOUND)
-            # Define canais (Garante que cliques e teclas não se bloqueiem)
-            pygame.mixer.set_num_channels(2)
-            self._mouse_channel = pygame.mixer.Channel(0) # Canal 0 para cliques
-            self._key_channel = pygame.mixer.Channel(1)   # Canal 1 para teclas
-            print("[Audio] Sons carregados com sucesso.")
-        except pygame.error as e:
-            print(f"[Audio] ERRO ao inicializar ou carregar sons: {e}")
-        except Exception as e:
-            print(f"[Audio] ERRO genérico ao carregar áudio: {e}")
+        """Inicia o worker de áudio (sons pré-decodificados, um canal por som)."""
+        self.audio = AudioPlayer(
+            {"mouse": MOUSE_CLICK_SOUND, "key": KEY_TAP_SOUND},
+            policy=AUDIO_OVERLAP_POLICY,
+        )
+        self.audio.start()
 
     def play_sound(self, sound_type: str):
-        """Reproduz um som usando canais dedicados para não bloquear a UI ou outros sons."""
-        if sound_type == 'mouse' and self._mouse_click_sound:
-            # Toca o som do mouse no Canal 0
-            if not self._mouse_channel.get_busy(): # Use get_busy() no canal
-                threading.Thread(target=self._mouse_channel.play, args=(self._mouse_click_sound,), daemon=True).start()
-        elif sound_type == 'key' and self._key_tap_sound:
-            # Toca o som da tecla no Canal 1
-            if not self._key_channel.get_busy(): # Use get_busy() no canal
-                 threading.Thread(target=self._key_channel.play, args=(self._key_tap_sound,), daemon=True).start()
+        """Enfileira um som no worker de áudio (não bloqueia a UI)."""
+        self.audio.play(sound_type)
 
     # --------- UI: Tela inicial (Startup) ----------
     # (Esta é a única UI construída diretamente no main)
@@ -244,6 +336,8 @@ class App(tk.Tk):
     def _build_startup_frame(self):
         """Tela inicial simples dentro do root para escolher monitor e câmera."""
         self._clear_root()
+        # Enquanto o usuário escolhe, o modelo do tracker carrega em segundo plano
+        start_face_mesh_warmup()
         frame = tk.Frame(self, bg="#222")
         frame.pack(expand=True, fill="both", padx=30, pady=30)
 
@@ -256,18 +350,21 @@ class App(tk.Tk):
         self.start_monitor_var = tk.StringVar(value=monitor_options[0])
         tk.OptionMenu(frame, self.start_monitor_var, *monitor_options).pack(pady=(5, 15))
 
-        # Câmeras
-        cam_labels = [c["label"] for c in self._camera_list] or ["Câmera 0"]
+        # Câmeras (lista do cache; completada quando a sondagem responder)
+        cam_labels = [c["label"] for c in self._camera_list] or ["Procurando câmeras..."]
         tk.Label(frame, text="Câmera:", font=("Arial", 14), bg="#222", fg="white").pack()
         self.start_camera_var = tk.StringVar(value=cam_labels[0])
-        cam_menu = tk.OptionMenu(frame, self.start_camera_var, *cam_labels, command=self._on_start_cam_change)
-        cam_menu.pack(pady=(5, 10))
+        self._start_cam_menu = tk.OptionMenu(frame, self.start_camera_var, *cam_labels,
+                                             command=self._on_start_cam_change)
+        self._start_cam_menu.pack(pady=(5, 10))
 
         # Preview
         self.preview_holder = tk.Label(frame, bg="#000")
         self.preview_holder.pack(pady=(6, 16))
-        if cam_labels:
+        if self._camera_list:
             self._on_start_cam_change(self.start_camera_var.get())
+        # Câmeras já abertas pelo gerenciador (ex.: o preview) não são sondadas de novo
+        self._start_camera_probe(skip=get_camera_manager().open_indices())
 
         # Botões
         btns = tk.Frame(frame, bg="#222")
@@ -284,6 +381,23 @@ class App(tk.Tk):
         y = mon0.y + (mon0.height - h) // 2
         self.geometry(f"{w}x{h}+{x}+{y}")
 
+    def _refresh_start_camera_menu(self):
+        """Reconstrói o menu de câmeras da tela inicial com a lista atual."""
+        menu_widget = getattr(self, "_start_cam_menu", None)
+        if not menu_widget or not menu_widget.winfo_exists() or not self._camera_list:
+            return
+        menu = menu_widget["menu"]
+        menu.delete(0, "end")
+        for cam in self._camera_list:
+            menu.add_command(label=cam["label"],
+                             command=tk._setit(self.start_camera_var, cam["label"], self._on_start_cam_change))
+
+        labels = [c["label"] for c in self._camera_list]
+        if self.start_camera_var.get() not in labels:
+            # Primeira câmera encontrada (ou a selecionada mudou de label): seleciona e mostra
+            self.start_camera_var.set(labels[0])
+            self._on_start_cam_change(labels[0])
+
     def _on_start_cam_change(self, selected_label):
         if not self._camera_list:
             return
@@ -292,19 +406,20 @@ class App(tk.Tk):
 
     def _start_camera_preview(self, cam_index: int):
         self._stop_camera_preview()
-        self._preview_cap = cv2.VideoCapture(cam_index)
+        self._preview_cap = acquire_camera(cam_index)  # Compartilhada (não reabre)
         self._preview_loop()
 
     def _preview_loop(self):
         if not self._preview_cap:
             return
-        ret, frame = self._preview_cap.read()
+        ret, frame = self._preview_cap.read_latest()
         if ret:
             frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             img = Image.fromarray(frame).resize(PREVIEW_SIZE)
             imgtk = ImageTk.PhotoImage(img)
             self.preview_holder.configure(image=imgtk, text="")
             self.preview_holder.image = imgtk
+            self._mark_startup("first_frame")
         self._preview_job = self.after(33, self._preview_loop)
 
     def _stop_camera_preview(self):
@@ -332,6 +447,8 @@ class App(tk.Tk):
             cam = next((c for c in self._camera_list if c["label"] == sel_label), self._camera_list[0])
             self.default_camera_index = cam["index"]
         else:
+            # Sondagem ainda sem resultado: assume a câmera 0 (a lista é corrigida ao terminar)
+            self._camera_list = [{"index": 0, "label": "Câmera 0"}]
             self.default_camera_index = 0
 
         self.move_root_to_monitor(self.selected_monitor_index)
@@ -346,16 +463,45 @@ class App(tk.Tk):
         config.configure(bg="#222")
         config.resizable(False, False)
         tk.Label(config, text="Configurações", font=("Arial", 16, "bold"), bg="#222", fg="white").pack(pady=20)
+        # Troca rápida entre perfis salvos (o tracker continua rodando)
+        profiles = sorted(calibration.list_profiles())
+        if self.tracker and profiles:
+            profile_var = tk.StringVar(config, value=self.current_profile_name)
+            tk.Label(config, text="Perfil:", bg="#222", fg="white").pack(pady=(0, 0))
+            tk.OptionMenu(config, profile_var, *profiles,
+                          command=lambda name: self.switch_profile(name, profile_var)).pack(pady=5)
         tk.Button(config, text="Trocar ou Gerenciar Perfis", command=self.create_calibrator_view).pack(pady=10)
+        tk.Button(config, text="Teste de Seleção (Fitts)",
+                  command=lambda: (config.destroy(), self.create_fitts_view())).pack(pady=10)
+
+        # Mapeador olhar -> tela do perfil (os aprendidos só após calibração multiponto)
+        if self.tracker:
+            labels = {mapper.label: kind for kind, mapper in self.tracker.gaze_mappers.items()}
+            mapper_var = tk.StringVar(config, value=self.tracker.gaze_mapper.label)
+            tk.Label(config, text="Mapeamento do olhar:", bg="#222", fg="white").pack(pady=(10, 0))
+            tk.OptionMenu(config, mapper_var, *labels,
+                          command=lambda label: self.set_gaze_mapper(labels[label], mapper_var)).pack(pady=5)
+
         tk.Button(config, text="Fechar", command=config.destroy).pack(pady=20)
 
         mon = self.get_active_monitor()
-        config.geometry(f"400x300+{mon.x + 100}+{mon.y + 100}")
+        config.geometry(f"400x450+{mon.x + 100}+{mon.y + 100}")
         config.transient(self)
 
+    def set_gaze_mapper(self, kind, mapper_var=None):
+        """Troca o mapeador do tracker e salva a escolha no perfil atual."""
+        if not self.tracker.set_gaze_mapper(kind):
+            if mapper_var is not None:
+                mapper_var.set(self.tracker.gaze_mapper.label)  # Volta para o ativo
+            return
+        if self.current_profile_name != "N/A":
+            calibration.update_profile(self.current_profile_name, {"gaze_mapper": kind})
+
     def create_notepad_view(self):
         """Navega para a View do Bloco de Notas."""
         self._clear_root()
+        if self.icon_home is None:
+            self._load_sidebar_icons()
         self.title("Bloco de Notas - Controle Ocular")
         self.configure(bg="#0b4073")
 
@@ -368,6 +514,15 @@ class App(tk.Tk):
         # Pega as referências da View para o modo de varredura
         self.keyboard_frame_widget = notepad_view.keyboard_frame
         self.scan_key_list = notepad_view.get_scan_keys()
+        self.scan_key_rows = notepad_view.get_scan_rows()
+        self.scan_key_labels = notepad_view.get_scan_labels()
+
+        # Predição de palavras: abre (ou constrói) o modelo em segundo plano
+        if self.predictor is None:
+            self.predictor = WordPredictor(os.path.join(self.notepad_save_dir, PREDICTION_MODEL_DIRNAME),
+                                           self.notepad_save_dir)
+            self.predictor.start_loading()
+        self.current_suggestions = []
 
         self.bind("<F7>", self.toggle_mouse_control)
         self.bind("<Escape>", self._handle_scan_exit) # LIGA O ESCAPE
@@ -377,11 +532,69 @@ class App(tk.Tk):
         self._update_status_label()  # Atualiza o status
         self.update_loop()  # Inicia o loop
 
+    def create_fitts_view(self):
+        """Navega para a View do Teste de Seleção (lei de Fitts)."""
+        if not self.tracker:
+            messagebox.showinfo("Teste de Seleção", "Carregue um perfil antes de iniciar o teste.")
+            return
+        self._clear_root()
+        self.title("Teste de Seleção - Controle Ocular")
+        self.configure(bg=FittsFrame.BG)
+
+        fitts_view = FittsFrame(self, controller=self)
+        fitts_view.pack(fill="both", expand=True)
+
+        self.current_screen = fitts_view
+        self.focusable_widgets = fitts_view.get_focusable_widgets()
+
+        self.bind("<F7>", self.toggle_mouse_control)
+        self.bind("<Escape>", lambda e: self.create_dashboard())
+        self.protocol("WM_DELETE_WINDOW", self.quit_app)
+        self.move_root_to_monitor(self.selected_monitor_index)
+
+        self.update_loop()
+
+    def get_gaze_latency(self):
+        """Idade (s) da última amostra de olhar: da captura do frame até agora."""
+        lock = self.shared_state.get("_lock")
+        if lock is None:
+            return None
+        with lock:
+            ts = self.shared_state.get("gaze_timestamp")
+        return time.monotonic() - ts if ts else None
+
+    def save_fitts_results(self, summary):
+        """Acrescenta o resultado do teste ao perfil, com as configurações que afetam a seleção."""
+        from datetime import datetime
+        summary = dict(summary)
+        summary["date"] = datetime.now().isoformat(timespec="seconds")
+        summary["settings"] = {
+            "snap_threshold_px": SNAP_THRESHOLD_PIXELS,
+            "fixation_dispersion_px": FIXATION_DISPERSION_PX,
+            "fixation_min_duration": FIXATION_MIN_DURATION,
+            "dashboard_click": self.interaction_timings["dashboard_click"],
+            "filter_length": self.tracker.ctx.combined_gaze_directions.maxlen if self.tracker else mc.filter_length,
+            "camera_index": getattr(self.tracker, "camera_index", None),
+            "capture": getattr(self.tracker, "capture_actual", None),
+            "screen_mapping": self.tracker.screen_mapping.kind if getattr(self.tracker, "screen_mapping", None) else "linear",
+            "gaze_mapper": self.tracker.gaze_mapper.kind if self.tracker else None,
+            "head_pose": getattr(self.tracker, "head_pose", None),
+        }
+        tp = summary["throughput_bps"]
+        print(f"[Fitts] Vazão {tp:.2f} bits/s" if tp is not None else "[Fitts] Pontos insuficientes para a vazão.")
+        if self.current_profile_name == "N/A":
+            return
+        data = calibration.load_profile(self.current_profile_name) or {}
+        history = (data.get("fitts_results") or []) + [summary]
+        calibration.update_profile(self.current_profile_name, {"fitts_results": history[-MAX_SAVED_SESSIONS:]})
+
     def create_calibrator_view(self):
         """Navega para a View de Calibração."""
         if self.tracker:
+            self._save_learned_settings()  # A correção do olhar vive no tracker
             self.tracker.stop()
             self.tracker = None
+        start_face_mesh_warmup()  # Deixa o próximo tracker pronto
         
         self._clear_root()
         self.configure(bg="#222")
@@ -396,7 +609,7 @@ class App(tk.Tk):
         self.move_root_to_monitor(fullscreen_like=False)  # Não maximiza
         # Centraliza a janela de calibração
         mon = self.get_active_monitor()
-        w, h = 800, 850
+        w, h = 800, 930
         x = mon.x + (mon.width - w) // 2
         y = mon.y + (mon.height - h) // 2
         self.geometry(f"{w}x{h}+{x}+{y}")
@@ -430,24 +643,66 @@ class App(tk.Tk):
         """Helper para a View de Calibração pegar os perfis."""
         return calibration.list_profiles()
 
+    def _configure_gestures(self, tracker):
+        """Registra no reconhecedor do tracker os limiares de duração usados pela UI."""
+        configure_gesture_holds(tracker.gestures, self.interaction_timings)
+        tracker.fixations.dispersion_px = FIXATION_DISPERSION_PX
+        tracker.fixations.min_duration = FIXATION_MIN_DURATION
+
     def load_profile_and_start(self):
         """Lógica para carregar um perfil."""
         profile_name = self.profile_var.get()
         calib_data = calibration.load_profile(profile_name)
-        if not calib_data:
+        state = EyeTracker.parse_calibration(calib_data) if calib_data else None
+        if state is None:
             messagebox.showerror("Erro", f"Não foi possível carregar o perfil '{profile_name}'.")
             return
 
+        self._clear_root()  # Limpa a tela de calibração
+        self._activate_profile(profile_name, calib_data, state)
+        self.create_dashboard()  # Navega para o Dashboard
+
+    def _activate_profile(self, profile_name, calib_data, state):
+        """
+        Torna `profile_name` o perfil atual, com a calibração já validada
+        (`state`, de EyeTracker.parse_calibration). Se o tracker já roda na
+        câmera do perfil, só a calibração é trocada (a quente, sem reabrir
+        câmera nem FaceMesh); senão um tracker novo é iniciado.
+        """
         self.selected_monitor_index = int(calib_data.get("monitor_index", self.selected_monitor_index))
         camera_index = int(calib_data.get("camera_index", self.default_camera_index))
         self.move_root_to_monitor(self.selected_monitor_index)
 
-        self._clear_root()  # Limpa a tela de calibração
+        self.current_profile_name = profile_name
+        self.key_model = KeyFrequencyModel.from_dict(calib_data.get("key_frequencies"))
+        self._set_scan_speed(ScanSpeedAdapter.from_dict(calib_data.get("scan_adaptation"), SCAN_DELAY_SECONDS))
 
+        if self.tracker and self.tracker.is_alive() and self.tracker.camera_index == camera_index:
+            self.tracker.use_calibration(state, profile_name)
+            return
+        if self.tracker:
+            self.tracker.stop()
         self.tracker = EyeTracker(camera_index=camera_index, shared_state=self.shared_state)
-        self.tracker.load_calibration(calib_data, profile_name)
+        self._configure_gestures(self.tracker)
+        self.tracker.use_calibration(state, profile_name)
         self.tracker.start()
-        self.create_dashboard()  # Navega para o Dashboard
+
+    def switch_profile(self, profile_name, profile_var=None):
+        """Troca de perfil num passo (Configurações), sem sair da tela atual."""
+        if profile_name == self.current_profile_name:
+            return
+        calib_data = calibration.load_profile(profile_name)
+        # Valida antes de mexer em qualquer estado: perfil inválido mantém o atual
+        state = EyeTracker.parse_calibration(calib_data) if calib_data else None
+        if state is None:
+            messagebox.showerror("Erro", f"Não foi possível carregar o perfil '{profile_name}'.")
+            if profile_var is not None:
+                profile_var.set(self.current_profile_name)
+            return
+        self._save_learned_settings()  # Do perfil que sai (a correção do olhar vive no tracker)
+        self._activate_profile(profile_name, calib_data, state)
+        if hasattr(self.current_screen, "update_profile_label"):
+            self.current_screen.update_profile_label(self.current_profile_name)
 
     def run_calibration(self):
         """Lógica para iniciar um novo processo de calibração."""
@@ -466,14 +721,25 @@ class App(tk.Tk):
         if not profile_name:
             return
 
+        self.current_camera_index = camera_index # Mesma câmera do preview (já aberta)
         self.current_profile_name = profile_name # Salva o nome para a UI
         self.calib_step = "C" # Define o próximo passo
+        # Calibração multiponto opcional ("Só o centro", "5 pontos", ...)
+        label = self.calib_points_var.get() if self.calib_points_var else ""
+        self.calib_targets = calibration_points(int(label.split()[0])) if label[:1].isdigit() else None
+        # Perfil novo: frequências e passo do scanner começam dos padrões
+        self.key_model = KeyFrequencyModel()
+        self._set_scan_speed(ScanSpeedAdapter(SCAN_DELAY_SECONDS))
 
         # 1. Limpa a tela de seleção de perfil
         self._clear_root() 
         
         # 2. Inicia o tracker em SEGUNDO PLANO
         self.tracker = EyeTracker(camera_index=self.current_camera_index, shared_state=self.shared_state)
+        self._configure_gestures(self.tracker)
+        pose_label = self.head_pose_var.get() if self.head_pose_var else ""
+        self.tracker.set_head_pose(next((k for k, v in HEAD_POSE_ESTIMATORS.items() if v == pose_label),
+                                        DEFAULT_HEAD_POSE))
         self.tracker.start() # A thread 'run()' começa a processar frames
 
         # 3. Navega para a NOVA tela de calibração (ponto verde)
@@ -508,14 +774,9 @@ class App(tk.Tk):
             action_button.config(state="disabled", text="...")
             return
 
-        # Passos Geométricos (Existentes)
-        if self.calib_step == "C":
-            instruction_label.config(text="1. Olhe para o '+' central e clique.")
-            action_button.config(text="1. Fixar Geometria", state="normal")
-
-        elif self.calib_step == "S":
-            instruction_label.config(text="2. Continue olhando para o '+' e clique.")
-            action_button.config(text="2. Calibrar Tela", state="normal")
+        # Passos Geométricos: captura automática durante a fixação no '+'
+        if self.calib_step in ("C", "S", "P"):
+            self._update_calib_capture(instruction_label, action_button)
         
         # --- NOVOS PASSOS EAR ---
         
@@ -543,17 +804,72 @@ class App(tk.Tk):
              instruction_label.config(text="Calibração Total Concluída!")
              action_button.config(text="Salvar e Sair", state="disabled")
 
+    def _update_calib_capture(self, instruction_label, action_button):
+        """
+        Passos C, S e pontos P: o tracker espera uma fixação estável no '+',
+        captura uma janela de frames e calcula a calibração sozinho; aqui só
+        iniciamos a captura, mostramos o progresso e avançamos ao terminar.
+        """
+        step = self.calib_step
+        if self.tracker.consume_calib_step(step):
+            self.play_sound('key')  # Feedback sonoro
+            self._advance_calib_capture(step)
+            return
+
+        if step == "P":
+            number = f"Ponto {self.calib_point_index + 1}/{len(self.calib_targets)}"
+            name = "Ponto"
+            if time.monotonic() - self._calib_point_shown_at < CALIB_POINT_SETTLE_SECONDS:
+                # O olhar ainda está indo para o novo '+': não captura a fixação antiga
+                instruction_label.config(text=f"{number}. Olhe para o '+'.")
+                action_button.config(text="Capturar agora", state="disabled")
+                return
+        else:
+            number, name = ("1", "Geometria") if step == "C" else ("2", "Tela")
+
+        capture = self.tracker.get_calibration_capture()
+        if capture is None or capture.step != step:
+            self.tracker.start_calibration_capture(step)
+            capture = self.tracker.get_calibration_capture()
+
+        where = "o '+'" if step == "P" else "o '+' central"
+        if capture.waiting_fixation:
+            text = f"{number}. Olhe fixamente para {where}.\nA captura começa sozinha."
+        else:
+            text = f"{number}. Continue olhando para {where}...\nCapturando {name}: {int(100 * capture.progress)}%"
+        instruction_label.config(text=text)
+        # Olhar instável (a fixação nunca se confirma): o assistente força a captura
+        action_button.config(text="Capturar agora", state="disabled" if capture.force else "normal")
+
+    def _advance_calib_capture(self, step):
+        """Próximo passo geométrico: C -> S -> pontos P (se escolhidos) -> EAR."""
+        if step == "C":
+            self.calib_step = "S"
+        elif step == "S" and self.calib_targets is not None:
+            self.tracker.calib_point_frames.clear()
+            self.calib_point_index = 0
+            self.calib_step = "P"
+            self._show_calib_point()
+        elif step == "P" and self.calib_point_index + 1 < len(self.calib_targets):
+            self.calib_point_index += 1
+            self._show_calib_point()
+        else:
+            if step == "P":
+                self.tracker.fit_gaze_mappers(self.calib_targets)
+                self.current_screen.show_target(0.5, 0.5)
+            self.calib_step = "E1"  # Vai para EAR
+
+    def _show_calib_point(self):
+        u, v = self.calib_targets[self.calib_point_index]
+        self.current_screen.show_target(u, v)
+        self._calib_point_shown_at = time.monotonic()
+
     def on_calib_button_click(self):
         if not self.tracker: return
 
-        # Passos C e S (Mantidos)
-        if self.calib_step == "C":
-            self.tracker.trigger_calibration_step('C')
-            self.calib_step = "S"
-        
-        elif self.calib_step == "S":
-            self.tracker.trigger_calibration_step('S')
-            self.calib_step = "E1" # Vai para EAR
+        # Passos C, S e P: captura automática; o botão só a força sem esperar a fixação
+        if self.calib_step in ("C", "S", "P"):
+            self.tracker.force_calibration_capture()
             
         # --- FLUXO EAR SEPARADO ---
         
@@ -612,7 +928,12 @@ class App(tk.Tk):
         if calib_data:
             calib_data["monitor_index"] = self.selected_monitor_index
             calib_data["camera_index"] = self.current_camera_index
+            calib_data["key_frequencies"] = self.key_model.to_dict()
+            calib_data["scan_adaptation"] = self.scan_speed.to_dict()
             calibration.save_profile(self.current_profile_name, calib_data)
+            if self.calib_targets is not None:
+                self.tracker.save_calibration_session(calibration.session_path(self.current_profile_name),
+                                                      self.calib_targets)
         
         self.tracker.loaded_profile_name = self.current_profile_name
         
@@ -679,6 +1000,47 @@ class App(tk.Tk):
         self.notepad_is_dirty = True
         if self.notepad_text_widget:
             self.notepad_text_widget.edit_modified(False)
+            self._update_suggestions()
+
+    def _text_before_cursor(self):
+        return self.notepad_text_widget.get("insert -80c", "insert")
+
+    def _update_suggestions(self):
+        """Recalcula as sugestões para a palavra sob o cursor (a cada tecla)."""
+        if not self.predictor or not self.notepad_text_widget:
+            return
+        prefix, prev = split_context(self._text_before_cursor())
+        words = self.predictor.suggest(prefix, prev)
+        if prefix[:1].isupper():
+            words = [w[:1].upper() + w[1:] for w in words]
+        self.current_suggestions = words
+        if hasattr(self.current_screen, "set_suggestions"):
+            self.current_screen.set_suggestions(words)
+
+    def accept_suggestion(self, index):
+        """Troca a palavra parcial sob o cursor pela sugestão escolhida (+ espaço)."""
+        widget = self.notepad_text_widget
+        if not widget or index >= len(self.current_suggestions):
+            return
+        word = self.current_suggestions[index]
+        prefix, prev = split_context(self._text_before_cursor())
+        if prefix:
+            widget.delete(f"insert -{len(prefix)}c", "insert")
+        widget.insert(tk.INSERT, word + " ")
+        if self.predictor:
+            self.predictor.learn(prev, word.lower())
+        self.key_model.record(SUGGESTION_LABEL)
+        self.play_sound('key')
+        widget.focus_set()
+        widget.event_generate("<<Modified>>")
+
+    def _learn_completed_word(self):
+        """Após espaço/pontuação, ensina ao preditor a palavra que acabou de ser digitada."""
+        if not self.predictor or not self.notepad_text_widget:
+            return
+        word, prev = split_context(self._text_before_cursor()[:-1])
+        if word:
+            self.predictor.learn(prev, word.lower())
 
     def _handle_save_document(self):
         """Salva o conteúdo atual em um .txt com timestamp."""
@@ -697,6 +1059,10 @@ class App(tk.Tk):
 
             self.notepad_is_dirty = False
             self.notepad_last_save_content = content
+            if self.predictor:
+                # O documento salvo passa a fazer parte do modelo (incremental)
+                self.predictor.reset_session()
+                self.predictor.refresh_async()
             self._show_custom_modal("Salvo", f"Documento salvo com sucesso em:\n{filename}")
         except Exception as e:
             messagebox.showerror("Erro ao Salvar", f"Não foi possível salvar o arquivo:\n{e}")
@@ -726,6 +1092,8 @@ class App(tk.Tk):
         """Limpa o widget de texto e reseta os flags."""
         self.notepad_last_save_content = ""
         self.notepad_is_dirty = False
+        if self.predictor:
+            self.predictor.reset_session()
         if self.notepad_text_widget:
             self.notepad_text_widget.delete("1.0", tk.END)
             self.notepad_text_widget.edit_modified(False)
@@ -825,203 +1193,104 @@ class App(tk.Tk):
         return (x1 <= gx <= x2) and (y1 <= gy <= y2)
     
     def _handle_scan_exit(self, event=None):
-        """Lida com a tecla 'Escape' para sair do modo de varredura."""
+        """Lida com a tecla 'Escape' (ou o wink esquerdo) para sair do modo de varredura."""
         if not self.scan_mode_active:
             return
 
         print("[Scanner] Saída forçada via 'Escape'. Desativando.")
         self.scan_mode_active = False
-
-        # Limpa o destaque da última tecla
-        if 0 <= self.scan_index < len(self.scan_key_list):
-            try:
-                key = self.scan_key_list[self.scan_index]
-                is_special = len(key.cget('text')) > 1 or not key.cget('text').isalnum()
-                bg_to_set = self.SPECIAL_KEY_STYLE_BG if is_special else self.KEY_STYLE_BG
-                key.configure(
-                    highlightbackground=bg_to_set, 
-                    highlightthickness=4
-                )
-            except: pass 
-                
-        self.scan_index = -1
-        # Reseta todos os timers de scanner
-        self.is_dwell_clicking = False
-        self.blink_pre_dwell_start_time = 0
-        self.is_boost_pre_dwelling = False
-        self.is_boost_active = False
-        self.boost_pre_dwell_start_time = 0
-
-
-    def _handle_scan_mode(self):
-        """Lógica principal do modo de varredura (Fases 2, 3 e 4)."""
-        
-        now = time.time()
-        
-        # --- 1. Read States ---
-        is_blinking = False
-        is_boosting = False # Right-eye-only
-        is_escaping = False
-        lock = self.shared_state.get("_lock")
-        if lock:
-            with lock:
-                is_blinking = self.shared_state.get("is_blinking", False)
-                is_boosting = self.shared_state.get("is_boosting", False)
-                is_escaping = self.shared_state.get("is_escaping", False)
-        else:
-            return # Sai se o lock não estiver disponível
-
-        if is_escaping:
-            # Se começou a piscar esquerdo, reseta as outras intenções para não conflitar
-            self.is_boost_pre_dwelling = False
-            self.boost_pre_dwell_start_time = 0
-            self.boost_stop_start_time = 0
-            self.blink_pre_dwell_start_time = 0
-            self.is_dwell_clicking = False
-
-            # Inicia timer do Escape
-            if self.escape_start_time == 0:
-                print("[Scanner] Iniciando timer ESCAPE (Esquerda)...")
-                self.escape_start_time = time.time()
-            
-            # Se segurou o tempo suficiente:
-            if (now - self.escape_start_time) >= SCAN_ESC_PRE_TIMER_SECONDS:
-                print("[Scanner] ESCAPE CONFIRMADO! Saindo do teclado.")
-                self.play_sound('key') # Som de confirmação
-                self._handle_scan_exit() # <--- Essa função já existe e libera o cursor
-                self.escape_start_time = 0 # Reseta
-                
-            return # Pára o processamento aqui
-        else:
-            self.escape_start_time = 0 # Reseta se abrir o olho
-
-        # --- 2. Handle Click (Phase 3) - HIGHEST PRIORITY ---
-        if is_blinking:
-            # Se piscar com os DOIS olhos, reseta intenções de boost mas MANTÉM o estado ativo
-            self.is_boost_pre_dwelling = False
-            self.boost_pre_dwell_start_time = 0
-            self.boost_stop_start_time = 0
-            
-            # Inicia o pré-timer (0.7s)
-            if self.blink_pre_dwell_start_time == 0:
-                self.blink_pre_dwell_start_time = time.time()
-
-            # Checa se o Dwell (pausa) deve ser ativado
-            if not self.is_dwell_clicking and (now - self.blink_pre_dwell_start_time) >= self.SCAN_DWELL_PRE_TIMER_SECONDS:
-                self.is_dwell_clicking = True
-                self.dwell_start_time = time.time()
-                print(f"[Scanner] Dwell ({self.SCAN_DWELL_PRE_TIMER_SECONDS}s) detectado. Pausando scan.")
-            
-            # Se o Dwell ESTÁ ativo, checa o clique (0.3s)
-            if self.is_dwell_clicking:
-                if (now - self.dwell_start_time) >= self.BLINK_CLICK_DURATION_SCANNER:
-                    print(f"[Scanner] CLIQUE ({self.BLINK_CLICK_DURATION_SCANNER}s)!")
-                    if 0 <= self.scan_index < len(self.scan_key_list):
-                        try:
-                            key = self.scan_key_list[self.scan_index]
+        # Limpa o destaque da última tecla e reseta todos os timers do scanner
+        self._apply_scan_actions(self.scanner.stop())
+        self._save_learned_settings()
+
+    def _build_scan_layout(self):
+        """Árvore de varredura do teclado, ordenada pela frequência das teclas do perfil."""
+        rows = self.scan_key_rows or [list(range(len(self.scan_key_list)))]
+        layout = build_scan_layout(rows, SCAN_LAYOUT_MODE, SCAN_BLOCK_SIZE)
+        if not SCAN_FREQUENCY_ORDER:
+            return layout
+        labels = self.scan_key_labels
+        if len(labels) != len(self.scan_key_list):
+            return layout
+        before = expected_steps(layout, labels, self.key_model)
+        layout = order_layout(layout, labels, self.key_model)
+        after = expected_steps(layout, labels, self.key_model)
+        print(f"[Scanner] Passos esperados por caractere: {before:.2f} -> {after:.2f} "
+              f"({self.key_model.total_recorded} teclas aprendidas)")
+        return layout
+
+    def record_key_press(self, key_char):
+        """Chamado pelo teclado virtual a cada tecla acionada."""
+        self.key_model.record(key_char)
+        if key_char in WORD_BOUNDARY_KEYS:
+            self._learn_completed_word()
+
+    def _set_scan_speed(self, adapter):
+        self.scan_speed = adapter
+        if SCAN_ADAPTIVE_SPEED:
+            self.scanner.adapter = adapter
+            print(f"[Scanner] Passo inicial: {adapter.scan_delay:.2f}s "
+                  f"({adapter.selections} seleções medidas)")
+
+    def _save_learned_settings(self):
+        """Persiste no perfil atual as frequências, o passo e a correção do olhar aprendidos (se houver novidades)."""
+        if self.current_profile_name == "N/A":
+            return
+        updates = {}
+        if self.key_model.dirty:
+            updates["key_frequencies"] = self.key_model.to_dict()
+        if self.scan_speed.dirty:
+            updates["scan_adaptation"] = self.scan_speed.to_dict()
+        correction = self.tracker.gaze_correction if self.tracker else None
+        if correction is not None and correction.dirty:
+            updates["gaze_correction"] = correction.to_dict()
+        if updates and calibration.update_profile(self.current_profile_name, updates):
+            self.key_model.dirty = False
+            self.scan_speed.dirty = False
+            if correction is not None:
+                correction.dirty = False
+
+    def _restore_key_style(self, key):
+        """Remove o destaque do scanner de uma tecla (mantendo Shift/Caps ativos em azul)."""
+        # A borda volta à cor de fundo atual da tecla (normal, especial, sugestão ou ativa)
+        key.configure(
+            highlightbackground=key.cget('bg'), 
+            highlightthickness=4
+        )
+
+    def _apply_scan_actions(self, actions):
+        """Executa na UI as ações abstratas emitidas pela máquina do scanner."""
+        for action in actions:
+            if action.kind == ACTION_EXIT:
+                self._handle_scan_exit()
+            elif action.kind == ACTION_SOUND:
+                self.play_sound(action.arg)
+            elif action.kind in (ACTION_HIGHLIGHT, ACTION_UNHIGHLIGHT, ACTION_INVOKE):
+                # Destaque/limpeza vêm com uma linha, bloco ou tecla; invoke com uma tecla
+                indices = action.arg if action.kind != ACTION_INVOKE else (action.arg,)
+                for i in indices:
+                    if not 0 <= i < len(self.scan_key_list):
+                        continue
+                    key = self.scan_key_list[i]
+                    try:
+                        if action.kind == ACTION_HIGHLIGHT:
+                            key.configure(
+                                highlightbackground=self.HIGHLIGHT_BG, 
+                                highlightthickness=self.HIGHLIGHT_THICKNESS
+                            )
+                        elif action.kind == ACTION_UNHIGHLIGHT:
+                            self._restore_key_style(key)
+                        else:
                             key.invoke()
-                        except: pass
-                    
-                    # Reseta tudo para o próximo clique
-                    self.is_dwell_clicking = False
-                    self.dwell_start_time = 0
-                    self.blink_pre_dwell_start_time = 0
-                    self.last_scan_time = time.time() # Reseta o scanner de 3s
-                    self.just_clicked_time = time.time() # Ativa o congelamento de 5s
-            
-            # Se está piscando (em pré-timer ou dwell), não avança o scanner.
-            return 
-
-        # --- 3. Handle Boost (Phase 4) - SECOND PRIORITY ---
-        current_scan_delay = SCAN_DELAY_SECONDS # Default to slow
-        
-        if is_boosting:
-            if not self.boost_needs_release:
-                
-                # CENÁRIO A: Boost está DESLIGADO -> Vamos LIGAR (Requer 3s)
-                if not self.is_boost_active:
-                    if not self.is_boost_pre_dwelling:
-                        print(f"[Scanner] Iniciando timer para ATIVAR Boost...")
-                        self.is_boost_pre_dwelling = True
-                        self.boost_pre_dwell_start_time = time.time()
-                    
-                    elif (now - self.boost_pre_dwell_start_time) >= SCAN_BOOST_PRE_TIMER_SECONDS:
-                        self.is_boost_active = True
-                        self.boost_needs_release = True # Trava para obrigar reabertura
-                        self.is_boost_pre_dwelling = False # Limpa flag
-                        print("[Scanner] BOOST ATIVADO (Modo Rápido)")
-                        self.play_sound('key') # Feedback sonoro de ativação
-
-                # CENÁRIO B: Boost está LIGADO -> Vamos DESLIGAR (Requer 1s)
-                else:
-                    if self.boost_stop_start_time == 0:
-                        print(f"[Scanner] Iniciando timer para DESATIVAR Boost...")
-                        self.boost_stop_start_time = time.time()
-                    
-                    elif (now - self.boost_stop_start_time) >= SCAN_BOOST_STOP_TIMER_SECONDS:
-                        self.is_boost_active = False
-                        self.boost_needs_release = True # Trava para obrigar reabertura
-                        self.boost_stop_start_time = 0 # Limpa timer
-                        print("[Scanner] BOOST DESATIVADO (Modo Normal)")
-                        self.play_sound('key') # Feedback sonoro de desativação
-                
-        else: 
-            # Olhos abertos (ou piscada incompleta)
-            # Reseta os timers de tentativa, mas NÃO o estado self.is_boost_active
-            self.is_boost_pre_dwelling = False
-            self.boost_pre_dwell_start_time = 0
-            self.boost_stop_start_time = 0
-            
-            # Destrava o sistema, permitindo uma nova ação de boost/stop
-            self.boost_needs_release = False
-            
-            # Reseta timers de clique também
-            self.blink_pre_dwell_start_time = 0
-            self.is_dwell_clicking = False
+                    except: pass
 
-        current_scan_delay = SCAN_BOOST_DELAY_SECONDS if self.is_boost_active else SCAN_DELAY_SECONDS
-
-        # --- 4. Handle Scan (Phase 2) - LAST PRIORITY ---
-        if (now - self.last_scan_time) >= current_scan_delay:
-            
-            # 4a. Remove o destaque da tecla anterior
-            if 0 <= self.scan_index < len(self.scan_key_list):
-                try:
-                    key = self.scan_key_list[self.scan_index]
-                    is_special = len(key.cget('text')) > 1 or not key.cget('text').isalnum()
-                    bg_to_set = self.SPECIAL_KEY_STYLE_BG if is_special else self.KEY_STYLE_BG
-                    
-                    if key == self.shift_btn_ref and self.sticky_shift_active:
-                         bg_to_set = "#1E88E5"
-                    elif key == self.caps_btn_ref and self.caps_lock_active:
-                         bg_to_set = "#1E88E5"
-                    
-                    key.configure(
-                        highlightbackground=bg_to_set, 
-                        highlightthickness=4
-                    )
-                except: pass 
-            
-            # 4b. Avança o índice
-            self.scan_index += 1
-            
-            # 4c. Loopa de volta ao início
-            if self.scan_index >= len(self.scan_key_list):
-                self.scan_index = 0
-                
-            # 4d. Adiciona destaque à nova tecla
-            if 0 <= self.scan_index < len(self.scan_key_list):
-                try:
-                    new_key = self.scan_key_list[self.scan_index]
-                    color = "#00ffff" if self.is_boost_active else self.HIGHLIGHT_BG
-                    new_key.configure(
-                        highlightbackground=self.HIGHLIGHT_BG, 
-                        highlightthickness=self.HIGHLIGHT_THICKNESS
-                    )
-                except: pass
-            
-            # 4e. Reseta o timer
-            self.last_scan_time = time.time()
+    def _handle_scan_mode(self, events):
+        """
+        Lógica principal do modo de varredura (Fases 2, 3 e 4).
+        As decisões ficam na ScanMachine (interaction/state_machines.py); aqui só
+        aplicamos as ações na UI.
+        """
+        self._apply_scan_actions(self.scanner.step(events))
 
 
     def _update_status_label(self):
@@ -1040,22 +1309,165 @@ class App(tk.Tk):
         if not self.mouse_control_enabled:
             self.currently_snapped_widget = None
 
+    def _center_cursor_on_widget(self, widget):
+        """Centraliza o cursor no widget sob o olhar (início da piscada de clique)."""
+        # --- CORREÇÃO DE SEGURANÇA AQUI ---
+        # Antes de mover o mouse, verificamos se o widget ainda existe
+        try:
+            if widget.winfo_exists():
+                pyautogui.moveTo(
+                    widget.winfo_rootx() + widget.winfo_width() / 2,
+                    widget.winfo_rooty() + widget.winfo_height() / 2,
+                    duration=0.05
+                )
+            else:
+                # Se não existe mais (foi destruído), limpamos a referência
+                self.currently_snapped_widget = None
+        except Exception:
+            # Qualquer erro de acesso limpa a referência
+            self.currently_snapped_widget = None
+
+    def _perform_dashboard_click(self, widget):
+        """Executa o clique decidido pela máquina de clique do dashboard."""
+        # Garante que o som é tocado antes de executar o comando
+        self.play_sound('mouse')
+
+        # Telas que medem a seleção (teste de Fitts) tratam o clique elas mesmas
+        if hasattr(self.current_screen, "on_gaze_click") and self.current_screen.on_gaze_click(widget):
+            return
+
+        # --- LÓGICA DE ENTRADA NO TECLADO ---
+        if widget == self.keyboard_frame_widget:
+            print("[Main] Clique no teclado detectado. Ativando SCANNER.")
+            self.scan_mode_active = True
+            self.currently_snapped_widget = None # Limpa o snap
+            self.click_machine.reset() # Sem congelamento: o scanner assume
+
+            # Remove a borda verde do frame do teclado (limpeza visual)
+            try: widget.configure(highlightbackground="#0b4073", highlightthickness=0)
+            except: pass
+
+            self._apply_scan_actions(self.scanner.start(self._build_scan_layout(), SCAN_FREQUENCY_ORDER))
+            return
+
+        self._learn_gaze_correction(widget)  # Antes do invoke: ele pode destruir o widget
+
+        # Executa ação normal (botões do dashboard, etc)
+        try:
+            widget.invoke()
+        except tk.TclError:
+            widget.focus_set()
+        except Exception as e:
+            print(f"[EyeTracker] Erro no clique: {e}")
+
+        pyautogui.click()
+
+    def _learn_gaze_correction(self, widget):
+        """
+        Recalibração implícita: um clique confirmado num widget com snap diz
+        que o olhar de antes da piscada estava no centro dele. A amostra vai
+        para a correção do tracker (que descarta as discrepantes) e é salva
+        no perfil junto com as outras preferências aprendidas. Só com o
+        mapeador angular: nos outros nada é aprendido nem salvo.
+        """
+        if not self.tracker or self.blink_onset is None or self.blink_gaze_point is None:
+            return
+        if not self.tracker.learns_from_clicks:  # Outro mapeador ativo (avisado ao escolhê-lo)
+            return
+        try:
+            width, height = widget.winfo_width(), widget.winfo_height()
+            if max(width, height) > GAZE_CORRECTION_MAX_WIDGET_PX:
+                return
+            mon = self.get_active_monitor()
+            target_x = widget.winfo_rootx() + width / 2 - mon.x
+            target_y = widget.winfo_rooty() + height / 2 - mon.y
+        except tk.TclError:
+            return
+        correction = self.tracker.gaze_correction
+        if self.tracker.add_click_sample(self.blink_onset, target_x, target_y, PRE_BLINK_WINDOW, PRE_BLINK_GUARD):
+            bias_yaw, bias_pitch = correction.bias
+            print(f"[Correção] Amostra {correction.samples}: deslocamento {bias_yaw:+.2f}°, {bias_pitch:+.2f}°")
+        else:
+            print(f"[Correção] Clique descartado como amostra ({correction.rejected} descartados).")
+
+    def _nearest_widget(self, x, y):
+        """Widget focável com o centro mais próximo de (x, y) em coordenadas de tela, e a distância."""
+        closest_widget, min_dist_sq = None, float("inf")
+        for widget in self.focusable_widgets:
+            if not widget.winfo_exists():
+                continue
+            wx, wy = widget.winfo_rootx(), widget.winfo_rooty()
+            w, h = widget.winfo_width(), widget.winfo_height()
+            center_x, center_y = wx + w / 2, wy + h / 2
+            dist_sq = (x - center_x) ** 2 + (y - center_y) ** 2
+            if dist_sq < min_dist_sq:
+                min_dist_sq, closest_widget = dist_sq, widget
+        return closest_widget, min_dist_sq ** 0.5
+
+    def _set_snapped_widget(self, widget):
+        """Troca o destaque de snap do widget atual para `widget` (None = nenhum)."""
+        # Remove highlight antigo
+        old = self.currently_snapped_widget
+        if old and old is not widget and old.winfo_exists():
+            try:
+                bg_color = "#0b4073"
+                if isinstance(old, tk.Text):
+                    old.configure(highlightbackground="white", highlightthickness=2)
+                else:
+                    # Remove destaque do teclado ou botões
+                    old.configure(highlightbackground=bg_color, highlightthickness=0)
+            except: pass
+
+        # Adiciona highlight novo
+        if widget is not None and widget.winfo_exists():
+            try:
+                # SE FOR O TECLADO: Borda Verde Grossa envolvendo tudo
+                if widget == self.keyboard_frame_widget:
+                    widget.configure(highlightbackground="#00FF00", highlightthickness=6)
+                else:
+                    widget.configure(highlightbackground="#00ff00", highlightthickness=4)
+            except: pass
+        self.currently_snapped_widget = widget
+
+    def _target_before_blink(self, onset):
+        """
+        Alvo do clique resolvido pelo olhar de antes da piscada: mediana dos
+        pontos entre onset - PRE_BLINK_GUARD - PRE_BLINK_WINDOW e
+        onset - PRE_BLINK_GUARD (os últimos frames antes de fechar o olho
+        derivam para baixo). None se não houver histórico suficiente.
+        """
+        self.blink_gaze_point = None
+        self.blink_onset = onset
+        if not self.tracker or not self.focusable_widgets:
+            return None
+        point = self.tracker.gaze_history.point_before(onset, PRE_BLINK_WINDOW, PRE_BLINK_GUARD)
+        if point is None:
+            return None
+        mon = self.get_active_monitor()
+        x, y = point[0] + mon.x, point[1] + mon.y
+        self.blink_gaze_point = (x, y)
+        widget, dist = self._nearest_widget(x, y)
+        if widget is None or dist > SNAP_THRESHOLD_PIXELS:
+            return None
+        if widget is not self.currently_snapped_widget:
+            print(f"[Clique] Alvo do olhar antes da piscada difere do snap atual: corrigido.")
+        return widget
+
     def update_loop(self):
         if self.mouse_control_enabled and self.tracker:
 
+            # Eventos de gesto gerados pelo tracker a cada frame (com o tempo exato
+            # da captura); são drenados em todo tick, mesmo durante o congelamento.
+            events = self.tracker.get_gesture_events()
+            for fixation in self.tracker.get_fixation_events():
+                self.current_fixation = None if fixation.kind == FIXATION_END else fixation
+
             # Verifica o Modo de Varredura PRIMEIRO
             if self.scan_mode_active:
-                self._handle_scan_mode()
+                self._handle_scan_mode(events)
                 self._update_loop_job = self.after(50, self.update_loop)
                 return
             
-            # 1. Checa "congelamento" pós-clique
-            now = time.time()
-            if self.just_clicked_time and (now - self.just_clicked_time < GAZE_MOVE_DELAY):
-                self._update_loop_job = self.after(50, self.update_loop)
-                return
-            self.just_clicked_time = 0 # Reseta o congelamento de 5s
-
             lock = self.shared_state.get("_lock")
             if lock is None:
                 self._update_loop_job = self.after(50, self.update_loop)
@@ -1063,102 +1475,22 @@ class App(tk.Tk):
                 
             self.is_navigating = False # Reseta o flag
 
-            # 2. LÊ O ESTADO DE PISCADA IMEDIATAMENTE (O NOVO PONTO DE CONGELAMENTO)
-            is_blinking = False
-
-            click_request = False
-
-            with lock:
-                is_blinking = self.shared_state.get("is_blinking", False)
-
-            # --- LÓGICA DE ESTADO DE CLIQUE (IDLE, PRE_LOCKED, LOCKED) ---
-            # ATUALIZA o estado de clique:
-            if self.blink_state == "IDLE":
-                if is_blinking:
-                    self.blink_state = "PRE_LOCKED"
-                    self.blink_start_time = time.time()
-                    # --- CORREÇÃO DE SEGURANÇA AQUI ---
-                    # Antes de mover o mouse, verificamos se o widget ainda existe
-                    if self.currently_snapped_widget:
-                         try:
-                             # Verifica se o widget é válido e existe na tela
-                             if self.currently_snapped_widget.winfo_exists():
-                                 widget = self.currently_snapped_widget
-                                 pyautogui.moveTo(
-                                    widget.winfo_rootx() + widget.winfo_width() / 2,
-                                    widget.winfo_rooty() + widget.winfo_height() / 2,
-                                    duration=0.05 
-                                )
-                             else:
-                                 # Se não existe mais (foi destruído), limpamos a referência
-                                 self.currently_snapped_widget = None
-                         except Exception:
-                             # Qualquer erro de acesso limpa a referência
-                             self.currently_snapped_widget = None
-
-            elif self.blink_state == "PRE_LOCKED":
-                if not is_blinking: # Abriu os olhos: CANCELA
-                    self.blink_state = "IDLE"
-                elif (time.time() - self.blink_start_time) > self.BLINK_CLICK_DURATION_DASHBOARD:
-                    # CLIQUE DETECTADO
-                    click_request = True
-                    self.blink_state = "LOCKED" # Vai para LOCKED (espera abrir o olho)
-            
-            elif self.blink_state == "LOCKED":
-                if not is_blinking: # Abriu os olhos: RESETA
-                    self.blink_state = "IDLE"
-            
-            # 3. Processa o CLIQUE e sai (prioridade máxima)
-            if click_request and self.currently_snapped_widget:
-                widget = self.currently_snapped_widget
-                
-                # --- NOVO BLOCO DE ÁUDIO ---
-                # Garante que o som é tocado antes de executar o comando
-                self.play_sound('mouse') 
-                # ---------------------------
-                
-                # --- LÓGICA DE ENTRADA NO TECLADO (NOVO) ---
-                if widget == self.keyboard_frame_widget:
-                    print("[Main] Clique no teclado detectado. Ativando SCANNER.")
-                    self.scan_mode_active = True
-                    self.currently_snapped_widget = None # Limpa o snap
-                    
-                    # Reseta estado do scanner
-                    self.scan_index = -1
-                    self.last_scan_time = time.time() - SCAN_DELAY_SECONDS
-                    
-                    # Remove a borda verde do frame do teclado (limpeza visual)
-                    try: widget.configure(highlightbackground="#0b4073", highlightthickness=0)
-                    except: pass
-
+            # 1-3. Máquina de clique (IDLE, PRE_LOCKED, LOCKED) + congelamento pós-clique
+            for action in self.click_machine.step(events, self.currently_snapped_widget,
+                                                  self._target_before_blink):
+                if action.kind == ACTION_MOVE_TO:
+                    if action.arg is not self.currently_snapped_widget:
+                        self._set_snapped_widget(action.arg)
+                    self._center_cursor_on_widget(action.arg)
+                elif action.kind == ACTION_CLICK:
+                    self._perform_dashboard_click(action.arg)
                     self._update_loop_job = self.after(50, self.update_loop)
                     return
-                # -------------------------------------------
-
-                # Executa ação normal (botões do dashboard, etc)
-                try:
-                    widget.invoke()
-                except tk.TclError:
-                    widget.focus_set()
-                except Exception as e:
-                    print(f"[EyeTracker] Erro no clique: {e}")
-                
-                # ... (Restante da lógica de clique mantida) ...
-                pyautogui.click()
-                self.just_clicked_time = time.time()
-                self.blink_state = "IDLE"
-                self._update_loop_job = self.after(50, self.update_loop)
-                return
-
 
             # 4. CONGELAMENTO IMEDIATO DO MOVIMENTO:
-            # Se a intenção de clique (PRE_LOCKED ou LOCKED) estiver ativa, PULA toda a lógica de movimento.
-            if self.blink_state != "IDLE":
-                self._update_loop_job = self.after(50, self.update_loop)
-                return
-            
-            # 5. Processa movimento do olhar (Snap e Free-Move) - SÓ se blink_state == IDLE
-            if self.blink_state != "IDLE":
+            # Se a intenção de clique (PRE_LOCKED ou LOCKED) ou o congelamento estiverem ativos,
+            # PULA toda a lógica de movimento (Snap e Free-Move).
+            if self.click_machine.blocks_movement:
                 self._update_loop_job = self.after(50, self.update_loop)
                 return
 
@@ -1170,95 +1502,41 @@ class App(tk.Tk):
                 mon = self.get_active_monitor()
                 final_gaze_x = gaze_x + mon.x
                 final_gaze_y = gaze_y + mon.y
+                if hasattr(self.current_screen, "on_gaze_sample"):
+                    self.current_screen.on_gaze_sample(final_gaze_x, final_gaze_y)
 
-                # Lógica de Snap (Permanece a mesma)
-                closest_widget, min_dist_sq = None, float("inf")
-                was_snapped = False
-
+                # Lógica de Snap
                 if not self.focusable_widgets:
                     self._update_loop_job = self.after(50, self.update_loop)
                     return
 
-                for widget in self.focusable_widgets:
-                    if not widget.winfo_exists():
-                        continue
-                    x, y = widget.winfo_rootx(), widget.winfo_rooty()
-                    w, h = widget.winfo_width(), widget.winfo_height()
-                    center_x, center_y = x + w / 2, y + h / 2
-                    dist_sq = (final_gaze_x - center_x) ** 2 + (final_gaze_y - center_y) ** 2
-                    if dist_sq < min_dist_sq:
-                        min_dist_sq, closest_widget = dist_sq, widget
+                closest_widget, min_dist = self._nearest_widget(final_gaze_x, final_gaze_y)
 
                 # Aplica Snap/Highlight
-                if closest_widget and min_dist_sq ** 0.5 <= SNAP_THRESHOLD_PIXELS:
+                if closest_widget and min_dist <= SNAP_THRESHOLD_PIXELS:
                     if closest_widget != self.currently_snapped_widget:
-                        was_snapped = True
+                        pyautogui.moveTo(
+                            closest_widget.winfo_rootx() + closest_widget.winfo_width() / 2,
+                            closest_widget.winfo_rooty() + closest_widget.winfo_height() / 2,
+                            duration=0.1
+                        )
+                        self._set_snapped_widget(closest_widget)
 
-                        if closest_widget != self.currently_snapped_widget:
-                            pyautogui.moveTo(
-                                closest_widget.winfo_rootx() + closest_widget.winfo_width() / 2,
-                                closest_widget.winfo_rooty() + closest_widget.winfo_height() / 2,
-                                duration=0.1
-                            )
-                            
-                            # Remove highlight antigo
-                            if self.currently_snapped_widget and self.currently_snapped_widget.winfo_exists():
-                                try:
-                                    # Restaura cor original (ajuste conforme seu tema)
-                                    bg_color = "#0b4073" 
-                                    if isinstance(self.currently_snapped_widget, tk.Text):
-                                        self.currently_snapped_widget.configure(highlightbackground="white", highlightthickness=2)
-                                    else:
-                                        self.currently_snapped_widget.configure(highlightbackground=bg_color, highlightthickness=0)
-                                except: pass
-                            
-                            # Adiciona highlight novo
-                            if closest_widget.winfo_exists():
-                                try:
-                                    # SE FOR O TECLADO: Borda Verde Grossa envolvendo tudo
-                                    if closest_widget == self.keyboard_frame_widget:
-                                        closest_widget.configure(highlightbackground="#00FF00", highlightthickness=6)
-                                    
-                                    # Outros widgets
-                                    elif isinstance(closest_widget, tk.Text):
-                                        closest_widget.configure(highlightbackground="#00ff00", highlightthickness=4)
-                                    else:
-                                        closest_widget.configure(highlightbackground="#00ff00", highlightthickness=4)
-                                except: pass
-                                
-                            self.currently_snapped_widget = closest_widget
-                
                 else: # O olhar não está perto de nenhum Snap
-                    
+
                     # 5b. Remove highlight ao sair do foco
-                    if self.currently_snapped_widget and self.currently_snapped_widget.winfo_exists():
-                        try:
-                            bg_color = "#0b4073"
-                            if isinstance(self.currently_snapped_widget, tk.Text):
-                                self.currently_snapped_widget.configure(highlightbackground="white", highlightthickness=2)
-                            else:
-                                # Remove destaque do teclado ou botões
-                                self.currently_snapped_widget.configure(highlightbackground=bg_color, highlightthickness=0)
-                        except: pass
-                        self.currently_snapped_widget = None
-
-                    # 5c. Executa Free-Move (Lógica de estabilidade de 1.5s)
-                    now = time.time()
-                    gaze_point = (final_gaze_x, final_gaze_y)
-                    
-                    if self.last_gaze_pos is None:
-                        self.last_gaze_pos = gaze_point
-                        self.last_stable_time = now
-
-                    dist = ((gaze_point[0] - self.last_gaze_pos[0]) ** 2 + (
-                                gaze_point[1] - self.last_gaze_pos[1]) ** 2) ** 0.5
-
-                    if dist > GAZE_TOLERANCE_PX: # Movimento significativo
-                        self.last_gaze_pos = gaze_point
-                        self.last_stable_time = now
-                    elif now - self.last_stable_time >= GAZE_STABILITY_DELAY: # Olhar estável por 1.5s
-                        pyautogui.moveTo(gaze_point[0], gaze_point[1], duration=0.1)
-                        self.last_cursor_pos = gaze_point
+                    if self.currently_snapped_widget:
+                        self._set_snapped_widget(None)
+
+                    # 5c. Executa Free-Move: o cursor vai para o centróide da fixação
+                    # assim que o detector do tracker a confirma (~200 ms)
+                    fixation = self.current_fixation
+                    if fixation is not None:
+                        target = (fixation.x + mon.x, fixation.y + mon.y)
+                        last = self.last_cursor_pos
+                        if last is None or ((target[0] - last[0]) ** 2 + (target[1] - last[1]) ** 2) ** 0.5 > FIXATION_REFINE_PX:
+                            pyautogui.moveTo(target[0], target[1], duration=0.1)
+                            self.last_cursor_pos = target
 
         # Reagenda o loop
         self._update_loop_job = self.after(50, self.update_loop)
@@ -1267,6 +1545,7 @@ class App(tk.Tk):
 
     def _clear_root(self):
         self.is_navigating = True 
+        self._save_learned_settings()  # Ao sair de uma tela (ex.: Bloco de Notas)
 
         if self._update_loop_job:
             self.after_cancel(self._update_loop_job)
@@ -1294,34 +1573,26 @@ class App(tk.Tk):
         self.scan_mode_active = False
         self.keyboard_frame_widget = None
         self.scan_key_list = []
-        self.scan_index = -1
-        self.last_scan_time = 0
-        self.is_dwell_clicking = False
-        self.dwell_start_time = 0
-        self.blink_pre_dwell_start_time = 0
-        self.is_boost_pre_dwelling = False # <-- NOVO
-        self.is_boost_active = False       # <-- NOVO
-        self.boost_pre_dwell_start_time = 0 # <-- NOVO
-        self.escape_start_time = 0
-        self.is_boost_pre_dwelling = False
-        self.is_boost_active = False
-        self.boost_pre_dwell_start_time = 0
-        self.boost_stop_start_time = 0
-        self.boost_needs_release = False
+        self.scan_key_rows = []
+        self.scan_key_labels = []
+        self.scanner.stop() # Widgets serão destruídos: descarta as ações de limpeza
         
         # Reseta o estado de clique do dashboard
-        self.blink_state = "IDLE"
-        self.blink_start_time = 0
+        self.click_machine.reset()
 
         for w in self.winfo_children():
             w.destroy()
 
     def quit_app(self):
         try:
+            if self._camera_probe_job:
+                self.after_cancel(self._camera_probe_job)
+                self._camera_probe_job = None
             self._clear_root()
             if self.tracker:
                 self.tracker.stop()
-            pygame.quit()
+            self.audio.stop()
+            get_camera_manager().close_all()
         finally:
             self.destroy()
 
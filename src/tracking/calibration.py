@@ -14,6 +14,20 @@ def ensure_profiles_dir():
     os.makedirs(PROFILES_DIR, exist_ok=True)
 
 
+def _safe_filename(profile_name: str):
+    """Nome do perfil sem caracteres inválidos para nome de arquivo."""
+    return "".join(c for c in profile_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+
+
+def session_path(profile_name: str):
+    """
+    Caminho da sessão de calibração multiponto gravada do perfil (.npz,
+    usada pelo benchmark dos mapeadores), ao lado do JSON do perfil.
+    """
+    ensure_profiles_dir()
+    return os.path.join(PROFILES_DIR, f"{_safe_filename(profile_name)}_pontos.npz")
+
+
 def save_profile(profile_name: str, calibration_data: dict):
     """
     Salva os dados de calibração em um arquivo JSON com o nome do perfil.
@@ -27,7 +41,7 @@ def save_profile(profile_name: str, calibration_data: dict):
     """
     ensure_profiles_dir()
     # Limpa o nome do arquivo para evitar caracteres inválidos
-    safe_filename = "".join(c for c in profile_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    safe_filename = _safe_filename(profile_name)
     filepath = os.path.join(PROFILES_DIR, f"{safe_filename}.json")
 
     try:
@@ -51,7 +65,7 @@ def load_profile(profile_name: str):
         dict: Os dados de calibração, ou None se o arquivo não for encontrado ou for inválido.
     """
     ensure_profiles_dir()
-    safe_filename = "".join(c for c in profile_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    safe_filename = _safe_filename(profile_name)
     filepath = os.path.join(PROFILES_DIR, f"{safe_filename}.json")
 
     if not os.path.exists(filepath):
@@ -68,6 +82,24 @@ def load_profile(profile_name: str):
         return None
 
 
+def update_profile(profile_name: str, updates: dict):
+    """
+    Mescla `updates` nas chaves de um perfil existente, sem tocar no resto.
+
+    Args:
+        profile_name (str): O nome do perfil a ser atualizado.
+        updates (dict): As chaves a substituir/adicionar.
+
+    Returns:
+        str: O caminho do arquivo salvo, ou None se o perfil não existir ou houver erro.
+    """
+    data = load_profile(profile_name)
+    if data is None:
+        return None
+    data.update(updates)
+    return save_profile(profile_name, data)
+
+
 def list_profiles():
     """
     Lista todos os perfis de calibração disponíveis no diretório de perfis.
@@ -0,0 +1,93 @@
+# src/tracking/calibration_capture.py
+# Captura automática dos passos 'C' e 'S' da calibração: espera uma fixação
+# estável no '+' central, junta uma janela de frames dessa fixação e devolve
+# estimativas robustas (média aparada), em vez de depender de um único frame
+# em que uma piscada ou micro-sacada estraga o perfil.
+
+import numpy as np
+
+from .fixations import FixationDetector, FIXATION_END
+
+CAPTURE_FRAMES = 20              # Frames por passo (~0.7 s a 30 fps), depois de confirmada a fixação
+FIXATION_DISPERSION_DEG = 10.0   # Dispersão máxima do olhar (graus, x + y) dentro da fixação
+FIXATION_MIN_DURATION = 0.3      # Fixação confirmada após 300 ms no '+'
+SACCADE_VELOCITY_DEG_S = 200.0   # Acima disso é sacada (ruído dos landmarks chega a ~70 graus/s)
+BLINK_EAR_RATIO = 0.75           # EAR abaixo de 75% do repouso recente = olho fechando
+TRIM_FRACTION = 0.2              # Fração descartada em cada ponta na média aparada
+
+
+def trimmed_mean(values, trim: float = TRIM_FRACTION):
+    """Média aparada por componente ao longo do eixo 0 (descarta `trim` de cada ponta)."""
+    values = np.sort(np.asarray(values, dtype=float), axis=0)
+    k = int(len(values) * trim)
+    if len(values) - 2 * k < 1:
+        k = 0
+    return values[k:len(values) - k].mean(axis=0)
+
+
+def medoid_index(values):
+    """Índice da linha mais próxima (soma dos |desvios|) da mediana por componente."""
+    values = np.asarray(values, dtype=float).reshape(len(values), -1)
+    return int(np.argmin(np.abs(values - np.median(values, axis=0)).sum(axis=1)))
+
+
+class CalibrationCapture:
+    """
+    Janela de frames de um passo de calibração ('C' ou 'S').
+
+    A cada frame o tracker passa um sinal 2D do olhar em graus (no passo C,
+    a posição da íris no referencial da cabeça; no S, o yaw/pitch bruto) e
+    os dados do frame. Um FixationDetector em graus decide quando o olhar
+    está parado; só os frames dessa fixação entram na janela. Se a fixação
+    acaba (sacada, piscada) antes de completar `n_frames`, a janela é
+    descartada e a captura espera a próxima fixação.
+
+    `force = True` (botão "Capturar agora") aceita os frames mesmo sem
+    fixação confirmada; os de olho fechando continuam de fora.
+    """
+
+    def __init__(self, step: str, n_frames: int = CAPTURE_FRAMES):
+        self.step = step
+        self.n_frames = n_frames
+        self.fixation = FixationDetector(FIXATION_DISPERSION_DEG, FIXATION_MIN_DURATION,
+                                         SACCADE_VELOCITY_DEG_S)
+        self.samples = []
+        self.restarts = 0  # Janelas descartadas por fim de fixação
+        self.force = False
+
+    @property
+    def done(self):
+        return len(self.samples) >= self.n_frames
+
+    @property
+    def progress(self):
+        return min(1.0, len(self.samples) / self.n_frames)
+
+    @property
+    def waiting_fixation(self):
+        return not self.samples
+
+    def _discard(self):
+        if self.samples and not self.force:
+            self.samples.clear()
+            self.restarts += 1
+
+    def update(self, signal, sample, timestamp, eyes_open: bool = True):
+        """Processa um frame; retorna True quando a janela está completa."""
+        if self.done:
+            return True
+        if not eyes_open:
+            self.fixation.interrupt(timestamp)
+            self._discard()
+            return False
+        events = self.fixation.update(float(signal[0]), float(signal[1]), timestamp)
+        if any(e.kind == FIXATION_END for e in events):
+            self._discard()
+        if self.fixation.active or self.force:
+            self.samples.append(sample)
+        return self.done
+
+    def interrupt(self, timestamp):
+        """Frame sem rosto: a fixação (e a janela) recomeçam."""
+        self.fixation.interrupt(timestamp)
+        self._discard()
@@ -0,0 +1,378 @@
+# src/tracking/camera_manager.py
+# Gerenciador de câmeras do processo: cada dispositivo é aberto uma única vez
+# e seus frames são distribuídos para todos os consumidores (previews, tracker...).
+
+import threading
+import time
+
+import cv2
+
+# Tempo que um dispositivo sem consumidores continua aberto. Cobre a troca de
+# telas (um preview solta a câmera e o próximo pega logo em seguida).
+CAMERA_LINGER_SECONDS = 5.0
+OPEN_TIMEOUT_SECONDS = 5.0
+
+# Configuração de captura de baixa latência (salva por perfil em "capture_settings").
+# width/height/fps = None mantém o valor escolhido pelo driver.
+DEFAULT_CAPTURE_SETTINGS = {
+    "backend": "auto",    # auto, v4l2, dshow, msmf, avfoundation
+    "fourcc": "MJPG",     # MJPG evita o YUYV (mais lento) em muitas webcams USB
+    "width": 640,
+    "height": 480,
+    "fps": 30,
+    "buffer_size": 1,     # Só o frame mais novo fica no buffer do driver
+}
+
+CAPTURE_BACKENDS = {
+    "auto": cv2.CAP_ANY,
+    "v4l2": cv2.CAP_V4L2,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+}
+
+
+def normalize_capture_settings(settings=None) -> dict:
+    """Completa `settings` com os padrões e descarta chaves desconhecidas."""
+    merged = dict(DEFAULT_CAPTURE_SETTINGS)
+    for key, value in (settings or {}).items():
+        if key in merged:
+            merged[key] = value
+    merged["backend"] = str(merged["backend"] or "auto").lower()
+    if merged["backend"] not in CAPTURE_BACKENDS:
+        print(f"[Câmera] Backend desconhecido '{merged['backend']}', usando 'auto'.")
+        merged["backend"] = "auto"
+    return merged
+
+
+def _fourcc_to_str(value) -> str:
+    code = int(value or 0)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ")
+
+
+def apply_capture_settings(cap, settings: dict) -> dict:
+    """
+    Aplica a configuração no dispositivo aberto e lê de volta o que ele aceitou.
+
+    A ordem importa: o FOURCC precisa vir antes da resolução no V4L2.
+    Returns:
+        dict no mesmo formato de DEFAULT_CAPTURE_SETTINGS com os valores reais.
+    """
+    if settings.get("fourcc"):
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*settings["fourcc"][:4]))
+    if settings.get("width") and settings.get("height"):
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(settings["width"]))
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(settings["height"]))
+    if settings.get("fps"):
+        cap.set(cv2.CAP_PROP_FPS, float(settings["fps"]))
+    if settings.get("buffer_size"):
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, int(settings["buffer_size"]))
+
+    try:
+        backend = cap.getBackendName().lower()
+    except cv2.error:
+        backend = settings.get("backend", "auto")
+    return {
+        "backend": backend,
+        "fourcc": _fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0),
+        "fps": float(cap.get(cv2.CAP_PROP_FPS) or 0.0),
+        "buffer_size": int(cap.get(cv2.CAP_PROP_BUFFERSIZE) or 0),
+    }
+
+
+def describe_capture_mismatch(requested: dict, actual: dict) -> list:
+    """Lista legível dos campos em que a câmera não entregou o pedido."""
+    diffs = []
+    for key in ("fourcc", "width", "height", "fps", "buffer_size"):
+        want = requested.get(key)
+        if not want:
+            continue
+        got = actual.get(key)
+        if key == "fourcc":
+            mismatch = str(got).upper() != str(want).upper()
+        else:
+            mismatch = got is None or abs(float(got) - float(want)) > 0.5
+        if mismatch:
+            diffs.append(f"{key}: pedido {want}, obtido {got}")
+    if requested.get("backend", "auto") != "auto" and actual.get("backend") != requested["backend"]:
+        diffs.append(f"backend: pedido {requested['backend']}, obtido {actual.get('backend')}")
+    return diffs
+
+
+class CameraStream(threading.Thread):
+    """Thread de captura de um dispositivo; guarda sempre o frame mais recente."""
+
+    def __init__(self, index: int, settings: dict = None):
+        super().__init__(daemon=True, name=f"CameraStream-{index}")
+        self.index = index
+        self.running = False
+        self.settings = normalize_capture_settings(settings)
+        self.actual_settings = {}
+        self.width = 0
+        self.height = 0
+        self.fps = 0.0
+        self._cap = None
+        self._opened = threading.Event()
+        self._open_ok = False
+        self._pending_settings = None
+        self._settings_applied = threading.Event()
+        self._settings_applied.set()
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._timestamp = 0.0
+
+    def _open(self):
+        """Abre (ou reabre, se o backend mudou) e aplica self.settings."""
+        if self._cap is not None:
+            self._cap.release()
+        self._cap = cv2.VideoCapture(self.index, CAPTURE_BACKENDS[self.settings["backend"]])
+        if not (self._cap and self._cap.isOpened()):
+            return False
+        self._apply_settings()
+        return True
+
+    def _apply_settings(self):
+        self.actual_settings = apply_capture_settings(self._cap, self.settings)
+        self.width = self.actual_settings["width"]
+        self.height = self.actual_settings["height"]
+        self.fps = self.actual_settings["fps"]
+        a = self.actual_settings
+        print(f"[Câmera {self.index}] {a['width']}x{a['height']} @{a['fps']:.0f}fps "
+              f"{a['fourcc'] or '?'} buffer={a['buffer_size']} ({a['backend']}).")
+        for diff in describe_capture_mismatch(self.settings, self.actual_settings):
+            print(f"[Câmera {self.index}] AVISO: {diff}")
+
+    def request_settings(self, settings: dict):
+        """Pede uma nova configuração; aplicada pela thread de captura entre dois frames."""
+        self._settings_applied.clear()
+        self._pending_settings = normalize_capture_settings(settings)
+
+    def wait_settings(self, timeout=OPEN_TIMEOUT_SECONDS):
+        return self._settings_applied.wait(timeout)
+
+    def run(self):
+        self._open_ok = self._open()
+        if not self._open_ok:
+            print(f"ERRO: Não foi possível abrir a câmera índice {self.index}")
+            self.running = False
+        self._opened.set()
+
+        while self.running:
+            pending, self._pending_settings = self._pending_settings, None
+            if pending is not None:
+                backend_changed = pending["backend"] != self.settings["backend"]
+                self.settings = pending
+                if backend_changed:
+                    self.running = self._open()
+                else:
+                    self._apply_settings()
+                self._settings_applied.set()
+                continue
+
+            ret, frame = self._cap.read()
+            if not ret:
+                time.sleep(0.005)
+                continue
+            frame.flags.writeable = False  # Compartilhado entre consumidores
+            with self._cond:
+                self._frame = frame
+                self._seq += 1
+                self._timestamp = time.monotonic()
+                self._cond.notify_all()
+
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+        self._settings_applied.set()
+        with self._cond:
+            self._cond.notify_all()  # Acorda quem está esperando frame
+        print(f"[Câmera {self.index}] Liberada.")
+
+    def start(self):
+        self.running = True
+        super().start()
+
+    def stop(self):
+        self.running = False
+
+    def wait_opened(self, timeout=OPEN_TIMEOUT_SECONDS):
+        """Espera a abertura do dispositivo. Retorna True se abriu."""
+        return self._opened.wait(timeout) and self._open_ok
+
+    def latest(self):
+        """Retorna (seq, frame, timestamp) do frame mais recente, sem bloquear."""
+        with self._cond:
+            return self._seq, self._frame, self._timestamp
+
+    def wait_newer(self, seq: int, timeout: float):
+        """Espera um frame com número de sequência maior que `seq`."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._seq <= seq and self.running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return self._seq, self._frame, self._timestamp
+
+
+class CameraHandle:
+    """
+    Referência de um consumidor a uma câmera compartilhada.
+    Imita o subconjunto de cv2.VideoCapture usado no app (read/get/isOpened/release).
+    """
+
+    def __init__(self, manager, stream: CameraStream):
+        self._manager = manager
+        self._stream = stream
+        self._last_seq = 0
+        self._released = False
+        self.last_timestamp = 0.0  # time.monotonic() da captura do último frame lido
+
+    @property
+    def index(self):
+        return self._stream.index
+
+    def wait_opened(self, timeout=OPEN_TIMEOUT_SECONDS):
+        """Espera a abertura e a aplicação da configuração pedida no acquire."""
+        return self._stream.wait_opened(timeout) and self._stream.wait_settings(timeout)
+
+    @property
+    def actual_settings(self) -> dict:
+        """Valores que a câmera realmente está entregando (FOURCC, resolução, ...)."""
+        return dict(self._stream.actual_settings)
+
+    def isOpened(self):
+        return not self._released and self._stream.wait_opened(0) and self._stream.running
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self._stream.width
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self._stream.height
+        if prop == cv2.CAP_PROP_FPS:
+            return self._stream.fps
+        return 0
+
+    def read(self, timeout: float = 1.0, copy: bool = True):
+        """Bloqueia até chegar um frame que este consumidor ainda não leu."""
+        seq, frame, ts = self._stream.wait_newer(self._last_seq, timeout)
+        return self._consume(seq, frame, ts, copy)
+
+    def read_latest(self, copy: bool = False):
+        """Não bloqueia: retorna o frame mais recente se for novo para este consumidor."""
+        seq, frame, ts = self._stream.latest()
+        return self._consume(seq, frame, ts, copy)
+
+    def _consume(self, seq, frame, ts, copy):
+        if frame is None or seq <= self._last_seq:
+            return False, None
+        self._last_seq = seq
+        self.last_timestamp = ts
+        # Frames são somente-leitura; quem desenha sobre eles recebe uma cópia
+        return True, (frame.copy() if copy else frame)
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._manager.release(self._stream)
+
+
+class CameraManager:
+    """Abre cada dispositivo uma vez e conta as referências dos consumidores."""
+
+    def __init__(self, linger_seconds: float = CAMERA_LINGER_SECONDS):
+        self.linger_seconds = linger_seconds
+        self._lock = threading.Lock()
+        self._streams = {}
+        self._refcounts = {}
+        self._close_timers = {}
+
+    def acquire(self, index: int, settings: dict = None) -> CameraHandle:
+        """
+        Retorna um handle para a câmera, abrindo-a só se ainda não estiver aberta.
+        Com `settings`, a configuração é aplicada ao dispositivo já aberto (sem
+        reabrir, exceto se o backend mudar); sem ela, vale a configuração atual.
+        """
+        with self._lock:
+            timer = self._close_timers.pop(index, None)
+            if timer:
+                timer.cancel()
+            stream = self._streams.get(index)
+            if stream is None or not stream.is_alive():
+                stream = CameraStream(index, settings)
+                stream.start()
+                self._streams[index] = stream
+                self._refcounts[index] = 0
+            elif settings is not None and normalize_capture_settings(settings) != stream.settings:
+                stream.request_settings(settings)
+            self._refcounts[index] += 1
+            return CameraHandle(self, stream)
+
+    def release(self, stream: CameraStream):
+        index = stream.index
+        with self._lock:
+            if self._streams.get(index) is not stream:
+                return  # Stream antigo (falhou e foi substituído)
+            self._refcounts[index] = max(0, self._refcounts[index] - 1)
+            if self._refcounts[index] == 0 and index not in self._close_timers:
+                timer = threading.Timer(self.linger_seconds, self._close_if_unused, args=(index,))
+                timer.daemon = True
+                self._close_timers[index] = timer
+                timer.start()
+
+    def _close_if_unused(self, index: int):
+        with self._lock:
+            self._close_timers.pop(index, None)
+            if self._refcounts.get(index, 0) > 0:
+                return
+            stream = self._streams.pop(index, None)
+            self._refcounts.pop(index, None)
+        if stream:
+            stream.stop()
+
+    def latest_frame(self):
+        """
+        (index, seq, frame) do frame mais recente de alguma câmera aberta, sem
+        virar consumidor (não segura o dispositivo aberto); None se não houver.
+        """
+        with self._lock:
+            streams = list(self._streams.values())
+        for stream in streams:
+            seq, frame, _ = stream.latest()
+            if frame is not None:
+                return stream.index, seq, frame
+        return None
+
+    def open_indices(self):
+        """Índices atualmente abertos (ou aguardando o fechamento)."""
+        with self._lock:
+            return set(self._streams)
+
+    def close_all(self):
+        with self._lock:
+            for timer in self._close_timers.values():
+                timer.cancel()
+            self._close_timers.clear()
+            streams = list(self._streams.values())
+            self._streams.clear()
+            self._refcounts.clear()
+        for stream in streams:
+            stream.stop()
+        for stream in streams:
+            stream.join(timeout=1.0)
+
+
+_manager = CameraManager()
+
+
+def get_camera_manager() -> CameraManager:
+    """Gerenciador único do processo."""
+    return _manager
+
+
+def acquire_camera(index: int, settings: dict = None) -> CameraHandle:
+    return _manager.acquire(index, settings)
@@ -0,0 +1,134 @@
+# src/tracking/camera_probe.py
+# Descoberta de câmeras em paralelo, com cache persistente das capacidades.
+
+import json
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+# Cache das câmeras encontradas (revalidado em segundo plano a cada execução)
+CAMERA_CACHE_FILE = "tracking/camera_cache.json"
+PROBE_TIMEOUT_SECONDS = 3.0
+FPS_CANDIDATES = (15, 30, 60)
+
+
+def camera_label(cam: dict) -> str:
+    """Texto exibido nos menus de seleção de câmera."""
+    label = f"Câmera {cam['index']}"
+    if cam.get("width") and cam.get("height"):
+        label += f" ({cam['width']}x{cam['height']})"
+    return label
+
+
+def probe_camera(index: int):
+    """
+    Abre a câmera `index` e lê suas capacidades.
+
+    Returns:
+        dict com index, label, width, height, fps e fps_supported,
+        ou None se o dispositivo não abrir.
+    """
+    cap = cv2.VideoCapture(index)
+    try:
+        if not cap or not cap.isOpened():
+            return None
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+
+        # Taxas aceitas pelo driver (sem ler frames, apenas set/get)
+        fps_supported = []
+        for candidate in FPS_CANDIDATES:
+            if cap.set(cv2.CAP_PROP_FPS, candidate) and abs(cap.get(cv2.CAP_PROP_FPS) - candidate) < 0.5:
+                fps_supported.append(candidate)
+
+        cam = {"index": index, "width": width, "height": height,
+               "fps": fps, "fps_supported": fps_supported}
+        cam["label"] = camera_label(cam)
+        return cam
+    finally:
+        if cap:
+            cap.release()
+
+
+def load_camera_cache():
+    """Retorna a lista de câmeras do cache, ou [] se não houver cache válido."""
+    try:
+        with open(CAMERA_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        cams = [c for c in data.get("cameras", []) if "index" in c]
+        for c in cams:
+            c["label"] = camera_label(c)
+        return cams
+    except (OSError, ValueError):
+        return []
+
+
+def save_camera_cache(cameras: list):
+    try:
+        os.makedirs(os.path.dirname(CAMERA_CACHE_FILE) or ".", exist_ok=True)
+        with open(CAMERA_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"probed_at": time.time(), "cameras": cameras}, f, indent=4)
+    except OSError as e:
+        print(f"[Câmeras] ERRO ao salvar cache: {e}")
+
+
+class CameraProber:
+    """
+    Testa vários índices de câmera ao mesmo tempo, cada um com seu timeout.
+
+    Os resultados chegam pela fila `events` (a UI consome com `after`):
+        ("found", cam)   -> câmera respondeu
+        ("done", cams)   -> todos terminaram ou estouraram o timeout
+    Índices em `skip` não são abertos (ex.: câmera já em uso pelo preview).
+    Os que estouraram o timeout ficam em `timed_out` (preenchido antes do
+    "done"): não responderam a tempo, o que não quer dizer que não existam.
+    """
+
+    def __init__(self, indices, timeout: float = PROBE_TIMEOUT_SECONDS, skip=()):
+        self.indices = [i for i in indices if i not in set(skip)]
+        self.timeout = timeout
+        self.events = queue.Queue()
+        self._found = {}
+        self._lock = threading.Lock()
+        self._done = False
+        self.timed_out = []
+
+    def start(self):
+        workers = []
+        for index in self.indices:
+            t = threading.Thread(target=self._probe_one, args=(index,), daemon=True,
+                                 name=f"CameraProbe-{index}")
+            t.start()
+            workers.append(t)
+        threading.Thread(target=self._supervise, args=(workers,), daemon=True,
+                         name="CameraProbeSupervisor").start()
+
+    def _probe_one(self, index):
+        try:
+            cam = probe_camera(index)
+        except Exception as e:
+            print(f"[Câmeras] Erro ao testar índice {index}: {e}")
+            cam = None
+        if cam is None:
+            return
+        with self._lock:
+            if self._done:
+                return  # Chegou depois do timeout: ignorado
+            self._found[index] = cam
+        self.events.put(("found", cam))
+
+    def _supervise(self, workers):
+        deadline = time.monotonic() + self.timeout
+        for t in workers:
+            t.join(max(0.0, deadline - time.monotonic()))
+        with self._lock:
+            self._done = True
+            cams = [self._found[i] for i in sorted(self._found)]
+        self.timed_out = [i for i, t in zip(self.indices, workers) if t.is_alive()]
+        if self.timed_out:
+            print(f"[Câmeras] Timeout em: {', '.join(f'CameraProbe-{i}' for i in self.timed_out)}")
+        self.events.put(("done", cams))
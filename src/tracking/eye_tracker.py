@@ -1,13 +1,23 @@
 # src/tracking/eye_tracker.py
 # VERSÃO ATUALIZADA: Suporta calibração não-bloqueante (controlada pelo main.py)
 
+import queue
 import threading
 import time
 from datetime import datetime
 import cv2
 import numpy as np
-import mediapipe as mp
 from . import monitor_core as mc
+from .face_mesh_warmup import take_face_mesh
+from .camera_manager import acquire_camera, normalize_capture_settings
+from .gestures import GestureRecognizer, BLINK, RIGHT_WINK, LEFT_WINK
+from .fixations import FixationDetector
+from .gaze_history import GazeHistory
+from .gaze_correction import GazeCorrection
+from .head_pose import PnPHeadPose, HEAD_POSE_ESTIMATORS, HEAD_POSE_PNP, DEFAULT_HEAD_POSE
+from .gaze_mappers import GazeFrame, gaze_features, load_gaze_mappers, DEFAULT_GAZE_MAPPER
+from .calibration_capture import CalibrationCapture, trimmed_mean, medoid_index, BLINK_EAR_RATIO
+from .streaming_stats import RingBuffer, StreamingStats
 
 
 class EyeTracker(threading.Thread):
@@ -17,16 +27,20 @@ class EyeTracker(threading.Thread):
     LEFT_EYE_OUTLINE_IDX = [362, 385, 387, 263, 390, 373]
     RIGHT_EYE_OUTLINE_IDX = [133, 160, 158, 33, 153, 144]
     #EAR_THRESHOLD = 0.30
+    EAR_HISTORY_SIZE = 30         # Frames de repouso usados no passo E1
+    EAR_CLOSED_QUANTILE = 0.05    # Percentil do "olho fechado" nas capturas E2/E3
 
-    def __init__(self, camera_index: int = 0, shared_state: dict = None):
+    def __init__(self, camera_index: int = 0, shared_state: dict = None, capture_settings: dict = None):
         super().__init__(daemon=True, name="EyeTrackerThread")
         self.camera_index = camera_index
+        # Configuração de captura pedida (salva no perfil) e a entregue pela câmera
+        self.capture_settings = normalize_capture_settings(capture_settings)
+        self.capture_actual = {}
         self.shared_state = shared_state or {}
         self.lock = self.shared_state.get("_lock", threading.RLock())
         self.running = False
         self.cap = None
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = None
+        self.face_mesh = None  # Obtido em run() (ver face_mesh_warmup)
         
         # Estado de calibração
         self.left_locked = False
@@ -35,7 +49,11 @@ class EyeTracker(threading.Thread):
         self.right_sphere_local_offset = None
         self.left_calibration_nose_scale = None
         self.right_calibration_nose_scale = None
-        self.R_ref_nose = [None]
+        # Calibração e geometria deste tracker (plano do monitor, offsets, suavização)
+        self.ctx = mc.TrackerContext()
+        # Estimador da pose da cabeça do perfil (a PCA do nariz ou solvePnP)
+        self.head_pose = DEFAULT_HEAD_POSE
+        self.pnp_head_pose = PnPHeadPose()
         self.base_radius = 20
         self.loaded_profile_name = None
 
@@ -47,10 +65,24 @@ class EyeTracker(threading.Thread):
         self.ear_threshold_left = 0.30
         self.ear_threshold_right = 0.30
         
-        # Histórico para média (últimos 30 frames)
-        self.ear_history_left = []
-        self.ear_history_right = []
+        # Histórico de repouso (últimos 30 frames), buffer circular O(1)
+        self.ear_history_left = RingBuffer(self.EAR_HISTORY_SIZE)
+        self.ear_history_right = RingBuffer(self.EAR_HISTORY_SIZE)
         
+        # Gestos (piscada/winks) reconhecidos a cada frame; a UI consome pela fila
+        self.gestures = GestureRecognizer()
+        self.gesture_events = queue.Queue(maxsize=256)
+        # Fixações do olhar na tela (I-VT/I-DT), também consumidas pela UI via fila
+        self.fixations = FixationDetector()
+        self.fixation_events = queue.Queue(maxsize=256)
+        # Histórico por frame (instante, direção, ponto na tela, EAR, rosto); leitura sem cópia
+        self.gaze_history = GazeHistory()
+        # Correção do olhar aprendida com os cliques confirmados (salva no perfil)
+        self.gaze_correction = GazeCorrection()
+        # Mapeadores olhar -> tela (um de cada tipo); o ativo é escolhido por perfil
+        self.gaze_mappers = load_gaze_mappers(None)
+        self.gaze_mapper = self.gaze_mappers[DEFAULT_GAZE_MAPPER]
+
         # --- FLAGS DE CONTROLE SEPARADOS ---
         self._calibrating_blink = False  # E2
         self._calibrating_boost = False  # E3
@@ -59,25 +91,35 @@ class EyeTracker(threading.Thread):
         # Repouso (E1)
         self._avg_open_left = 0.35
         self._avg_open_right = 0.35
-        # Piscada Dupla (E2)
-        self._min_blink_left = 1.0
-        self._min_blink_right = 1.0
+        # Piscada Dupla (E2): percentil baixo do EAR durante a captura
+        self._closed_blink_left = 1.0
+        self._closed_blink_right = 1.0
         # Boost/Wink (E3)
-        self._min_boost_right = 1.0
-
-        # --- NOVOS: Flags de controle de calibração ---
-        self._trigger_calib_step_c = False
-        self._trigger_calib_step_s = False
+        self._closed_boost_right = 1.0
+        # Estatísticas em fluxo das capturas (sem guardar amostras)
+        quantiles = (self.EAR_CLOSED_QUANTILE, 0.5)
+        self._blink_stats_left = StreamingStats(quantiles)
+        self._blink_stats_right = StreamingStats(quantiles)
+        self._boost_stats_right = StreamingStats(quantiles)
+        self.ear_calibration_stats = {}  # Resumo salvo no perfil
+
+        # --- Captura automática dos passos 'C' e 'S' (janela de frames numa fixação) ---
+        self._calib_capture = None
+        self.calib_steps_done = set()
+        self.calib_point_frames = []  # Frames (GazeFrame) de cada ponto da calibração multiponto
         self._latest_frame = None
         self._face_detected_in_frame = False
+        # Calibração de outro perfil esperando o próximo frame (troca a quente)
+        self._pending_calibration = None
 
     def _compute_iris_center(self, landmarks, indexes):
-        points = np.array([[landmarks[i].x * mc.w, landmarks[i].y * mc.h, landmarks[i].z * mc.w] for i in indexes])
+        w, h = self.ctx.w, self.ctx.h
+        points = np.array([[landmarks[i].x * w, landmarks[i].y * h, landmarks[i].z * w] for i in indexes])
         return np.mean(points, axis=0)
 
     def _compute_ear(self, landmarks, eye_points_idxs):
         try:
-            eye_points = np.array([[landmarks[i].x * mc.w, landmarks[i].y * mc.h] for i in eye_points_idxs])
+            eye_points = np.array([[landmarks[i].x * self.ctx.w, landmarks[i].y * self.ctx.h] for i in eye_points_idxs])
             A = np.linalg.norm(eye_points[1] - eye_points[5])
             B = np.linalg.norm(eye_points[2] - eye_points[4])
             C = np.linalg.norm(eye_points[0] - eye_points[3])
@@ -87,34 +129,46 @@ class EyeTracker(threading.Thread):
 
     def run(self):
         """Loop principal da thread: processa frames, calibra e rastreia."""
-        self.face_mesh = self.mp_face_mesh.FaceMesh(max_num_faces=1, refine_landmarks=True)
-        self.cap = cv2.VideoCapture(self.camera_index)
+        # Usa o FaceMesh pré-aquecido pela tela inicial (ou cria um na hora)
+        self.face_mesh = take_face_mesh()
+        # Câmera compartilhada: se o preview já a abriu, não há reabertura
+        self.cap = acquire_camera(self.camera_index, self.capture_settings)
         
-        if not self.cap or not self.cap.isOpened():
+        if not self.cap.wait_opened():
             print(f"ERRO: Não foi possível abrir a câmera índice {self.camera_index}")
+            self.cap.release()
+            self.cap = None
             self.running = False
             return
             
-        mc.w, mc.h = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.capture_actual = self.cap.actual_settings
+        self.ctx.w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.ctx.h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.running = True
         last_valid_gaze = None
 
         while self.running:
-            ret, frame = self.cap.read()
+            ret, frame = self.cap.read(timeout=0.5)  # Cópia própria (desenhamos sobre ela)
             if not ret:
-                time.sleep(0.005)
+                if not self.cap.isOpened():
+                    print(f"ERRO: Câmera índice {self.camera_index} foi fechada.")
+                    break
                 continue
 
             # Salva o frame para o preview da UI
             with self.lock:
                 self._latest_frame = frame.copy()
+                pending, self._pending_calibration = self._pending_calibration, None
 
+            frame_ts = self.cap.last_timestamp  # Instante da captura (monotonic)
+            if pending is not None:  # Troca de perfil a quente: entre dois frames
+                self._apply_calibration(*pending)
             rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             results = self.face_mesh.process(rgb)
             
             gaze_is_valid = False
-            current_is_blinking = False
-            current_is_boosting = False
+            left_ear = right_ear = None
+            combined_dir = None
 
             if results.multi_face_landmarks:
                 self._face_detected_in_frame = True
@@ -127,42 +181,43 @@ class EyeTracker(threading.Thread):
                 # Atualiza buffer (para passo E1 - Repouso)
                 self.ear_history_left.append(left_ear)
                 self.ear_history_right.append(right_ear)
-                if len(self.ear_history_left) > 30: self.ear_history_left.pop(0)
-                if len(self.ear_history_right) > 30: self.ear_history_right.pop(0)
 
                 # --- 2. CAPTURA DE DADOS DE CALIBRAÇÃO ---
                 
                 # Passo E2: Capturando Piscada Dupla (Clique)
                 if self._calibrating_blink:
-                    if left_ear < self._min_blink_left: self._min_blink_left = left_ear
-                    if right_ear < self._min_blink_right: self._min_blink_right = right_ear
+                    self._blink_stats_left.update(left_ear)
+                    self._blink_stats_right.update(right_ear)
                 
                 # Passo E3: Capturando Boost (Wink Direito)
                 if self._calibrating_boost:
-                    if right_ear < self._min_boost_right: self._min_boost_right = right_ear
+                    self._boost_stats_right.update(right_ear)
                 
                 # --- LÓGICA DE CALIBRAÇÃO (MOVIDA PARA CÁ) ---
                 # Esta lógica é necessária para os passos 'C' e 'S'
+                rotation = None
+                if self.head_pose == HEAD_POSE_PNP:  # Sem solução ainda: vale a PCA neste frame
+                    rotation = self.pnp_head_pose.estimate_landmarks(landmarks, self.ctx.w, self.ctx.h)
                 head_center, R_final, nose_points_3d = mc.compute_and_draw_coordinate_box(
-                    frame, landmarks, mc.nose_indices, self.R_ref_nose
+                    self.ctx, frame, landmarks, mc.nose_indices, rotation=rotation
                 )
                 iris_left_3d = self._compute_iris_center(landmarks, self.LEFT_IRIS_INDEXES)
                 iris_right_3d = self._compute_iris_center(landmarks, self.RIGHT_IRIS_INDEXES)
 
-                # --- DISPARADOR PARA O PASSO 'C' ---
-                if self._trigger_calib_step_c:
-                    current_nose_scale = mc.compute_scale(nose_points_3d)
+                eyes_open = self._eyes_open(left_ear, right_ear)
+                capture = self._calib_capture
+
+                # --- CAPTURA DO PASSO 'C' ---
+                if capture is not None and capture.step == 'C':
+                    # Sinal da fixação: íris no referencial da cabeça, em graus de rotação do olho
+                    iris_mid_local = R_final.T @ ((iris_left_3d + iris_right_3d) / 2 - head_center)
+                    signal = np.degrees(iris_mid_local[:2] / self.base_radius)
                     camera_dir_local = R_final.T @ np.array([0, 0, 1])
-                    self.left_sphere_local_offset = R_final.T @ (iris_left_3d - head_center) + self.base_radius * camera_dir_local
-                    self.right_sphere_local_offset = R_final.T @ (iris_right_3d - head_center) + self.base_radius * camera_dir_local
-                    self.left_calibration_nose_scale = self.right_calibration_nose_scale = current_nose_scale
-                    self.left_locked = self.right_locked = True
-                    gaze_dir_hint = mc._normalize(iris_left_3d - (head_center + R_final @ self.left_sphere_local_offset))
-                    mc.monitor_corners, mc.monitor_center_w, mc.monitor_normal_w, mc.units_per_cm = mc.create_monitor_plane(
-                        head_center, R_final, landmarks, mc.w, mc.h, gaze_dir=gaze_dir_hint
-                    )
-                    print("[Calibração] Passo C: Plano do monitor criado e esferas oculares travadas.")
-                    self._trigger_calib_step_c = False # Reseta o flag
+                    sample = (R_final.T @ (iris_left_3d - head_center) + self.base_radius * camera_dir_local,
+                              R_final.T @ (iris_right_3d - head_center) + self.base_radius * camera_dir_local,
+                              mc.compute_scale(nose_points_3d), head_center, R_final, landmarks, iris_left_3d)
+                    if capture.update(signal, sample, frame_ts, eyes_open):
+                        self._finish_calib_step_c(capture)
 
                 # A lógica de gaze só roda *depois* da calibração 'C'
                 if self.left_locked and self.right_locked:
@@ -175,47 +230,136 @@ class EyeTracker(threading.Thread):
                     right_dir = mc._normalize(iris_right_3d - sphere_world_r)
                     combined_dir = mc._normalize((left_dir + right_dir) / 2.0)
 
-                    # --- DISPARADOR PARA O PASSO 'S' ---
-                    if self._trigger_calib_step_s:
-                        _, _, raw_yaw, raw_pitch = mc.convert_gaze_to_screen_coordinates(combined_dir, 0.0, 0.0)
-                        mc.calibration_offset_yaw = -raw_yaw
-                        mc.calibration_offset_pitch = -raw_pitch
-                        print("[Calibração] Passo S: Centro da tela calibrado.")
-                        self._trigger_calib_step_s = False # Reseta o flag
-                    
+                    # --- CAPTURA DO PASSO 'S' ---
+                    if capture is not None and capture.step == 'S':
+                        raw_yaw, raw_pitch = mc.gaze_direction_to_angles(combined_dir)
+                        if capture.update((raw_yaw, raw_pitch), (raw_yaw, raw_pitch), frame_ts, eyes_open):
+                            self._finish_calib_step_s(capture)
+
                     # --- LÓGICA NORMAL DE GAZE ---
-                    mc.combined_gaze_directions.append(combined_dir)
-                    avg_gaze_dir = mc._normalize(np.mean(mc.combined_gaze_directions, axis=0))
-                    screen_x, screen_y, raw_yaw, raw_pitch = mc.convert_gaze_to_screen_coordinates(
-                        avg_gaze_dir, mc.calibration_offset_yaw, mc.calibration_offset_pitch
+                    avg_gaze_dir = self.ctx.smooth_gaze_direction(combined_dir)
+                    raw_yaw, raw_pitch = mc.gaze_direction_to_angles(avg_gaze_dir)
+                    gaze_frame = GazeFrame(
+                        avg_gaze_dir, (raw_yaw, raw_pitch), (sphere_world_l + sphere_world_r) / 2.0,
+                        gaze_features(left_dir, right_dir, head_center, R_final, scale_ratio_l, self.ctx.w, self.ctx.h),
                     )
+
+                    # --- CAPTURA DOS PONTOS 'P' (frames como o mapeador os vê) ---
+                    if capture is not None and capture.step == 'P':
+                        angles = self.ctx.calibrated_angles(raw_yaw, raw_pitch)
+                        if capture.update(angles, gaze_frame, frame_ts, eyes_open):
+                            self._finish_calib_point(capture)
+
+                    uv = self._map_gaze(gaze_frame)
+                    screen_x, screen_y = mc.screen_fraction_to_pixels(*uv)
                     last_valid_gaze = (screen_x, screen_y, raw_yaw, raw_pitch, 1.0)
                     gaze_is_valid = True
-
-                # --- 3. DETECÇÃO COM LIMIARES DINÂMICOS ---
-                is_left_blinking = left_ear < self.ear_threshold_left
-                is_right_blinking = right_ear < self.ear_threshold_right
-                
-                current_is_blinking = is_left_blinking and is_right_blinking
-                # Boost: Direita fechada E Esquerda aberta
-                current_is_boosting = is_right_blinking and (not is_left_blinking)
-                current_is_escaping = is_left_blinking and (not is_right_blinking) # Só Esquerda (Esc)
-            
             else:
                 self._face_detected_in_frame = False
+                if self._calib_capture is not None:
+                    self._calib_capture.interrupt(frame_ts)
+
+            # --- 3. GESTOS COM LIMIARES DINÂMICOS (sem rosto = olhos abertos) ---
+            self._publish(self.gesture_events, self.gestures.update(
+                left_ear, right_ear, frame_ts, self.ear_threshold_left, self.ear_threshold_right
+            ))
+            active_gesture = self.gestures.active
+
+            # --- 4. FIXAÇÕES (durante piscadas/winks o ponto do olhar não vale) ---
+            if gaze_is_valid and active_gesture is None:
+                fixation_events = self.fixations.update(last_valid_gaze[0], last_valid_gaze[1], frame_ts)
+            else:
+                fixation_events = self.fixations.interrupt(frame_ts)
+            self._publish(self.fixation_events, fixation_events)
+
+            # --- 5. HISTÓRICO DO OLHAR ---
+            self.gaze_history.append(
+                frame_ts, combined_dir,
+                last_valid_gaze[0] if gaze_is_valid else None,
+                last_valid_gaze[1] if gaze_is_valid else None,
+                left_ear, right_ear, self._face_detected_in_frame,
+            )
 
             # --- ATUALIZA O ESTADO COMPARTILHADO ---
             with self.lock:
                 if gaze_is_valid:
                     self.shared_state["gaze"] = last_valid_gaze
-                self.shared_state["is_blinking"] = current_is_blinking
-                self.shared_state["is_boosting"] = current_is_boosting
-                self.shared_state["is_escaping"] = current_is_escaping
+                    self.shared_state["gaze_timestamp"] = frame_ts  # Captura do frame (latência)
+                self.shared_state["is_blinking"] = active_gesture == BLINK
+                # Boost: Direita fechada E Esquerda aberta
+                self.shared_state["is_boosting"] = active_gesture == RIGHT_WINK
+                self.shared_state["is_escaping"] = active_gesture == LEFT_WINK # Só Esquerda (Esc)
 
             time.sleep(0.001)
 
         self.stop() # Limpa o self.cap
 
+    @staticmethod
+    def _publish(event_queue, events):
+        """Coloca os eventos na fila da UI; se ela estiver cheia, descarta os mais antigos."""
+        for event in events:
+            while True:
+                try:
+                    event_queue.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        event_queue.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    @staticmethod
+    def _drain(event_queue):
+        events = []
+        while True:
+            try:
+                events.append(event_queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def get_gesture_events(self):
+        """Retorna (e remove da fila) todos os eventos de gesto pendentes, em ordem."""
+        return self._drain(self.gesture_events)
+
+    def get_fixation_events(self):
+        """Retorna (e remove da fila) todos os eventos de fixação pendentes, em ordem."""
+        return self._drain(self.fixation_events)
+
+    def _map_gaze(self, frame):
+        """
+        Posição (u, v) do frame pelo mapeador ativo. A correção implícita é
+        aprendida nos ângulos calibrados: só vale para o mapeador angular.
+        """
+        mapper = self.gaze_mapper
+        if mapper.kind != DEFAULT_GAZE_MAPPER:
+            uv = mapper.map(frame, self.ctx)
+            if uv is not None:
+                return uv
+            mapper = self.gaze_mappers[DEFAULT_GAZE_MAPPER]  # Ex.: raio paralelo ao plano: vale o angular
+        return mapper.map_angles(*self.gaze_correction.apply(*mapper.calibrated_angles(frame, self.ctx)))
+
+    @property
+    def learns_from_clicks(self):
+        """A correção implícita só existe nos ângulos do mapeador angular (ver _map_gaze)."""
+        return self.gaze_mapper.kind == DEFAULT_GAZE_MAPPER
+
+    def add_click_sample(self, onset, target_x, target_y, window, guard):
+        """
+        Recalibração implícita: o olhar antes da piscada de clique (mesma
+        janela usada para resolver o alvo) devia estar em (target_x, target_y),
+        em px do monitor. Retorna True se a amostra foi aceita pela correção;
+        com outro mapeador ativo nada é aprendido (False).
+        """
+        if not self.learns_from_clicks:
+            return False
+        direction = self.gaze_history.direction_before(onset, window, guard)
+        if direction is None:
+            return False
+        raw_yaw, raw_pitch = mc.gaze_direction_to_angles(direction)
+        target_yaw, target_pitch = mc.screen_to_gaze_angles(target_x, target_y, self.screen_mapping)
+        return self.gaze_correction.update(*self.ctx.calibrated_angles(raw_yaw, raw_pitch),
+                                           target_yaw, target_pitch)
+
     # --- MÉTODO REMOVIDO ---
     # start_debug_window(self, window_pos=None):
     #     (Este método foi removido e sua lógica integrada ao run())
@@ -223,54 +367,73 @@ class EyeTracker(threading.Thread):
     # --- NOVOS MÉTODOS DE CALIBRAÇÃO DE EAR ---
 
     def calibrate_step_open(self):
-        """E1: Registra o estado de repouso (olhos abertos)."""
-        if self.ear_history_left:
-            self._avg_open_left = sum(self.ear_history_left) / len(self.ear_history_left)
-            self._avg_open_right = sum(self.ear_history_right) / len(self.ear_history_right)
+        """E1: Registra o estado de repouso (mediana da janela: ignora piscadas soltas)."""
+        if len(self.ear_history_left):
+            self._avg_open_left = float(np.median(self.ear_history_left.values()))
+            self._avg_open_right = float(np.median(self.ear_history_right.values()))
+            self.ear_calibration_stats["open"] = {
+                "left": self._avg_open_left, "right": self._avg_open_right,
+                "frames": len(self.ear_history_left),
+            }
             print(f"[EAR] Repouso -> L:{self._avg_open_left:.3f} R:{self._avg_open_right:.3f}")
             return True
         return False
 
     def calibrate_ears_step_open(self):
         """Passo 1: Captura a média dos olhos abertos (repouso)."""
-        if self.ear_history_left:
-            self._captured_avg_open_left = sum(self.ear_history_left) / len(self.ear_history_left)
-            self._captured_avg_open_right = sum(self.ear_history_right) / len(self.ear_history_right)
+        if len(self.ear_history_left):
+            self._captured_avg_open_left = float(np.median(self.ear_history_left.values()))
+            self._captured_avg_open_right = float(np.median(self.ear_history_right.values()))
             print(f"[EAR Calib] Aberto Médio -> L: {self._captured_avg_open_left:.3f}, R: {self._captured_avg_open_right:.3f}")
             return True
         return False
 
+    def _closed_level(self, stats, label):
+        """Percentil baixo da captura (robusto a um frame isolado); 1.0 se vazia."""
+        if stats.count == 0:
+            print(f"[EAR] AVISO: nenhuma amostra capturada para {label}.")
+            return 1.0
+        return stats.quantile(self.EAR_CLOSED_QUANTILE)
+
     def start_blink_capture(self):
         """Inicia captura E2 (Piscada Dupla)."""
-        self._min_blink_left = 1.0
-        self._min_blink_right = 1.0
+        self._blink_stats_left.reset()
+        self._blink_stats_right.reset()
         self._calibrating_blink = True
 
     def stop_blink_capture(self):
         self._calibrating_blink = False
-        print(f"[EAR] Blink Mínimos -> L:{self._min_blink_left:.3f} R:{self._min_blink_right:.3f}")
+        self._closed_blink_left = self._closed_level(self._blink_stats_left, "piscada (E)")
+        self._closed_blink_right = self._closed_level(self._blink_stats_right, "piscada (D)")
+        self.ear_calibration_stats["blink_left"] = self._blink_stats_left.summary()
+        self.ear_calibration_stats["blink_right"] = self._blink_stats_right.summary()
+        print(f"[EAR] Blink p{int(100 * self.EAR_CLOSED_QUANTILE)} -> L:{self._closed_blink_left:.3f} "
+              f"R:{self._closed_blink_right:.3f} ({self._blink_stats_left.count} frames)")
 
     def start_boost_capture(self):
         """Inicia captura E3 (Piscada Direita / Boost)."""
-        self._min_boost_right = 1.0
+        self._boost_stats_right.reset()
         self._calibrating_boost = True
 
     def stop_boost_capture(self):
         self._calibrating_boost = False
-        print(f"[EAR] Boost Mínimo -> R:{self._min_boost_right:.3f}")
+        self._closed_boost_right = self._closed_level(self._boost_stats_right, "boost (D)")
+        self.ear_calibration_stats["boost_right"] = self._boost_stats_right.summary()
+        print(f"[EAR] Boost p{int(100 * self.EAR_CLOSED_QUANTILE)} -> R:{self._closed_boost_right:.3f} "
+              f"({self._boost_stats_right.count} frames)")
         self._finalize_thresholds()
 
     def _finalize_thresholds(self):
         """Calcula os limiares finais combinando as 3 etapas."""
         
         # Limiar Esquerdo: Média entre Aberto e Fechado (Blink)
-        thresh_l = (self._avg_open_left + self._min_blink_left) / 2
+        thresh_l = (self._avg_open_left + self._closed_blink_left) / 2
         
         # Limiar Direito: Precisamos ser cuidadosos aqui.
         # O olho direito fecha tanto no Blink quanto no Boost.
-        # Pegamos o "pior caso" (o valor mais baixo registrado em qualquer uma das ações)
+        # Pegamos o "pior caso" (o nível fechado mais baixo entre as duas ações)
         # para garantir que o limiar detecte ambos.
-        min_right_total = min(self._min_blink_right, self._min_boost_right)
+        min_right_total = min(self._closed_blink_right, self._closed_boost_right)
         thresh_r = (self._avg_open_right + min_right_total) / 2
         
         # Travas de segurança (Clamps)
@@ -316,12 +479,160 @@ class EyeTracker(threading.Thread):
             frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         return frame, face_detected
 
-    def trigger_calibration_step(self, step: str):
-        """Chamado pelo main.py para disparar a calibração 'C' ou 'S'."""
-        if step == 'C':
-            self._trigger_calib_step_c = True
-        elif step == 'S':
-            self._trigger_calib_step_s = True
+    def start_calibration_capture(self, step: str):
+        """Chamado pelo main.py: começa a captura automática do passo 'C', 'S' ou de um ponto 'P'."""
+        if step not in ('C', 'S', 'P'):
+            return
+        self.calib_steps_done.discard(step)
+        self._calib_capture = CalibrationCapture(step)
+
+    def consume_calib_step(self, step: str):
+        """True (uma vez) quando a captura do passo terminou e foi aplicada."""
+        if step in self.calib_steps_done:
+            self.calib_steps_done.discard(step)
+            return True
+        return False
+
+    def force_calibration_capture(self):
+        """Aceita os próximos frames mesmo sem fixação confirmada (usuário com olhar instável)."""
+        if self._calib_capture is not None:
+            self._calib_capture.force = True
+
+    def get_calibration_capture(self):
+        """Captura em andamento (para a UI mostrar o progresso) ou None."""
+        return self._calib_capture
+
+    def _finish_calib_point(self, capture):
+        """Ponto da calibração multiponto: guarda os frames capturados para o ajuste dos mapeadores."""
+        self.calib_point_frames.append(list(capture.samples))
+        yaw, pitch = trimmed_mean([f.angles for f in capture.samples])
+        print(f"[Calibração] Ponto {len(self.calib_point_frames)}: yaw {yaw:+.2f}°, pitch {pitch:+.2f}° "
+              f"(brutos, {capture.restarts} janelas descartadas).")
+        self.calib_steps_done.add('P')  # Antes de soltar a captura: a UI não a reinicia
+        self._calib_capture = None
+
+    @property
+    def screen_mapping(self):
+        """Mapeamento multiponto do mapeador angular (None = regra linear calibrada só no centro)."""
+        return self.gaze_mappers[DEFAULT_GAZE_MAPPER].screen_mapping
+
+    def fit_gaze_mappers(self, targets):
+        """
+        Ajusta todos os mapeadores aos frames de cada alvo da calibração
+        multiponto (u, v em fração da tela, na ordem da captura). Quem não
+        puder ser ajustado segue como estava.
+        """
+        frames, labels = [], []
+        for point_frames, target in zip(self.calib_point_frames, targets):
+            frames += point_frames
+            labels += [tuple(target)] * len(point_frames)
+        for kind, mapper in self.gaze_mappers.items():
+            try:
+                if mapper.fit(frames, labels, self.ctx):
+                    print(f"[Calibração] Mapeador '{kind}' ajustado com {len(self.calib_point_frames)} pontos.")
+            except (ValueError, IndexError, np.linalg.LinAlgError) as e:
+                print(f"ERRO ao ajustar o mapeador '{kind}': {e}")
+        mapping = self.screen_mapping
+        if mapping is not None:
+            print(f"[Calibração] Mapeamento '{mapping.kind}' (resíduo {100 * mapping.rms_error:.1f}% da tela).")
+        self.gaze_correction.reset()  # Aprendida sobre o mapeamento antigo
+
+    def set_head_pose(self, kind: str):
+        """
+        Escolhe o estimador da pose da cabeça. Os offsets das esferas do passo
+        C dependem dele: só troque antes de calibrar (ou ao carregar o perfil).
+        """
+        if kind not in HEAD_POSE_ESTIMATORS:
+            print(f"[Pose] Estimador '{kind}' desconhecido; usando '{DEFAULT_HEAD_POSE}'.")
+            kind = DEFAULT_HEAD_POSE
+        self.head_pose = kind
+        self.ctx.R_ref_nose = [None]
+        self.pnp_head_pose.reset()
+
+    def set_gaze_mapper(self, kind: str):
+        """Troca o mapeador ativo (no próximo frame). False se ele não existir ou não estiver ajustado."""
+        mapper = self.gaze_mappers.get(kind)
+        if mapper is None or not mapper.fitted:
+            print(f"[Mapeamento] '{kind}' indisponível (requer calibração multiponto).")
+            return False
+        self.gaze_mapper = mapper
+        print(f"[Mapeamento] Mapeador ativo: {mapper.label}")
+        self._report_click_learning()
+        return True
+
+    def _report_click_learning(self):
+        if not self.learns_from_clicks:
+            print(f"[Correção] Recalibração implícita desativada com '{self.gaze_mapper.kind}' "
+                  f"(só funciona com o mapeador angular).")
+
+    def save_calibration_session(self, path, targets):
+        """
+        Grava os frames da calibração multiponto (com o alvo de cada um) e a
+        calibração do perfil num .npz, para o benchmark dos mapeadores
+        (benchmarks/gaze_mapper_bench.py) reavaliar a sessão offline.
+        """
+        import json
+        frames = [f for point_frames in self.calib_point_frames for f in point_frames]
+        if not frames:
+            return None
+        counts = [len(point_frames) for point_frames in self.calib_point_frames]
+        try:
+            np.savez_compressed(
+                path,
+                direction=np.array([f.direction for f in frames]),
+                angles=np.array([f.angles for f in frames]),
+                origin=np.array([f.origin for f in frames]),
+                features=np.array([f.features for f in frames]),
+                target=np.repeat(np.asarray(targets, dtype=float)[:len(counts)], counts, axis=0),
+                point=np.repeat(np.arange(len(counts)), counts),
+                calibration=json.dumps(self.save_calibration()),
+            )
+            print(f"[Calibração] Sessão de calibração gravada em {path}")
+            return path
+        except Exception as e:
+            print(f"ERRO ao gravar a sessão de calibração: {e}")
+            return None
+
+    def _eyes_open(self, left_ear, right_ear):
+        """Olhos abertos em relação ao repouso recente (antes dos limiares do passo E1)."""
+        if len(self.ear_history_left) < 5:
+            return True
+        open_left = float(np.median(self.ear_history_left.values()))
+        open_right = float(np.median(self.ear_history_right.values()))
+        return left_ear >= BLINK_EAR_RATIO * open_left and right_ear >= BLINK_EAR_RATIO * open_right
+
+    def _finish_calib_step_c(self, capture):
+        """Passo C com a janela capturada: esferas oculares e escala por média aparada."""
+        lefts = np.array([s[0] for s in capture.samples])
+        rights = np.array([s[1] for s in capture.samples])
+        self.left_sphere_local_offset = trimmed_mean(lefts)
+        self.right_sphere_local_offset = trimmed_mean(rights)
+        self.left_calibration_nose_scale = self.right_calibration_nose_scale = float(
+            trimmed_mean([s[2] for s in capture.samples]))
+        self.left_locked = self.right_locked = True
+        # O plano do monitor usa a pose do frame mais típico da janela
+        _, _, _, head_center, R_final, landmarks, iris_left_3d = capture.samples[medoid_index(np.hstack([lefts, rights]))]
+        gaze_dir_hint = mc._normalize(iris_left_3d - (head_center + R_final @ self.left_sphere_local_offset))
+        self.ctx.set_monitor_plane(*mc.create_monitor_plane(
+            head_center, R_final, landmarks, self.ctx.w, self.ctx.h, gaze_dir=gaze_dir_hint
+        ))
+        spread = np.linalg.norm(lefts - self.left_sphere_local_offset, axis=1)
+        print(f"[Calibração] Passo C: {len(capture.samples)} frames ({capture.restarts} janelas descartadas, "
+              f"dispersão mediana {np.median(spread):.2f}). Plano do monitor criado e esferas oculares travadas.")
+        self.calib_steps_done.add('C')  # Antes de soltar a captura: a UI não a reinicia
+        self._calib_capture = None
+
+    def _finish_calib_step_s(self, capture):
+        """Passo S com a janela capturada: offsets de yaw/pitch por média aparada."""
+        raw_yaw, raw_pitch = trimmed_mean(capture.samples)
+        self.ctx.calibration_offset_yaw = -float(raw_yaw)
+        self.ctx.calibration_offset_pitch = -float(raw_pitch)
+        self.gaze_correction.reset()  # Aprendida sobre os offsets antigos
+        spread = np.std(np.array(capture.samples), axis=0)
+        print(f"[Calibração] Passo S: {len(capture.samples)} frames ({capture.restarts} janelas descartadas, "
+              f"desvio {spread[0]:.2f}°/{spread[1]:.2f}°). Centro da tela calibrado.")
+        self.calib_steps_done.add('S')  # Antes de soltar a captura: a UI não a reinicia
+        self._calib_capture = None
     # --- FIM DOS NOVOS MÉTODOS ---
 
     def save_calibration(self):
@@ -345,54 +656,158 @@ class EyeTracker(threading.Thread):
             "calibration_date": datetime.utcnow().isoformat() + "Z",
             "camera_index": self.camera_index,
             "calibration_offsets": {
-                "yaw": mc.calibration_offset_yaw,
-                "pitch": mc.calibration_offset_pitch
+                "yaw": self.ctx.calibration_offset_yaw,
+                "pitch": self.ctx.calibration_offset_pitch
             },
             "ear_thresholds": {
                 "left": self.ear_threshold_left,
                 "right": self.ear_threshold_right
             },
+            "ear_calibration": to_list_safe(self.ear_calibration_stats),
             "monitor_plane": to_list_safe({
-                "corners": mc.monitor_corners,
-                "center": mc.monitor_center_w,
-                "normal": mc.monitor_normal_w,
-                "units_per_cm": mc.units_per_cm
+                "corners": self.ctx.monitor_corners,
+                "center": self.ctx.monitor_center_w,
+                "normal": self.ctx.monitor_normal_w,
+                "units_per_cm": self.ctx.units_per_cm
             }),
             "left_sphere_local_offset": to_list_safe(self.left_sphere_local_offset),
             "right_sphere_local_offset": to_list_safe(self.right_sphere_local_offset),
             "left_calibration_nose_scale": self.left_calibration_nose_scale,
             "right_calibration_nose_scale": self.right_calibration_nose_scale,
+            "capture_settings": dict(self.capture_settings),
+            "capture_actual": dict(self.capture_actual),
+            "gaze_correction": self.gaze_correction.to_dict(),
+            "screen_mapping": self.screen_mapping.to_dict() if self.screen_mapping else None,
+            "head_pose": self.head_pose,
+            "gaze_mapper": self.gaze_mapper.kind,
+            "gaze_mappers": {kind: mapper.to_dict() for kind, mapper in self.gaze_mappers.items()
+                             if kind != DEFAULT_GAZE_MAPPER},
         }
         return calib_data
 
     def load_calibration(self, calib_data: dict, profile_name: str = None):
-        # (Este método permanece o mesmo)
+        """
+        Carrega a calibração de um perfil (parse_calibration + use_calibration).
+        Perfil inválido não altera nada.
+        """
+        state = self.parse_calibration(calib_data)
+        if state is None:
+            return False
+        self.use_calibration(state, profile_name)
+        return True
+
+    @staticmethod
+    def parse_calibration(calib_data: dict):
+        """
+        Lê e valida a calibração de um perfil sem tocar em nenhum tracker:
+        o estado para use_calibration, ou None se o perfil for inválido.
+        """
         try:
-            offsets = calib_data["calibration_offsets"]
-            mc.calibration_offset_yaw = float(offsets["yaw"])
-            mc.calibration_offset_pitch = float(offsets["pitch"])
-            plane = calib_data["monitor_plane"]
-            mc.monitor_corners = np.array(plane["corners"], dtype=float)
-            mc.monitor_center_w = np.array(plane["center"], dtype=float)
-            mc.monitor_normal_w = np.array(plane["normal"], dtype=float)
-            mc.units_per_cm = float(plane["units_per_cm"])
-            self.left_sphere_local_offset = np.array(calib_data["left_sphere_local_offset"], dtype=float)
-            self.right_sphere_local_offset = np.array(calib_data["right_sphere_local_offset"], dtype=float)
-            self.left_calibration_nose_scale = float(calib_data["left_calibration_nose_scale"])
-            self.right_calibration_nose_scale = float(calib_data["right_calibration_nose_scale"])
-            self.left_locked = self.right_locked = True
-            if profile_name:
-                self.loaded_profile_name = profile_name
-            print("Dados de calibração carregados com sucesso no tracker.")
-
-            ear_data = calib_data.get("ear_thresholds", {})
-            self.ear_threshold_left = float(ear_data.get("left", 0.30))
-            self.ear_threshold_right = float(ear_data.get("right", 0.30))
-
-            return True
+            return EyeTracker._parse_calibration(calib_data)
         except Exception as e:
             print(f"ERRO ao carregar dados de calibração: {e}")
-            return False
+            return None
+
+    def use_calibration(self, state: dict, profile_name: str = None):
+        """
+        Usa uma calibração já validada (parse_calibration). Com o tracker
+        rodando a troca é a quente: aplicada inteira pelo loop entre dois
+        frames, sem reabrir a câmera nem o FaceMesh.
+        """
+        if self.running and self.is_alive():
+            with self.lock:
+                self._pending_calibration = (state, profile_name)  # Aplicado no próximo frame
+        else:
+            self._apply_calibration(state, profile_name)
+
+    @staticmethod
+    def _parse_calibration(calib_data: dict):
+        """Estado de calibração do perfil, pronto para ser aplicado (levanta erro se inválido)."""
+        offsets = calib_data["calibration_offsets"]
+        plane = calib_data["monitor_plane"]
+        ear_data = calib_data.get("ear_thresholds", {})
+        # Perfis sem calibração multiponto usam a regra linear e o mapeador angular
+        gaze_mappers = load_gaze_mappers(calib_data)
+        gaze_mapper = gaze_mappers.get(calib_data.get("gaze_mapper", DEFAULT_GAZE_MAPPER))
+        if gaze_mapper is None or not gaze_mapper.fitted:
+            print(f"[Mapeamento] '{calib_data.get('gaze_mapper')}' indisponível; usando o angular.")
+            gaze_mapper = gaze_mappers[DEFAULT_GAZE_MAPPER]
+        return {
+            "offset_yaw": float(offsets["yaw"]),
+            "offset_pitch": float(offsets["pitch"]),
+            "monitor_corners": np.array(plane["corners"], dtype=float),
+            "monitor_center_w": np.array(plane["center"], dtype=float),
+            "monitor_normal_w": np.array(plane["normal"], dtype=float),
+            "units_per_cm": float(plane["units_per_cm"]),
+            # Perfis antigos foram calibrados com a PCA do nariz
+            "head_pose": calib_data.get("head_pose", DEFAULT_HEAD_POSE),
+            "left_sphere_local_offset": np.array(calib_data["left_sphere_local_offset"], dtype=float),
+            "right_sphere_local_offset": np.array(calib_data["right_sphere_local_offset"], dtype=float),
+            "left_calibration_nose_scale": float(calib_data["left_calibration_nose_scale"]),
+            "right_calibration_nose_scale": float(calib_data["right_calibration_nose_scale"]),
+            "ear_threshold_left": float(ear_data.get("left", 0.30)),
+            "ear_threshold_right": float(ear_data.get("right", 0.30)),
+            "ear_calibration_stats": dict(calib_data.get("ear_calibration") or {}),
+            # Perfis antigos não têm "capture_settings": usa os padrões
+            "capture_settings": normalize_capture_settings(calib_data.get("capture_settings")),
+            "gaze_mappers": gaze_mappers,
+            "gaze_mapper": gaze_mapper,
+            # Perfis antigos não têm "gaze_correction": começa da identidade
+            "gaze_correction": GazeCorrection.from_dict(calib_data.get("gaze_correction")),
+        }
+
+    def _apply_calibration(self, state: dict, profile_name: str = None):
+        """Troca toda a calibração de uma vez (no loop: entre dois frames)."""
+        self.ctx.calibration_offset_yaw = state["offset_yaw"]
+        self.ctx.calibration_offset_pitch = state["offset_pitch"]
+        self.ctx.set_monitor_plane(state["monitor_corners"], state["monitor_center_w"],
+                                   state["monitor_normal_w"], state["units_per_cm"])
+        self.set_head_pose(state["head_pose"])
+        self.left_sphere_local_offset = state["left_sphere_local_offset"]
+        self.right_sphere_local_offset = state["right_sphere_local_offset"]
+        self.left_calibration_nose_scale = state["left_calibration_nose_scale"]
+        self.right_calibration_nose_scale = state["right_calibration_nose_scale"]
+        self.ear_threshold_left = state["ear_threshold_left"]
+        self.ear_threshold_right = state["ear_threshold_right"]
+        self._reset_user_state(state["ear_calibration_stats"])
+        if self.cap is not None and state["capture_settings"] != self.capture_settings:
+            print("[Câmera] Configuração de captura do perfil vale a partir da próxima abertura da câmera.")
+        self.capture_settings = state["capture_settings"]
+        self.gaze_mappers = state["gaze_mappers"]
+        self.gaze_mapper = state["gaze_mapper"]
+        self.gaze_correction = state["gaze_correction"]
+        # Direções suavizadas vêm das esferas antigas
+        self.ctx.combined_gaze_directions.clear()
+        self.left_locked = self.right_locked = True
+        if profile_name:
+            self.loaded_profile_name = profile_name
+        print(f"Dados de calibração carregados com sucesso no tracker ({profile_name or 'sem nome'}).")
+        self._report_click_learning()
+        if self.gaze_correction.samples:
+            bias_yaw, bias_pitch = self.gaze_correction.bias
+            print(f"[Correção] {self.gaze_correction.samples} cliques aprendidos "
+                  f"(deslocamento {bias_yaw:+.2f}°, {bias_pitch:+.2f}°)")
+
+    def _reset_user_state(self, ear_calibration_stats):
+        """
+        Esquece o que foi medido com o usuário anterior: gestos e fixações em
+        andamento (encerrados com os eventos "_end"), o histórico do olhar, o
+        repouso dos olhos e as capturas de EAR; as estatísticas de EAR passam
+        a ser as do perfil novo.
+        """
+        now = time.monotonic()
+        self._publish(self.gesture_events, self.gestures.reset(now))
+        self._publish(self.fixation_events, self.fixations.interrupt(now))
+        self.fixations.reset()
+        self.gaze_history.clear()
+        self.ear_history_left.clear()
+        self.ear_history_right.clear()
+        for stats in (self._blink_stats_left, self._blink_stats_right, self._boost_stats_right):
+            stats.reset()
+        self.ear_calibration_stats = ear_calibration_stats
+        open_stats = ear_calibration_stats.get("open") or {}
+        self._avg_open_left = float(open_stats.get("left", 0.35))
+        self._avg_open_right = float(open_stats.get("right", 0.35))
 
     def start(self):
         if self.is_alive():
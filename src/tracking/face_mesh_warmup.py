@@ -0,0 +1,121 @@
+# src/tracking/face_mesh_warmup.py
+# Cria e "aquece" o FaceMesh em segundo plano enquanto o usuário ainda está
+# escolhendo monitor/câmera/perfil, para o EyeTracker já nascer com o modelo pronto.
+# Um frame vazio só aquece o detector de rosto: sem rosto o MediaPipe nem
+# roda o modelo de landmarks. Por isso o aquecimento continua com os frames
+# reais da câmera já aberta pelo preview (camera_manager) até ver um rosto.
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .camera_manager import get_camera_manager
+
+WARMUP_INFERENCES = 3          # Frames vazios (detector)
+WARMUP_FRAME_SHAPE = (480, 640, 3)
+WARMUP_FACE_FRAMES = 3         # Frames com rosto (modelo de landmarks)
+WARMUP_FACE_TIMEOUT = 60.0     # Desiste de esperar um rosto (s)
+WARMUP_POLL_SECONDS = 0.05
+
+
+def create_face_mesh():
+    """Importa o mediapipe sob demanda (custa ~1s) e cria o FaceMesh."""
+    import mediapipe as mp
+    return mp.solutions.face_mesh.FaceMesh(max_num_faces=1, refine_landmarks=True)
+
+
+class FaceMeshWarmup:
+    """
+    Thread única que constrói um FaceMesh, roda algumas inferências em frames
+    vazios (detector) e depois em frames da câmera até o modelo de landmarks
+    rodar com um rosto. O FaceMesh fica disponível para `take()` já depois
+    dos frames vazios; `take()` interrompe o aquecimento com rosto.
+    """
+
+    def __init__(self, inferences: int = WARMUP_INFERENCES, face_frames: int = WARMUP_FACE_FRAMES,
+                 face_timeout: float = WARMUP_FACE_TIMEOUT):
+        self.inferences = inferences
+        self.face_frames = face_frames
+        self.face_timeout = face_timeout
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._face_mesh = None
+        self._thread = threading.Thread(target=self._run, daemon=True, name="FaceMeshWarmup")
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        t0 = time.perf_counter()
+        try:
+            face_mesh = create_face_mesh()
+            dummy = np.zeros(WARMUP_FRAME_SHAPE, dtype=np.uint8)
+            for _ in range(self.inferences):
+                face_mesh.process(dummy)
+            self._face_mesh = face_mesh
+            print(f"[Warmup] FaceMesh pronto em {1000 * (time.perf_counter() - t0):.0f} ms.")
+        except Exception as e:
+            print(f"[Warmup] ERRO ao aquecer o FaceMesh: {e}")
+            return
+        finally:
+            self._ready.set()
+        try:
+            self._warm_landmarks(face_mesh, t0)
+        except Exception as e:
+            print(f"[Warmup] ERRO ao aquecer os landmarks: {e}")
+
+    def _warm_landmarks(self, face_mesh, t0):
+        """Roda o FaceMesh nos frames da câmera aberta até `face_frames` deles terem rosto."""
+        manager = get_camera_manager()
+        deadline = time.monotonic() + self.face_timeout
+        last, faces = None, 0
+        while faces < self.face_frames and not self._stop.is_set():
+            if time.monotonic() > deadline:
+                print("[Warmup] Nenhum rosto visto na câmera: só o detector foi aquecido.")
+                return
+            latest = manager.latest_frame()
+            if latest is None or latest[:2] == last:
+                self._stop.wait(WARMUP_POLL_SECONDS)
+                continue
+            last = latest[:2]
+            results = face_mesh.process(cv2.cvtColor(latest[2], cv2.COLOR_BGR2RGB))
+            if results.multi_face_landmarks:
+                faces += 1
+        if faces >= self.face_frames:
+            print(f"[Warmup] Landmarks aquecidos com a câmera em {1000 * (time.perf_counter() - t0):.0f} ms.")
+
+    def take(self, timeout=None):
+        """
+        Entrega o FaceMesh aquecido (uma única vez), esperando até `timeout`
+        segundos se ainda estiver carregando. Retorna None se não ficou pronto.
+        """
+        if not self._ready.wait(timeout):
+            return None
+        self._stop.set()
+        self._thread.join()  # No máximo o fim da inferência em andamento
+        face_mesh, self._face_mesh = self._face_mesh, None
+        return face_mesh
+
+
+_warmup = None
+_warmup_lock = threading.Lock()
+
+
+def start_face_mesh_warmup():
+    """Inicia o aquecimento, se não houver um em andamento ou já pronto."""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = FaceMeshWarmup()
+            _warmup.start()
+
+
+def take_face_mesh(timeout: float = 15.0):
+    """Retorna o FaceMesh aquecido se houver um; senão cria um novo na hora."""
+    global _warmup
+    with _warmup_lock:
+        warmup, _warmup = _warmup, None
+    face_mesh = warmup.take(timeout) if warmup else None
+    return face_mesh if face_mesh is not None else create_face_mesh()
@@ -0,0 +1,136 @@
+# src/tracking/fixations.py
+# Detector de fixações em fluxo (I-VT + I-DT) que roda a cada frame dentro
+# do tracker, sobre os pontos de olhar na tela (com o instante da captura).
+
+import math
+from collections import deque, namedtuple
+
+# kind:       "fixation_start", "fixation_update" ou "fixation_end"
+# timestamp:  instante do frame que gerou o evento (time.monotonic() da captura)
+# x, y:       centróide da fixação (px da tela)
+# dispersion: (max_x - min_x) + (max_y - min_y) dos pontos da fixação (px)
+# duration:   tempo desde o primeiro ponto da fixação
+FixationEvent = namedtuple("FixationEvent", "kind timestamp x y dispersion duration")
+
+FIXATION_START = "fixation_start"
+FIXATION_UPDATE = "fixation_update"
+FIXATION_END = "fixation_end"
+
+DISPERSION_THRESHOLD_PX = 150.0  # I-DT: dispersão máxima dentro de uma fixação
+MIN_FIXATION_DURATION = 0.2      # I-DT: janela mínima para confirmar a fixação (s)
+SACCADE_VELOCITY_PX_S = 4000.0   # I-VT: acima disso a amostra é sacada (ruído a 30 fps chega a ~1500)
+MAX_SAMPLE_GAP = 0.15            # Buraco maior que isso (piscada, sem rosto) encerra a fixação
+
+
+class FixationDetector:
+    """
+    I-VT + I-DT em fluxo:
+      - uma amostra com velocidade acima de `velocity_px_s` (sacada) encerra
+        a fixação atual e reinicia a janela candidata;
+      - a janela candidata perde as amostras mais antigas até a dispersão
+        caber em `dispersion_px`; quando ela cobre `min_duration`, a fixação
+        começa ("fixation_start");
+      - durante a fixação, cada amostra que mantém a dispersão gera um
+        "fixation_update" (centróide acumulado); a primeira que estoura
+        encerra ("fixation_end") e inicia uma nova janela.
+    Custo O(1) amortizado por amostra (a janela candidata tem poucos pontos).
+    """
+
+    def __init__(self, dispersion_px: float = DISPERSION_THRESHOLD_PX,
+                 min_duration: float = MIN_FIXATION_DURATION,
+                 velocity_px_s: float = SACCADE_VELOCITY_PX_S,
+                 max_gap: float = MAX_SAMPLE_GAP):
+        self.dispersion_px = dispersion_px
+        self.min_duration = min_duration
+        self.velocity_px_s = velocity_px_s
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self):
+        self._window = deque()   # Janela candidata: (t, x, y)
+        self._last = None        # Última amostra (t, x, y)
+        self.active = False
+        self._start_ts = 0.0
+        self._n = 0
+        self._sum_x = self._sum_y = 0.0
+        self._min_x = self._min_y = math.inf
+        self._max_x = self._max_y = -math.inf
+
+    @property
+    def centroid(self):
+        return (self._sum_x / self._n, self._sum_y / self._n) if self._n else None
+
+    def _dispersion_with(self, x, y):
+        return ((max(self._max_x, x) - min(self._min_x, x))
+                + (max(self._max_y, y) - min(self._min_y, y)))
+
+    def _event(self, kind, timestamp):
+        cx, cy = self.centroid
+        dispersion = (self._max_x - self._min_x) + (self._max_y - self._min_y)
+        return FixationEvent(kind, timestamp, cx, cy, dispersion, timestamp - self._start_ts)
+
+    def _end(self, timestamp):
+        """Encerra a fixação ativa (se houver) e devolve o evento."""
+        events = []
+        if self.active:
+            events.append(self._event(FIXATION_END, timestamp))
+        self.active = False
+        self._n = 0
+        self._sum_x = self._sum_y = 0.0
+        self._min_x = self._min_y = math.inf
+        self._max_x = self._max_y = -math.inf
+        return events
+
+    def _accumulate(self, x, y):
+        self._n += 1
+        self._sum_x += x
+        self._sum_y += y
+        self._min_x, self._max_x = min(self._min_x, x), max(self._max_x, x)
+        self._min_y, self._max_y = min(self._min_y, y), max(self._max_y, y)
+
+    def interrupt(self, timestamp):
+        """Sem amostra válida neste frame (piscada, rosto perdido): encerra a fixação."""
+        self._window.clear()
+        self._last = None
+        return self._end(timestamp)
+
+    def update(self, x, y, timestamp):
+        """Processa uma amostra e retorna a lista (possivelmente vazia) de eventos."""
+        events = []
+        last, self._last = self._last, (timestamp, x, y)
+
+        is_saccade = False
+        if last is not None:
+            dt = timestamp - last[0]
+            if dt > self.max_gap:
+                events += self.interrupt(last[0])
+                self._last = (timestamp, x, y)
+            elif dt > 0 and math.hypot(x - last[1], y - last[2]) / dt > self.velocity_px_s:
+                is_saccade = True
+
+        if self.active:
+            if not is_saccade and self._dispersion_with(x, y) <= self.dispersion_px:
+                self._accumulate(x, y)
+                events.append(self._event(FIXATION_UPDATE, timestamp))
+                return events
+            events += self._end(timestamp)
+
+        if is_saccade:
+            self._window.clear()
+        self._window.append((timestamp, x, y))
+        # I-DT: descarta o início da janela até a dispersão caber no limiar
+        while len(self._window) > 1:
+            xs = [p[1] for p in self._window]
+            ys = [p[2] for p in self._window]
+            if (max(xs) - min(xs)) + (max(ys) - min(ys)) <= self.dispersion_px:
+                break
+            self._window.popleft()
+
+        if timestamp - self._window[0][0] >= self.min_duration:
+            self.active = True
+            self._start_ts = self._window[0][0]
+            for _, wx, wy in self._window:
+                self._accumulate(wx, wy)
+            self._window.clear()
+            events.append(self._event(FIXATION_START, timestamp))
+        return events
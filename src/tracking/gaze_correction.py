@@ -0,0 +1,133 @@
+# src/tracking/gaze_correction.py
+# Recalibração implícita: cada clique confirmado num widget com snap vira uma
+# amostra rotulada (o olhar devia estar no centro do widget). As amostras
+# alimentam uma correção afim por mínimos quadrados recursivos (RLS) aplicada
+# aos ângulos do olhar, depois dos offsets do passo S. O estado é salvo no
+# perfil ("gaze_correction").
+
+import numpy as np
+
+from .streaming_stats import RingBuffer
+
+FORGETTING = 0.97          # Fator de esquecimento do RLS (~33 cliques de memória efetiva)
+PRIOR_SLOPE_VAR = 1e-4     # Covariância inicial dos ganhos: mudam devagar...
+PRIOR_BIAS_VAR = 1.0       # ...e a do deslocamento (graus²): corrige o drift logo nos primeiros cliques
+MAX_BIAS_DEG = 6.0         # Limites da correção (além disso o perfil precisa de nova calibração)
+SLOPE_RANGE = (0.7, 1.4)
+MAX_RESIDUAL_DEG = 6.0     # Erro acima disso nunca é amostra (clique fora do alvo pretendido)
+GATE_MIN_DEG = 1.0         # Erros até aqui sempre são aceitos...
+GATE_MADS = 3.0            # ...acima, só até mediana + 3 MAD (escala robusta) dos erros recentes
+GATE_WINDOW = 32           # Erros recentes usados no corte (memória limitada)
+GATE_MIN_SAMPLES = 8       # Amostras antes de o corte robusto valer
+
+
+class GazeCorrection:
+    """
+    Correção afim dos ângulos do olhar (graus, já com os offsets do passo S):
+
+        [yaw', pitch'] = [yaw, pitch, 1] @ theta      (theta 3x2, começa na identidade)
+
+    Ajustada por RLS com fator de esquecimento: memória O(1) (theta e a
+    covariância P 3x3, compartilhada pelos dois eixos porque os regressores
+    são os mesmos). Para P não explodir quando os cliques se concentram em
+    poucos widgets (direções sem excitação), o traço de P é limitado ao
+    inicial. Amostras cujo erro foge do esperado são descartadas.
+
+    Concorrência: `update` roda na thread da UI e `apply` na do tracker;
+    theta é substituído por um array novo (nunca alterado no lugar), então
+    `apply` sempre lê uma correção completa.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.theta = np.array([[1.0, 0.0], [0.0, 1.0], [0.0, 0.0]])
+        self._P0 = np.diag([PRIOR_SLOPE_VAR, PRIOR_SLOPE_VAR, PRIOR_BIAS_VAR])
+        self.P = self._P0.copy()
+        self.residuals = RingBuffer(GATE_WINDOW)  # |erro| (graus) das amostras aceitas
+        self.samples = 0
+        self.rejected = 0
+        self.dirty = False
+
+    @property
+    def bias(self):
+        return float(self.theta[2, 0]), float(self.theta[2, 1])
+
+    def apply(self, yaw, pitch):
+        theta = self.theta  # Lido uma vez (ver docstring)
+        return (yaw * theta[0, 0] + pitch * theta[1, 0] + theta[2, 0],
+                yaw * theta[0, 1] + pitch * theta[1, 1] + theta[2, 1])
+
+    def _gate(self, error):
+        """Limite do erro aceito: fixo no início, depois mediana + GATE_MADS * MAD."""
+        if len(self.residuals) < GATE_MIN_SAMPLES:
+            return MAX_RESIDUAL_DEG
+        recent = self.residuals.values()
+        median = float(np.median(recent))
+        mad = 1.4826 * float(np.median(np.abs(recent - median)))
+        return min(MAX_RESIDUAL_DEG, max(GATE_MIN_DEG, median + GATE_MADS * mad))
+
+    def update(self, yaw, pitch, target_yaw, target_pitch):
+        """
+        Registra uma amostra rotulada: o olhar (yaw, pitch) devia estar em
+        (target_yaw, target_pitch). Retorna True se ela foi usada.
+        """
+        x = np.array([yaw, pitch, 1.0])
+        target = np.array([target_yaw, target_pitch])
+        error = target - x @ self.theta
+        error_norm = float(np.hypot(*error))
+        if not np.all(np.isfinite(error)) or error_norm > self._gate(error_norm):
+            self.rejected += 1
+            return False
+
+        Px = self.P @ x
+        gain = Px / (FORGETTING + x @ Px)
+        theta = self.theta + np.outer(gain, error)
+        if (np.any(np.abs(theta[2]) > MAX_BIAS_DEG)
+                or not SLOPE_RANGE[0] <= theta[0, 0] <= SLOPE_RANGE[1]
+                or not SLOPE_RANGE[0] <= theta[1, 1] <= SLOPE_RANGE[1]):
+            self.rejected += 1
+            return False
+
+        P = (self.P - np.outer(gain, Px)) / FORGETTING
+        P = (P + P.T) / 2  # Mantém simétrica contra erro numérico
+        trace_max = np.trace(self._P0)
+        if np.trace(P) > trace_max:
+            P *= trace_max / np.trace(P)
+        self.P = P
+        self.theta = theta
+        self.residuals.append(error_norm)
+        self.samples += 1
+        self.dirty = True
+        return True
+
+    def to_dict(self):
+        """Formato salvo no perfil."""
+        return {
+            "theta": np.round(self.theta, 6).tolist(),
+            "covariance": np.round(self.P, 9).tolist(),
+            "samples": self.samples,
+            "rejected": self.rejected,
+            "residuals": [round(float(r), 3) for r in self.residuals.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        correction = cls()
+        if not data:
+            return correction
+        try:
+            theta = np.array(data["theta"], dtype=float)
+            P = np.array(data["covariance"], dtype=float)
+            if theta.shape != (3, 2) or P.shape != (3, 3):
+                raise ValueError("formato inválido")
+            correction.theta, correction.P = theta, P
+            for r in data.get("residuals", [])[-GATE_WINDOW:]:
+                correction.residuals.append(float(r))
+            correction.samples = int(data.get("samples", 0))
+            correction.rejected = int(data.get("rejected", 0))
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"[Correção] Correção salva no perfil ignorada: {e}")
+            correction.reset()
+        return correction
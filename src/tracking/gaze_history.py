@@ -0,0 +1,140 @@
+# src/tracking/gaze_history.py
+# Histórico do olhar por frame num array estruturado NumPy (buffer circular
+# espelhado): um escritor (a thread do tracker) e vários leitores (UI,
+# detectores), com janelas por tempo devolvidas como views, sem cópia.
+
+import math
+
+import numpy as np
+
+GAZE_SAMPLE_DTYPE = np.dtype([
+    ("t", "f8"),           # Instante da captura do frame (time.monotonic())
+    ("dir", "f4", (3,)),   # Direção combinada bruta do olhar (unitária), NaN sem rosto
+    ("x", "f4"),           # Ponto na tela (px do monitor), NaN sem olhar válido
+    ("y", "f4"),
+    ("ear_l", "f4"),       # EAR esquerdo/direito, NaN sem rosto
+    ("ear_r", "f4"),
+    ("face", "?"),         # Rosto detectado no frame
+])
+
+DEFAULT_CAPACITY = 1024    # ~34 s a 30 fps
+READ_GUARD = 64            # Amostras reservadas para o escritor não alcançar uma view recém-lida
+
+
+class GazeHistory:
+    """
+    Buffer circular de amostras do olhar, com cada amostra escrita duas vezes
+    (posições i e i + capacidade). Assim qualquer janela de até `capacity`
+    amostras consecutivas é uma fatia contígua e pode ser devolvida como
+    view, sem cópia e sem concatenar as duas pontas do anel.
+
+    Concorrência (um escritor, vários leitores, sem lock):
+      - o escritor grava a amostra nas duas posições e só depois incrementa
+        `count`; um leitor que lê `count` só enxerga amostras completas;
+      - as views valem até o escritor dar a volta no anel sobre elas: as
+        janelas são limitadas a `capacity - READ_GUARD` amostras, o que dá
+        READ_GUARD frames (~2 s a 30 fps) para o leitor usar a view.
+        Para guardar os dados por mais tempo, use `.copy()`, ou confira
+        `still_valid(seq)` com o `seq` devolvido por `window()`.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= READ_GUARD:
+            raise ValueError(f"Capacidade deve ser maior que {READ_GUARD}: {capacity}")
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=GAZE_SAMPLE_DTYPE)
+        self.count = 0  # Total de amostras já escritas (publicado por último)
+
+    @property
+    def max_window(self):
+        return self.capacity - READ_GUARD
+
+    def __len__(self):
+        return min(self.count, self.max_window)
+
+    # --- Escritor (thread do tracker) ---
+
+    def append(self, t, direction=None, x=None, y=None, ear_l=None, ear_r=None, face=False):
+        i = self.count % self.capacity
+        nan = math.nan
+        row = (t,
+               direction if direction is not None else (nan, nan, nan),
+               nan if x is None else x, nan if y is None else y,
+               nan if ear_l is None else ear_l, nan if ear_r is None else ear_r,
+               face)
+        self._data[i] = row
+        self._data[i + self.capacity] = row
+        self.count += 1  # Publica a amostra
+
+    def clear(self):
+        self.count = 0
+
+    # --- Leitores ---
+
+    def window(self, n: int):
+        """
+        Últimas `n` amostras (no máximo `max_window`), da mais antiga para a
+        mais recente, como view. Devolve (view, seq), onde seq é o número de
+        sequência da primeira amostra da view.
+        """
+        end_seq = self.count  # Lido uma vez: o escritor pode avançar depois
+        n = max(0, min(n, end_seq, self.max_window))
+        start_seq = end_seq - n
+        start = start_seq % self.capacity
+        return self._data[start:start + n], start_seq
+
+    def last(self, n: int):
+        """Últimas `n` amostras (view)."""
+        return self.window(n)[0]
+
+    def last_ms(self, ms: float, now: float = None):
+        """Amostras dos últimos `ms` milissegundos (view). `now` padrão: última amostra."""
+        view = self.last(self.max_window)
+        if not len(view):
+            return view
+        end_t = view["t"][-1] if now is None else now
+        return self.between(end_t - ms / 1000.0, end_t, view)
+
+    def between(self, t0: float, t1: float, view=None):
+        """Amostras com t0 <= t <= t1 (view); busca binária nos instantes."""
+        if view is None:
+            view = self.last(self.max_window)
+        ts = view["t"]
+        lo = int(np.searchsorted(ts, t0, side="left"))
+        hi = int(np.searchsorted(ts, t1, side="right"))
+        return view[lo:hi]
+
+    def point_before(self, onset: float, window: float, guard: float = 0.0, min_samples: int = 2):
+        """
+        Mediana (x, y) dos pontos na tela com rosto entre `onset - guard - window`
+        e `onset - guard` (ex.: antes do início de uma piscada, pulando os
+        últimos frames em que a pálpebra já puxa a íris). None se houver
+        menos de `min_samples` pontos válidos.
+        """
+        view = self.between(onset - guard - window, onset - guard)
+        ok = view["face"] & ~np.isnan(view["x"])
+        if np.count_nonzero(ok) < min_samples:
+            return None
+        return float(np.median(view["x"][ok])), float(np.median(view["y"][ok]))
+
+    def direction_before(self, onset: float, window: float, guard: float = 0.0, min_samples: int = 2):
+        """
+        Mesma janela de `point_before`, sobre a direção bruta do olhar:
+        mediana por componente, normalizada. None com poucas amostras.
+        """
+        view = self.between(onset - guard - window, onset - guard)
+        dirs = view["dir"][view["face"] & ~np.isnan(view["dir"][:, 0])]
+        if len(dirs) < min_samples:
+            return None
+        direction = np.median(dirs, axis=0).astype(float)
+        norm = np.linalg.norm(direction)
+        return direction / norm if norm > 1e-9 else None
+
+    def still_valid(self, seq: int):
+        """True se a amostra de número `seq` ainda não foi sobrescrita."""
+        return self.count - seq <= self.capacity
+
+    def latest(self):
+        """Última amostra (cópia) ou None."""
+        view = self.last(1)
+        return view[0].copy() if len(view) else None
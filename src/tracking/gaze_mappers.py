@@ -0,0 +1,247 @@
+# src/tracking/gaze_mappers.py
+# Mapeadores olhar -> tela intercambiáveis, escolhidos por perfil
+# ("gaze_mapper"): o angular (yaw/pitch, o de sempre), a intersecção do raio
+# do olhar com o plano do monitor criado no passo C, e uma regressão ridge
+# sobre atributos dos landmarks. Os que precisam de ajuste usam os frames da
+# calibração multiponto; os parâmetros ficam no perfil ("gaze_mappers").
+
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+from .calibration_capture import trimmed_mean
+from .monitor_core import calibrated_angles_to_screen_fraction, ray_plane_coordinates
+from .screen_mapping import ScreenMapping
+
+# Entrada de um mapeador, montada pelo tracker a cada frame:
+# direction: direção combinada do olhar (unitária, já suavizada)
+# angles:    (yaw, pitch) brutos dessa direção, em graus (sem offsets)
+# origin:    ponto médio dos centros das esferas oculares (mundo)
+# features:  atributos para os mapeadores aprendidos (ver gaze_features)
+GazeFrame = namedtuple("GazeFrame", "direction angles origin features")
+
+RIDGE_ALPHA = 1.0          # Regularização da ridge (atributos padronizados)
+FEATURE_SCALE_FLOOR = 1e-3  # Atributo que não variou na calibração não é amplificado
+
+
+def gaze_features(left_dir, right_dir, head_center, R_final, nose_scale_ratio, frame_w, frame_h):
+    """
+    Atributos por frame para os mapeadores aprendidos (12 valores): direção
+    de cada olho no referencial da cabeça (rotação do olho), eixo frontal da
+    cabeça, posição da cabeça no frame (fração) e escala do nariz em relação
+    à da calibração (distância).
+    """
+    return np.concatenate([
+        R_final.T @ left_dir,
+        R_final.T @ right_dir,
+        R_final[:, 2],
+        (head_center[0] / frame_w, head_center[1] / frame_h, nose_scale_ratio),
+    ])
+
+
+class GazeMapper:
+    """
+    Interface dos mapeadores. `map(frame, ctx)` devolve a posição na tela
+    em fração (u, v), sem limitar às bordas, ou None se não houver como
+    mapear este frame; `ctx` é o TrackerContext do tracker (offsets do passo
+    S, plano do passo C). `fit(frames, targets, ctx)` ajusta o mapeador aos
+    frames da calibração multiponto (alvos em fração da tela). A correção
+    implícita por cliques (GazeCorrection) não passa por aqui: ela é feita
+    nos ângulos do mapeador angular e aplicada pelo tracker.
+    """
+    kind = None
+    label = None
+
+    @property
+    def fitted(self):
+        """Pronto para uso (os aprendidos só depois de uma calibração multiponto)."""
+        return True
+
+    def map(self, frame, ctx):
+        raise NotImplementedError
+
+    def fit(self, frames, targets, ctx):
+        return False
+
+    def to_dict(self):
+        """Formato salvo no perfil."""
+        return {"kind": self.kind}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls()
+
+
+class AngularMapper(GazeMapper):
+    """
+    Yaw/pitch da direção do olhar + offsets do passo S, levados à tela
+    pelas faixas lineares fixas ou pelo mapeamento multiponto
+    (`screen_mapping`), que é o ajuste deste mapeador. `map_angles` recebe
+    os ângulos já calibrados (o tracker aplica neles a correção implícita).
+    """
+    kind = "angular"
+    label = "Angular (yaw/pitch)"
+
+    def __init__(self, screen_mapping=None):
+        self.screen_mapping = screen_mapping
+
+    @staticmethod
+    def calibrated_angles(frame, ctx):
+        return ctx.calibrated_angles(*frame.angles)
+
+    def map_angles(self, yaw, pitch):
+        return calibrated_angles_to_screen_fraction(yaw, pitch, self.screen_mapping)
+
+    def map(self, frame, ctx):
+        return self.map_angles(*self.calibrated_angles(frame, ctx))
+
+    def fit(self, frames, targets, ctx):
+        """Mapeamento multiponto sobre a média aparada dos ângulos calibrados de cada alvo."""
+        groups = defaultdict(list)
+        for frame, target in zip(frames, targets):
+            groups[tuple(target)].append(self.calibrated_angles(frame, ctx))
+        if not groups:
+            return False
+        points = np.array(list(groups.keys()))
+        angles = np.array([trimmed_mean(a) for a in groups.values()])
+        self.screen_mapping = ScreenMapping.fit(angles[:, 0], angles[:, 1], points[:, 0], points[:, 1])
+        return True
+
+    def to_dict(self):
+        return {"kind": self.kind,
+                "screen_mapping": self.screen_mapping.to_dict() if self.screen_mapping else None}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(ScreenMapping.from_dict((data or {}).get("screen_mapping")))
+
+
+class RayPlaneMapper(GazeMapper):
+    """
+    Intersecção do raio do olhar (origem entre as esferas oculares) com o
+    plano do monitor do passo C (`monitor_corners`), em coordenadas do
+    plano (a, b), levada à tela por uma transformação afim. Sem calibração
+    multiponto a afim supõe que o plano é a tela (u = 1 - a, v = 1 - b: o
+    plano é visto da câmera, espelhado); com ela, é ajustada por mínimos
+    quadrados aos alvos.
+    """
+    kind = "ray_plane"
+    label = "Raio x plano do monitor"
+    IDENTITY = [[-1.0, 0.0], [0.0, -1.0], [1.0, 1.0]]  # [a, b, 1] @ A = (1 - a, 1 - b)
+
+    def __init__(self, affine=None):
+        self.affine = np.array(affine if affine is not None else self.IDENTITY, dtype=float)
+
+    @staticmethod
+    def plane_coordinates(frame, ctx):
+        if not ctx.has_monitor_plane:
+            return None
+        hit = ray_plane_coordinates(frame.origin, frame.direction,
+                                    ctx.monitor_corners, ctx.monitor_center_w, ctx.monitor_normal_w)
+        return None if hit is None else hit[:2]
+
+    def map(self, frame, ctx):
+        ab = self.plane_coordinates(frame, ctx)
+        if ab is None:
+            return None
+        A = self.affine
+        return (ab[0] * A[0, 0] + ab[1] * A[1, 0] + A[2, 0],
+                ab[0] * A[0, 1] + ab[1] * A[1, 1] + A[2, 1])
+
+    def fit(self, frames, targets, ctx):
+        rows, labels = [], []
+        for frame, target in zip(frames, targets):
+            ab = self.plane_coordinates(frame, ctx)
+            if ab is not None:
+                rows.append((ab[0], ab[1], 1.0))
+                labels.append(target)
+        if len({tuple(t) for t in labels}) < 3:
+            return False
+        self.affine = np.linalg.lstsq(np.array(rows), np.array(labels, dtype=float), rcond=None)[0]
+        return True
+
+    def to_dict(self):
+        return {"kind": self.kind, "affine": np.round(self.affine, 9).tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls((data or {}).get("affine"))
+
+
+class RidgeMapper(GazeMapper):
+    """
+    Regressão ridge (forma fechada) dos atributos padronizados dos
+    landmarks (gaze_features) para (u, v). Só existe depois de uma
+    calibração multiponto; atributos que não variaram nela (ex.: a cabeça
+    parada) ficam com peso pequeno pela regularização.
+    """
+    kind = "ridge"
+    label = "Regressão ridge (landmarks)"
+
+    def __init__(self, weights=None, mean=None, scale=None, alpha: float = RIDGE_ALPHA):
+        self.weights = None if weights is None else np.asarray(weights, dtype=float)
+        self.mean = None if mean is None else np.asarray(mean, dtype=float)
+        self.scale = None if scale is None else np.asarray(scale, dtype=float)
+        self.alpha = alpha
+
+    @property
+    def fitted(self):
+        return self.weights is not None
+
+    def map(self, frame, ctx):
+        if self.weights is None:
+            return None
+        z = (frame.features - self.mean) / self.scale
+        W = self.weights
+        return float(z @ W[:-1, 0] + W[-1, 0]), float(z @ W[:-1, 1] + W[-1, 1])
+
+    def fit(self, frames, targets, ctx):
+        if len(frames) < 2:
+            return False
+        X = np.array([f.features for f in frames], dtype=float)
+        Y = np.array(targets, dtype=float)
+        self.mean = X.mean(axis=0)
+        self.scale = np.maximum(X.std(axis=0), FEATURE_SCALE_FLOOR)
+        Z = np.hstack([(X - self.mean) / self.scale, np.ones((len(X), 1))])
+        penalty = self.alpha * np.eye(Z.shape[1])
+        penalty[-1, -1] = 0.0  # O intercepto não é regularizado
+        self.weights = np.linalg.solve(Z.T @ Z + penalty, Z.T @ Y)
+        return True
+
+    def to_dict(self):
+        if self.weights is None:
+            return {"kind": self.kind}
+        return {"kind": self.kind, "alpha": self.alpha,
+                "weights": np.round(self.weights, 9).tolist(),
+                "mean": np.round(self.mean, 9).tolist(),
+                "scale": np.round(self.scale, 9).tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        data = data or {}
+        if "weights" not in data:
+            return cls()
+        return cls(data["weights"], data["mean"], data["scale"], float(data.get("alpha", RIDGE_ALPHA)))
+
+
+GAZE_MAPPERS = {cls.kind: cls for cls in (AngularMapper, RayPlaneMapper, RidgeMapper)}
+DEFAULT_GAZE_MAPPER = AngularMapper.kind
+
+
+def load_gaze_mappers(calib_data: dict):
+    """
+    Um mapeador de cada tipo a partir do perfil: o angular usa
+    "screen_mapping" (calibração multiponto); os outros, "gaze_mappers".
+    Parâmetros inválidos caem no mapeador sem ajuste.
+    """
+    calib_data = calib_data or {}
+    saved = calib_data.get("gaze_mappers") or {}
+    mappers = {}
+    for kind, cls in GAZE_MAPPERS.items():
+        data = {"screen_mapping": calib_data.get("screen_mapping")} if cls is AngularMapper else saved.get(kind)
+        try:
+            mappers[kind] = cls.from_dict(data)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"[Mapeamento] Parâmetros de '{kind}' no perfil ignorados: {e}")
+            mappers[kind] = cls()
+    return mappers
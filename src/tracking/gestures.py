@@ -0,0 +1,111 @@
+# src/tracking/gestures.py
+# Reconhecedor de gestos dos olhos (piscada, wink direito/esquerdo) que roda a
+# cada frame dentro do tracker, sobre a série temporal de EAR.
+
+from collections import namedtuple
+
+# kind:      "<gesto>_start", "<gesto>_end" ou "<gesto>_held"
+# timestamp: instante do frame que gerou o evento (time.monotonic() da captura)
+# duration:  tempo com o gesto ativo até esse frame (0 no start)
+# hold:      nome do limiar atingido (só nos eventos "_held")
+GestureEvent = namedtuple("GestureEvent", "kind timestamp duration hold")
+
+BLINK = "blink"            # Os dois olhos fechados
+RIGHT_WINK = "right_wink"  # Só o direito fechado (boost)
+LEFT_WINK = "left_wink"    # Só o esquerdo fechado (escape)
+GESTURES = (BLINK, RIGHT_WINK, LEFT_WINK)
+
+# Margem de histerese do EAR: fecha abaixo do limiar, só reabre acima de limiar + margem
+EAR_HYSTERESIS = 0.03
+
+
+class GestureRecognizer:
+    """
+    Máquina de estados por frame. Cada olho tem histerese própria; o par
+    (esquerdo, direito) define o gesto ativo. Para cada gesto podem ser
+    registrados limiares de duração nomeados (`set_holds`), e um evento
+    "_held" é emitido uma única vez quando o gesto atinge cada limiar.
+
+    Ao soltar uma piscada os olhos raramente abrem juntos; até os dois abrirem,
+    um olho ainda fechado não inicia um wink.
+    """
+
+    def __init__(self, hysteresis: float = EAR_HYSTERESIS):
+        self.hysteresis = hysteresis
+        self.holds = {g: {} for g in GESTURES}
+        self.active = None
+        self.reset()
+
+    def reset(self, timestamp=None):
+        """
+        Esquece o estado dos olhos (os limiares de duração ficam). Se havia um
+        gesto ativo, devolve o evento "_end" dele em `timestamp`, para quem
+        consome os eventos não ficar esperando o fim.
+        """
+        events = []
+        if self.active is not None and timestamp is not None:
+            events.append(GestureEvent(f"{self.active}_end", timestamp, timestamp - self._start_ts, None))
+        self.active = None
+        self._closed = {"left": False, "right": False}
+        self._start_ts = 0.0
+        self._fired = set()
+        self._await_open = False
+        return events
+
+    def set_holds(self, gesture: str, holds: dict):
+        """Define os limiares {nome: segundos} que geram eventos "<gesture>_held"."""
+        self.holds[gesture] = dict(sorted(holds.items(), key=lambda kv: kv[1]))
+
+    def _eye_closed(self, eye, ear, threshold):
+        if ear is None:
+            closed = False  # Sem rosto: trata como aberto
+        elif self._closed[eye]:
+            closed = ear < threshold + self.hysteresis
+        else:
+            closed = ear < threshold
+        self._closed[eye] = closed
+        return closed
+
+    def update(self, left_ear, right_ear, timestamp, threshold_left, threshold_right):
+        """Processa um frame e retorna a lista (possivelmente vazia) de eventos."""
+        left = self._eye_closed("left", left_ear, threshold_left)
+        right = self._eye_closed("right", right_ear, threshold_right)
+
+        if left and right:
+            gesture = BLINK
+        elif right:
+            gesture = RIGHT_WINK
+        elif left:
+            gesture = LEFT_WINK
+        else:
+            gesture = None
+
+        if self._await_open:
+            if gesture is None or gesture == BLINK:
+                self._await_open = False
+            else:
+                gesture = None  # Olho "atrasado" no fim da piscada
+
+        events = []
+        if gesture != self.active:
+            if self.active is not None:
+                events.append(GestureEvent(f"{self.active}_end", timestamp,
+                                           timestamp - self._start_ts, None))
+                if self.active == BLINK and gesture is not None:
+                    self._await_open = True
+                    gesture = None
+            self.active = gesture
+            if gesture is not None:
+                self._start_ts = timestamp
+                self._fired = set()
+                events.append(GestureEvent(f"{gesture}_start", timestamp, 0.0, None))
+
+        if self.active is not None:
+            elapsed = timestamp - self._start_ts
+            for name, seconds in self.holds[self.active].items():
+                if elapsed < seconds:
+                    break
+                if name not in self._fired:
+                    self._fired.add(name)
+                    events.append(GestureEvent(f"{self.active}_held", timestamp, elapsed, name))
+        return events
@@ -0,0 +1,109 @@
+# src/tracking/head_pose.py
+# Estimadores da pose da cabeça, escolhidos por perfil ("head_pose"): a PCA
+# dos landmarks do nariz (monitor_core.compute_and_draw_coordinate_box, a de
+# sempre) ou cv2.solvePnP contra um modelo 3D canônico do rosto, com o
+# frame anterior como chute inicial. Os offsets das esferas oculares do
+# passo C ficam no referencial da cabeça do estimador usado na calibração,
+# então trocar de estimador exige calibrar o perfil de novo.
+
+import cv2
+import numpy as np
+
+HEAD_POSE_PCA = "pca"
+HEAD_POSE_PNP = "pnp"
+HEAD_POSE_ESTIMATORS = {
+    HEAD_POSE_PCA: "PCA do nariz",
+    HEAD_POSE_PNP: "solvePnP (modelo 3D do rosto)",
+}
+DEFAULT_HEAD_POSE = HEAD_POSE_PCA
+
+# Modelo antropométrico genérico de 6 pontos (unidades arbitrárias, ponta do
+# nariz na origem), nos eixos da câmera/mundo do tracker: x para a direita da
+# imagem, y para baixo, z para longe da câmera. Rosto de frente => R = I, e
+# -R[:, 2] aponta para a câmera (mesma convenção do passo C).
+FACE_MODEL_INDICES = (1, 152, 33, 263, 61, 291)  # Nariz, queixo, cantos dos olhos, cantos da boca
+FACE_MODEL_POINTS = np.array([
+    (0.0, 0.0, 0.0),          # Ponta do nariz
+    (0.0, 330.0, 65.0),       # Queixo
+    (-225.0, -170.0, 135.0),  # Canto externo do olho à esquerda na imagem
+    (225.0, -170.0, 135.0),   # Canto externo do olho à direita na imagem
+    (-150.0, 150.0, 125.0),   # Canto da boca à esquerda na imagem
+    (150.0, 150.0, 125.0),    # Canto da boca à direita na imagem
+])
+
+PNP_METHODS = ("iterative", "sqpnp")
+MAX_WARM_STEP_DEG = 25.0  # Salto maior que isso entre frames = chute ruim, resolve do zero
+
+
+def camera_matrix(frame_w, frame_h):
+    """Intrínsecos aproximados de webcam (foco ~ largura do frame, centro óptico no meio)."""
+    return np.array([[frame_w, 0.0, frame_w / 2.0],
+                     [0.0, frame_w, frame_h / 2.0],
+                     [0.0, 0.0, 1.0]])
+
+
+def model_image_points(face_landmarks, frame_w, frame_h):
+    """Posições (px) dos landmarks do modelo no frame."""
+    return np.array([(face_landmarks[i].x * frame_w, face_landmarks[i].y * frame_h)
+                     for i in FACE_MODEL_INDICES])
+
+
+class PnPHeadPose:
+    """
+    Rotação da cabeça (modelo -> mundo) por solvePnP. "iterative"
+    (Levenberg-Marquardt) parte da pose do frame anterior; "sqpnp" é a
+    solução global de cada frame. O primeiro frame, ou um chute que
+    divergiu, sempre é resolvido com SQPnP.
+    """
+
+    def __init__(self, method: str = "iterative"):
+        if method not in PNP_METHODS:
+            raise ValueError(f"Método de solvePnP desconhecido: {method}")
+        self.method = method
+        self._camera = None
+        self._camera_size = None
+        self._dist = np.zeros(4)
+        self.reset()
+
+    def reset(self):
+        """Esquece a pose anterior (novo rosto, nova calibração)."""
+        self.rvec = None
+        self.tvec = None
+        self.rotation = None
+        self.failures = 0
+
+    def _solve_global(self, image_points):
+        ok, rvec, tvec = cv2.solvePnP(FACE_MODEL_POINTS, image_points, self._camera, self._dist,
+                                      flags=cv2.SOLVEPNP_SQPNP)
+        return ok, rvec, tvec
+
+    def estimate(self, image_points, frame_w, frame_h):
+        """
+        Rotação 3x3 para os pontos do modelo no frame (px), ou a do frame
+        anterior se o solver falhar; None se ainda não houve nenhuma.
+        """
+        if self._camera_size != (frame_w, frame_h):
+            self._camera = camera_matrix(frame_w, frame_h)
+            self._camera_size = (frame_w, frame_h)
+        image_points = np.ascontiguousarray(image_points, dtype=float).reshape(-1, 1, 2)
+
+        if self.method == "iterative" and self.rvec is not None:
+            ok, rvec, tvec = cv2.solvePnP(FACE_MODEL_POINTS, image_points, self._camera, self._dist,
+                                          self.rvec.copy(), self.tvec.copy(), useExtrinsicGuess=True,
+                                          flags=cv2.SOLVEPNP_ITERATIVE)
+            step = np.degrees(np.linalg.norm(rvec - self.rvec)) if ok else np.inf
+            if not ok or tvec[2, 0] <= 0 or step > MAX_WARM_STEP_DEG:
+                ok, rvec, tvec = self._solve_global(image_points)
+        else:
+            ok, rvec, tvec = self._solve_global(image_points)
+
+        if not ok or tvec[2, 0] <= 0:  # Solução atrás da câmera: descarta
+            self.failures += 1
+            return self.rotation
+        self.rvec, self.tvec = rvec, tvec
+        self.rotation = cv2.Rodrigues(rvec)[0]
+        return self.rotation
+
+    def estimate_landmarks(self, face_landmarks, frame_w, frame_h):
+        """estimate() direto dos landmarks do MediaPipe."""
+        return self.estimate(model_image_points(face_landmarks, frame_w, frame_h), frame_w, frame_h)
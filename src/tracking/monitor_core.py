@@ -4,15 +4,22 @@ import math
 import time
 import threading
 from collections import deque
-from scipy.spatial.transform import Rotation as Rscipy
-import pyautogui
-import mediapipe as mp
-import keyboard  # used only in update_orbit_from_keys (the caller may choose not to call it)
 
-# Monitor / screen dimensions (used by convert_gaze_to_screen_coordinates)
-MONITOR_WIDTH, MONITOR_HEIGHT = pyautogui.size()
-CENTER_X = MONITOR_WIDTH // 2
-CENTER_Y = MONITOR_HEIGHT // 2
+# Heavy modules (scipy, pyautogui, keyboard) are imported inside the functions
+# that need them, so importing this module stays cheap at startup.
+
+# Monitor / screen dimensions (used by convert_gaze_to_screen_coordinates).
+# Filled in on the first call to get_monitor_size().
+MONITOR_WIDTH, MONITOR_HEIGHT = None, None
+
+
+def get_monitor_size():
+    """Returns (width, height) of the primary screen, queried once on first use."""
+    global MONITOR_WIDTH, MONITOR_HEIGHT
+    if MONITOR_WIDTH is None:
+        import pyautogui
+        MONITOR_WIDTH, MONITOR_HEIGHT = pyautogui.size()
+    return MONITOR_WIDTH, MONITOR_HEIGHT
 
 # --- Orbit camera state for debug view (kept as in original) ---
 orbit_yaw   = -151.0
@@ -24,46 +31,16 @@ orbit_fov_deg = 50.0
 debug_world_frozen = False
 orbit_pivot_frozen = None
 
-# --- 3D monitor plane state (globals — updated by calibration code elsewhere) ---
-monitor_corners = None   # list of 4 world points (p0..p3)
-monitor_center_w = None
-monitor_normal_w = None
-units_per_cm = None
-
 # gaze markers stored on monitor plane (a,b in plane coords)
 gaze_markers = []
 
 # Mouse target and lock (preserved names)
-mouse_target = [CENTER_X, CENTER_Y]
+mouse_target = [0, 0]  # centered by mouse_mover() on first use
 mouse_lock = threading.Lock()
 mouse_control_enabled = False
 
-# Calibration offsets for screen mapping (updated during "s" calibration)
-calibration_offset_yaw = 0
-calibration_offset_pitch = 0
-
-# Filtering buffers
+# Gaze smoothing window (frames averaged by TrackerContext.smooth_gaze_direction)
 filter_length = 10
-combined_gaze_directions = deque(maxlen=filter_length)
-
-# Reference matrices to avoid eigenvector flips
-R_ref_nose = [None]
-R_ref_forehead = [None]
-calibration_nose_scale = None
-
-# MediaPipe face mesh (left here for compatibility; EyeTracker may re-create)
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(
-    static_image_mode=False,
-    max_num_faces=1,
-    refine_landmarks=True,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
-
-# Camera frame size placeholders (set by caller if needed)
-w = 640
-h = 480
 
 # Nose landmark indices used in compute_and_draw_coordinate_box
 nose_indices = [4, 45, 275, 220, 440, 1, 5, 51, 281, 44, 274, 241,
@@ -74,6 +51,52 @@ nose_indices = [4, 45, 275, 220, 440, 1, 5, 51, 281, 44, 274, 241,
 screen_position_file = "tracking/screen_position.txt"
 
 
+class TrackerContext:
+    """
+    Calibration and geometry state of one tracker (one camera, or one replay).
+    Every EyeTracker owns its own, so several trackers and offline replays can
+    run in the same process without sharing state; the geometry functions
+    and gaze mappers receive it explicitly.
+    """
+
+    def __init__(self, frame_w: int = 640, frame_h: int = 480, smoothing: int = None):
+        # Camera frame size (landmarks are normalized to it)
+        self.w = frame_w
+        self.h = frame_h
+        # Calibration offsets for screen mapping (set by the "S" step)
+        self.calibration_offset_yaw = 0.0
+        self.calibration_offset_pitch = 0.0
+        # 3D monitor plane (set by the "C" step): 4 world corners p0..p3, center, normal, scale
+        self.monitor_corners = None
+        self.monitor_center_w = None
+        self.monitor_normal_w = None
+        self.units_per_cm = None
+        # Smoothing buffer of combined gaze directions
+        self.combined_gaze_directions = deque(maxlen=smoothing or filter_length)
+        # Reference matrix to avoid PCA eigenvector flips
+        self.R_ref_nose = [None]
+
+    @property
+    def has_monitor_plane(self):
+        return self.monitor_corners is not None and self.monitor_center_w is not None \
+            and self.monitor_normal_w is not None
+
+    def set_monitor_plane(self, corners, center, normal, units_per_cm):
+        self.monitor_corners = np.asarray(corners, dtype=float)
+        self.monitor_center_w = np.asarray(center, dtype=float)
+        self.monitor_normal_w = np.asarray(normal, dtype=float)
+        self.units_per_cm = float(units_per_cm)
+
+    def smooth_gaze_direction(self, direction):
+        """Adds a combined gaze direction and returns the normalized moving average."""
+        self.combined_gaze_directions.append(direction)
+        return _normalize(np.mean(self.combined_gaze_directions, axis=0))
+
+    def calibrated_angles(self, raw_yaw_deg, raw_pitch_deg):
+        """Raw (yaw, pitch) plus the "S" step offsets."""
+        return raw_yaw_deg + self.calibration_offset_yaw, raw_pitch_deg + self.calibration_offset_pitch
+
+
 def write_screen_position(x, y):
     """Write screen position to file, overwriting the same line"""
     try:
@@ -153,27 +176,14 @@ def draw_wireframe_cube(frame, center, R, size=80):
         cv2.line(frame, projected[i], projected[j], (255, 128, 0), 2)
 
 
-def compute_and_draw_coordinate_box(frame, face_landmarks, indices, ref_matrix_container, color=(0, 255, 0), size=80):
+def pca_orientation(points_3d, ref_matrix_container):
     """
-    From a list of face_landmarks (mediapipe style), extract selected indices,
-    compute a PCA orientation and draw a small wireframe cube + axes on the frame.
-
-    Returns (center3d, R_final, points_3d)
+    PCA orientation (3x3, columns = principal axes) of a landmark point set,
+    with eigenvector sign flips stabilized against ref_matrix_container[0]
+    (set from the first call).
     """
-    global w, h
-    points_3d = np.array([
-        [face_landmarks[i].x * w, face_landmarks[i].y * h, face_landmarks[i].z * w]
-        for i in indices
-    ])
-
+    from scipy.spatial.transform import Rotation as Rscipy
     center = np.mean(points_3d, axis=0)
-
-    # Draw raw 2D points
-    for i in indices:
-        x, y = int(face_landmarks[i].x * w), int(face_landmarks[i].y * h)
-        cv2.circle(frame, (x, y), 3, color, -1)
-
-    # PCA orientation
     centered = points_3d - center
     cov = np.cov(centered.T)
     eigvals, eigvecs = np.linalg.eigh(cov)
@@ -195,6 +205,34 @@ def compute_and_draw_coordinate_box(frame, face_landmarks, indices, ref_matrix_c
         for i in range(3):
             if np.dot(R_final[:, i], R_ref[:, i]) < 0:
                 R_final[:, i] *= -1
+    return R_final
+
+
+def compute_and_draw_coordinate_box(ctx, frame, face_landmarks, indices, color=(0, 255, 0), size=80,
+                                    rotation=None):
+    """
+    From a list of face_landmarks (mediapipe style), extract selected indices,
+    compute a PCA orientation and draw a small wireframe cube + axes on the frame.
+    `ctx` (TrackerContext) gives the frame size and the PCA flip reference.
+    `rotation` (optional, e.g. from head_pose.PnPHeadPose) replaces the PCA
+    orientation; the center and points still come from `indices`.
+
+    Returns (center3d, R_final, points_3d)
+    """
+    w, h = ctx.w, ctx.h
+    points_3d = np.array([
+        [face_landmarks[i].x * w, face_landmarks[i].y * h, face_landmarks[i].z * w]
+        for i in indices
+    ])
+
+    center = np.mean(points_3d, axis=0)
+
+    # Draw raw 2D points
+    for i in indices:
+        x, y = int(face_landmarks[i].x * w), int(face_landmarks[i].y * h)
+        cv2.circle(frame, (x, y), 3, color, -1)
+
+    R_final = pca_orientation(points_3d, ctx.R_ref_nose) if rotation is None else rotation
 
     draw_wireframe_cube(frame, center, R_final, size)
 
@@ -266,6 +304,7 @@ def create_monitor_plane(head_center, R_final, face_landmarks, w_local, h_local,
 
 def update_orbit_from_keys():
     """Keyboard orbit controls (prints on change)."""
+    import keyboard
     global orbit_yaw, orbit_pitch, orbit_radius, orbit_fov_deg
     yaw_step = math.radians(1.5)
     pitch_step = math.radians(1.5)
@@ -311,12 +350,13 @@ def render_debug_view_orbit(
     monitor_center=None,
     monitor_normal=None,
     gaze_markers_arg=None,
+    units_per_cm=None,
 ):
     """
     Construct and return a debug image (numpy array, h_local x w_local x 3).
     This is a faithful port of the original debug renderer.
     """
-    global debug_world_frozen, orbit_pivot_frozen, orbit_yaw, orbit_pitch, orbit_radius, orbit_fov_deg, units_per_cm
+    global debug_world_frozen, orbit_pivot_frozen, orbit_yaw, orbit_pitch, orbit_radius, orbit_fov_deg
     if head_center3d is None:
         return None
 
@@ -490,33 +530,22 @@ def render_debug_view_orbit(
     if (monitor_corners is not None and monitor_center is not None and monitor_normal is not None
             and combined_dir is not None and sphere_world_l is not None and sphere_world_r is not None):
         O = (np.asarray(sphere_world_l, dtype=float) + np.asarray(sphere_world_r, dtype=float)) * 0.5
-        D = _normalize(np.asarray(combined_dir, dtype=float))
-        C = np.asarray(monitor_center, dtype=float)
-        N = _normalize(np.asarray(monitor_normal, dtype=float))
-        denom = float(np.dot(N, D))
-        if abs(denom) > 1e-6:
-            t = float(np.dot(N, (C - O)) / denom)
-            if t > 0.0:
-                P = O + t * D
-                p0, p1, p2, p3 = [np.asarray(p, dtype=float) for p in monitor_corners]
-                u = p1 - p0
-                v = p3 - p0
-                wv = P - p0
-                u_len2 = float(np.dot(u, u)); v_len2 = float(np.dot(v, v))
-                if u_len2 > 1e-9 and v_len2 > 1e-9:
-                    a = float(np.dot(wv, u) / u_len2)
-                    b = float(np.dot(wv, v) / v_len2)
-                    if 0.0 <= a <= 1.0 and 0.0 <= b <= 1.0:
-                        projP = project_point(P)
-                        if projP is not None:
-                            center_px = projP[0]
-                            width_world = math.sqrt(u_len2)
-                            r_world = 0.05 * width_world
-                            u_hat = u / max(width_world, 1e-9)
-                            projR = project_point(P + u_hat * r_world)
-                            if projR is not None:
-                                r_px = int(max(1, np.linalg.norm(np.array(projR[0]) - np.array(center_px))))
-                                cv2.circle(debug, center_px, r_px, (0, 255, 255), 2, lineType=cv2.LINE_AA)
+        hit = ray_plane_coordinates(O, combined_dir, monitor_corners, monitor_center, monitor_normal)
+        if hit is not None:
+            a, b, P = hit
+            if 0.0 <= a <= 1.0 and 0.0 <= b <= 1.0:
+                projP = project_point(P)
+                if projP is not None:
+                    center_px = projP[0]
+                    p0, p1 = [np.asarray(p, dtype=float) for p in monitor_corners[:2]]
+                    u = p1 - p0
+                    width_world = float(np.linalg.norm(u))
+                    r_world = 0.05 * width_world
+                    u_hat = u / max(width_world, 1e-9)
+                    projR = project_point(P + u_hat * r_world)
+                    if projR is not None:
+                        r_px = int(max(1, np.linalg.norm(np.array(projR[0]) - np.array(center_px))))
+                        cv2.circle(debug, center_px, r_px, (0, 255, 255), 2, lineType=cv2.LINE_AA)
 
     # Help text bottom-left (as in original)
     help_text = [
@@ -579,10 +608,29 @@ def draw_gaze(frame, eye_center, iris_center, eye_radius, color, gaze_length):
              (int(gaze_endpoint[0]), int(gaze_endpoint[1])), color, 1)
 
 
-def convert_gaze_to_screen_coordinates(combined_gaze_direction, calibration_offset_yaw, calibration_offset_pitch):
+# Angular span mapped onto the screen: yaw in [-15, 15] deg, pitch in [-5, 5] deg
+SCREEN_YAW_HALF_RANGE_DEG = 5 * 3
+SCREEN_PITCH_HALF_RANGE_DEG = 2.0 * 2.5
+
+
+def screen_to_gaze_angles(screen_x, screen_y, mapping=None):
     """
-    Convert a 3D gaze direction to 2D screen coordinates using the same mapping
-    logic as the original script. Returns (screen_x, screen_y, raw_yaw_deg, raw_pitch_deg).
+    Inverse of calibrated_angles_to_screen_fraction (in pixels): the
+    calibrated (yaw_deg, pitch_deg) that lands on (screen_x, screen_y).
+    """
+    monitor_width, monitor_height = get_monitor_size()
+    if mapping is not None:
+        yaw_deg, pitch_deg = mapping.inverse(screen_x / monitor_width, screen_y / monitor_height)
+        return float(yaw_deg), float(pitch_deg)
+    yaw_deg = (screen_x / monitor_width) * (2 * SCREEN_YAW_HALF_RANGE_DEG) - SCREEN_YAW_HALF_RANGE_DEG
+    pitch_deg = SCREEN_PITCH_HALF_RANGE_DEG - (screen_y / monitor_height) * (2 * SCREEN_PITCH_HALF_RANGE_DEG)
+    return yaw_deg, pitch_deg
+
+
+def gaze_direction_to_angles(combined_gaze_direction):
+    """
+    Raw (yaw_deg, pitch_deg) of a 3D gaze direction, as used by the original
+    script (no calibration offsets applied).
     """
     reference_forward = np.array([0, 0, -1])
     avg_direction = combined_gaze_direction / (np.linalg.norm(combined_gaze_direction) + 1e-12)
@@ -609,30 +657,86 @@ def convert_gaze_to_screen_coordinates(combined_gaze_direction, calibration_offs
     elif yaw_deg > 0:
         yaw_deg = -yaw_deg
 
-    raw_yaw_deg = yaw_deg
-    raw_pitch_deg = pitch_deg
+    return yaw_deg, pitch_deg
+
+
+def calibrated_angles_to_screen_fraction(yaw_deg, pitch_deg, mapping=None):
+    """
+    Screen position (u, v), as fractions of width/height, of calibrated
+    angles: fixed linear yaw/pitch ranges, or the per-profile `mapping`.
+    """
+    if mapping is not None:
+        return mapping.map(yaw_deg, pitch_deg)
+    yawDegrees = SCREEN_YAW_HALF_RANGE_DEG
+    pitchDegrees = SCREEN_PITCH_HALF_RANGE_DEG
+    return (yaw_deg + yawDegrees) / (2 * yawDegrees), (pitchDegrees - pitch_deg) / (2 * pitchDegrees)
 
-    yawDegrees = 5 * 3
-    pitchDegrees = 2.0 * 2.5
 
-    yaw_deg += calibration_offset_yaw
-    pitch_deg += calibration_offset_pitch
+def screen_fraction_to_pixels(u, v):
+    """Pixel position of a screen fraction, clamped 10 px inside the borders."""
+    monitor_width, monitor_height = get_monitor_size()
+    screen_x = int(u * monitor_width)
+    screen_y = int(v * monitor_height)
+    screen_x = max(10, min(screen_x, monitor_width - 10))
+    screen_y = max(10, min(screen_y, monitor_height - 10))
+    return screen_x, screen_y
 
-    screen_x = int(((yaw_deg + yawDegrees) / (2 * yawDegrees)) * MONITOR_WIDTH)
-    screen_y = int(((pitchDegrees - pitch_deg) / (2 * pitchDegrees)) * MONITOR_HEIGHT)
 
-    screen_x = max(10, min(screen_x, MONITOR_WIDTH - 10))
-    screen_y = max(10, min(screen_y, MONITOR_HEIGHT - 10))
+def convert_gaze_to_screen_coordinates(combined_gaze_direction, calibration_offset_yaw, calibration_offset_pitch):
+    """
+    Convert a 3D gaze direction to 2D screen coordinates using the same mapping
+    logic as the original script. Returns (screen_x, screen_y, raw_yaw_deg, raw_pitch_deg).
+    The tracker maps gaze through gaze_mappers.GazeMapper instead (the
+    multi-point fit and the click correction live there).
+    """
+    raw_yaw_deg, raw_pitch_deg = gaze_direction_to_angles(combined_gaze_direction)
+
+    yaw_deg = raw_yaw_deg + calibration_offset_yaw
+    pitch_deg = raw_pitch_deg + calibration_offset_pitch
 
+    u, v = calibrated_angles_to_screen_fraction(yaw_deg, pitch_deg)
+    screen_x, screen_y = screen_fraction_to_pixels(u, v)
     return screen_x, screen_y, raw_yaw_deg, raw_pitch_deg
 
 
+def ray_plane_coordinates(origin, direction, corners, center, normal):
+    """
+    Hit point of the gaze ray (origin + t * direction, t > 0) on the monitor
+    plane, in plane coordinates (a, b): a along p0 -> p1, b along p0 -> p3
+    (0..1 inside the rectangle). Returns (a, b, P_world), or None if the ray
+    is parallel to the plane or points away from it.
+    """
+    O = np.asarray(origin, dtype=float)
+    D = _normalize(np.asarray(direction, dtype=float))
+    N = _normalize(np.asarray(normal, dtype=float))
+    denom = float(np.dot(N, D))
+    if abs(denom) <= 1e-6:
+        return None
+    t = float(np.dot(N, (np.asarray(center, dtype=float) - O)) / denom)
+    if t <= 0.0:
+        return None
+    P = O + t * D
+    p0, p1, p2, p3 = [np.asarray(p, dtype=float) for p in corners]
+    u = p1 - p0
+    v = p3 - p0
+    wv = P - p0
+    u_len2 = float(np.dot(u, u)); v_len2 = float(np.dot(v, v))
+    if u_len2 <= 1e-9 or v_len2 <= 1e-9:
+        return None
+    return float(np.dot(wv, u) / u_len2), float(np.dot(wv, v) / v_len2), P
+
+
 def mouse_mover():
     """
     Thread worker to move the OS mouse to mouse_target when mouse_control_enabled is True.
     (Original script started this thread at module import; here we only define it.)
     """
     global mouse_control_enabled
+    import pyautogui
+    with mouse_lock:
+        if mouse_target == [0, 0]:
+            width, height = get_monitor_size()
+            mouse_target[:] = [width // 2, height // 2]
     while True:
         if mouse_control_enabled:
             with mouse_lock:
@@ -0,0 +1,162 @@
+# src/tracking/screen_mapping.py
+# Mapeamento olhar -> tela ajustado por perfil numa calibração de 5, 9 ou 16
+# pontos, no lugar da regra linear fixa (±15° de yaw e ±5° de pitch
+# calibrada só no centro). O ajuste é em forma fechada (NumPy), os
+# coeficientes vão para o perfil ("screen_mapping") e a avaliação é
+# vetorizada (um frame no loop do tracker ou uma sessão inteira de uma vez).
+
+import numpy as np
+
+CALIBRATION_POINT_COUNTS = (5, 9, 16)
+POINT_MARGIN = 0.1          # Pontos a 10% das bordas (fração da tela)
+YAW_SCALE_DEG = 15.0        # Normalização dos ângulos para o ajuste (mesma faixa da regra linear)
+PITCH_SCALE_DEG = 5.0
+POLY_RIDGE = 1e-4           # Regularização dos termos quadráticos (estabiliza 9 pontos ruidosos)
+INVERSE_ITERATIONS = 8      # Passos de Newton da inversa do polinômio
+
+HOMOGRAPHY = "homography"
+POLY2 = "poly2"
+
+
+def calibration_points(n: int, margin: float = POINT_MARGIN):
+    """
+    Alvos (u, v) em fração da tela para uma calibração de `n` pontos:
+    5 = centro + 4 cantos; 9 e 16 = grades 3x3 e 4x4 (linha a linha).
+    """
+    lo, hi = margin, 1.0 - margin
+    if n == 5:
+        return np.array([(0.5, 0.5), (lo, lo), (hi, lo), (lo, hi), (hi, hi)])
+    side = {9: 3, 16: 4}.get(n)
+    if side is None:
+        raise ValueError(f"Calibração de {n} pontos não suportada: use {CALIBRATION_POINT_COUNTS}")
+    ticks = np.linspace(lo, hi, side)
+    return np.array([(u, v) for v in ticks for u in ticks])
+
+
+def default_kind(n_points: int):
+    """Homografia com 5 pontos (8 graus de liberdade); polinômio de 2º grau com 9 ou mais."""
+    return HOMOGRAPHY if n_points < 9 else POLY2
+
+
+def _normalize_angles(yaw, pitch):
+    return np.asarray(yaw, dtype=float) / YAW_SCALE_DEG, np.asarray(pitch, dtype=float) / PITCH_SCALE_DEG
+
+
+def _poly_features(a, b):
+    return np.stack([np.ones_like(a), a, b, a * a, a * b, b * b], axis=-1)
+
+
+class ScreenMapping:
+    """
+    Mapeamento dos ângulos calibrados (yaw, pitch em graus, já com os offsets
+    do passo S) para a tela em fração (u, v), 0..1 em cada eixo; quem chama
+    multiplica pela resolução, então o perfil vale em qualquer resolução.
+
+      - "homography": [u, v, 1] ~ H @ [a, b, 1]  (H 3x3, DLT por SVD)
+      - "poly2":      [u, v] = [1, a, b, a², ab, b²] @ C  (C 6x2, mínimos quadrados)
+
+    com a = yaw / 15 e b = pitch / 5 (ângulos normalizados).
+    """
+
+    def __init__(self, kind: str, coefs, rms_error: float = None, n_points: int = None):
+        if kind not in (HOMOGRAPHY, POLY2):
+            raise ValueError(f"Tipo de mapeamento desconhecido: {kind}")
+        self.kind = kind
+        self.coefs = np.asarray(coefs, dtype=float)
+        expected = (3, 3) if kind == HOMOGRAPHY else (6, 2)
+        if self.coefs.shape != expected:
+            raise ValueError(f"Coeficientes de '{kind}' devem ter formato {expected}: {self.coefs.shape}")
+        self.rms_error = rms_error    # Resíduo do ajuste (fração da tela)
+        self.n_points = n_points
+        self._inverse_h = np.linalg.inv(self.coefs) if kind == HOMOGRAPHY else None
+
+    # --- Ajuste ---
+
+    @classmethod
+    def fit(cls, yaw, pitch, u, v, kind: str = None):
+        """Ajusta o mapeamento aos pontos medidos (arrays de mesmo tamanho)."""
+        a, b = _normalize_angles(yaw, pitch)
+        u, v = np.asarray(u, dtype=float), np.asarray(v, dtype=float)
+        kind = kind or default_kind(len(a))
+        if kind == HOMOGRAPHY:
+            if len(a) < 4:
+                raise ValueError("Homografia precisa de pelo menos 4 pontos")
+            zeros, ones = np.zeros_like(a), np.ones_like(a)
+            rows_u = np.stack([a, b, ones, zeros, zeros, zeros, -u * a, -u * b, -u], axis=1)
+            rows_v = np.stack([zeros, zeros, zeros, a, b, ones, -v * a, -v * b, -v], axis=1)
+            _, _, vt = np.linalg.svd(np.vstack([rows_u, rows_v]))
+            H = vt[-1].reshape(3, 3)
+            coefs = H / H[2, 2]
+        else:
+            if len(a) < 6:
+                raise ValueError("Polinômio de 2º grau precisa de pelo menos 6 pontos")
+            X = _poly_features(a, b)
+            ridge = POLY_RIDGE * np.diag([0, 0, 0, 1, 1, 1])  # Só os termos quadráticos
+            coefs = np.linalg.solve(X.T @ X + ridge, X.T @ np.stack([u, v], axis=1))
+        mapping = cls(kind, coefs, n_points=len(a))
+        pu, pv = mapping.map(yaw, pitch)
+        mapping.rms_error = float(np.sqrt(np.mean((pu - u) ** 2 + (pv - v) ** 2)))
+        return mapping
+
+    # --- Avaliação (vetorizada) ---
+
+    def map(self, yaw, pitch):
+        """(u, v) para escalares ou arrays de ângulos."""
+        a, b = _normalize_angles(yaw, pitch)
+        if self.kind == HOMOGRAPHY:
+            H = self.coefs
+            w = H[2, 0] * a + H[2, 1] * b + H[2, 2]
+            return (H[0, 0] * a + H[0, 1] * b + H[0, 2]) / w, (H[1, 0] * a + H[1, 1] * b + H[1, 2]) / w
+        C = self.coefs
+        a2, ab, b2 = a * a, a * b, b * b
+        return (C[0, 0] + C[1, 0] * a + C[2, 0] * b + C[3, 0] * a2 + C[4, 0] * ab + C[5, 0] * b2,
+                C[0, 1] + C[1, 1] * a + C[2, 1] * b + C[3, 1] * a2 + C[4, 1] * ab + C[5, 1] * b2)
+
+    def inverse(self, u, v):
+        """Ângulos (yaw, pitch) que caem em (u, v): exata na homografia, Newton no polinômio."""
+        u, v = np.asarray(u, dtype=float), np.asarray(v, dtype=float)
+        if self.kind == HOMOGRAPHY:
+            Hi = self._inverse_h
+            w = Hi[2, 0] * u + Hi[2, 1] * v + Hi[2, 2]
+            a = (Hi[0, 0] * u + Hi[0, 1] * v + Hi[0, 2]) / w
+            b = (Hi[1, 0] * u + Hi[1, 1] * v + Hi[1, 2]) / w
+            return a * YAW_SCALE_DEG, b * PITCH_SCALE_DEG
+
+        C = self.coefs
+        # Chute inicial: parte afim invertida; depois Newton com o jacobiano analítico
+        affine = C[1:3].T
+        a, b = np.linalg.solve(affine, np.stack([u - C[0, 0], v - C[0, 1]]).reshape(2, -1))
+        a, b = a.reshape(u.shape), b.reshape(u.shape)
+        for _ in range(INVERSE_ITERATIONS):
+            pu, pv = self.map(a * YAW_SCALE_DEG, b * PITCH_SCALE_DEG)
+            du_da = C[1, 0] + 2 * C[3, 0] * a + C[4, 0] * b
+            du_db = C[2, 0] + C[4, 0] * a + 2 * C[5, 0] * b
+            dv_da = C[1, 1] + 2 * C[3, 1] * a + C[4, 1] * b
+            dv_db = C[2, 1] + C[4, 1] * a + 2 * C[5, 1] * b
+            det = du_da * dv_db - du_db * dv_da
+            ru, rv = u - pu, v - pv
+            a = a + (dv_db * ru - du_db * rv) / det
+            b = b + (du_da * rv - dv_da * ru) / det
+        return a * YAW_SCALE_DEG, b * PITCH_SCALE_DEG
+
+    # --- Perfil ---
+
+    def to_dict(self):
+        """Formato salvo no perfil."""
+        return {
+            "kind": self.kind,
+            "coefs": np.round(self.coefs, 9).tolist(),
+            "rms_error": None if self.rms_error is None else round(self.rms_error, 6),
+            "n_points": self.n_points,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Mapeamento salvo no perfil, ou None (perfil sem calibração multiponto ou inválido)."""
+        if not data:
+            return None
+        try:
+            return cls(data["kind"], data["coefs"], data.get("rms_error"), data.get("n_points"))
+        except (KeyError, TypeError, ValueError, np.linalg.LinAlgError) as e:
+            print(f"[Mapeamento] Mapeamento salvo no perfil ignorado: {e}")
+            return None
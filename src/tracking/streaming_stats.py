@@ -0,0 +1,181 @@
+# src/tracking/streaming_stats.py
+# Estruturas O(1) por amostra para séries do tracker (EAR): buffer circular
+# NumPy e estatísticas em fluxo (média/variância de Welford e quantis P²).
+
+import math
+
+import numpy as np
+
+
+class RingBuffer:
+    """Buffer circular de tamanho fixo sobre um array NumPy (append O(1))."""
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._next = 0
+        self._count = 0
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % len(self._data)
+        if self._count < len(self._data):
+            self._count += 1
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+    def values(self):
+        """Cópia das amostras em ordem cronológica (mais antiga primeiro)."""
+        if self._count < len(self._data):
+            return self._data[:self._count].copy()
+        return np.concatenate((self._data[self._next:], self._data[:self._next]))
+
+    def last(self):
+        return self._data[self._next - 1] if self._count else None
+
+
+class RunningStats:
+    """Contagem, média, variância (Welford), mínimo e máximo sem guardar amostras."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Estimador P² (Jain & Chlamtac, 1985) de um quantil `p` em fluxo:
+    cinco marcadores, memória constante e atualização O(1).
+    """
+
+    def __init__(self, p: float):
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"Quantil deve estar em (0, 1): {p}")
+        self.p = p
+        self.reset()
+
+    def reset(self):
+        p = self.p
+        self._initial = []
+        self._q = None                               # Alturas dos marcadores
+        self._n = [0, 1, 2, 3, 4]                    # Posições reais
+        self._np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]  # Posições desejadas
+        self._dn = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def update(self, x: float):
+        if self._q is None:
+            self._initial.append(x)
+            if len(self._initial) == 5:
+                self._q = sorted(self._initial)
+            return
+
+        q, n = self._q, self._n
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._np[i] += self._dn[i]
+
+        # Ajusta os três marcadores internos
+        for i in (1, 2, 3):
+            d = self._np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                qp = self._parabolic(i, d)
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = qp
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self._q, self._n
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self):
+        """Estimativa atual (None sem amostras; exato com menos de 5)."""
+        if self._q is not None:
+            return self._q[2]
+        if not self._initial:
+            return None
+        ordered = sorted(self._initial)
+        return ordered[min(len(ordered) - 1, int(self.p * len(ordered)))]
+
+
+class StreamingStats:
+    """RunningStats + um estimador P² para cada quantil pedido."""
+
+    def __init__(self, quantiles=(0.05, 0.5, 0.95)):
+        self.running = RunningStats()
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def reset(self):
+        self.running.reset()
+        for est in self.quantiles.values():
+            est.reset()
+
+    def update(self, x: float):
+        self.running.update(x)
+        for est in self.quantiles.values():
+            est.update(x)
+
+    @property
+    def count(self):
+        return self.running.count
+
+    def quantile(self, p: float):
+        return self.quantiles[p].value
+
+    def summary(self):
+        """Dicionário serializável (JSON) com o resumo da captura."""
+        r = self.running
+        out = {"count": r.count, "mean": r.mean, "std": r.std,
+               "min": r.min if r.count else None, "max": r.max if r.count else None}
+        for p, est in self.quantiles.items():
+            out[f"p{int(round(100 * p)):02d}"] = est.value
+        return out
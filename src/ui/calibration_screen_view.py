@@ -45,6 +45,7 @@ class CalibrationScreenFrame(tk.Frame):
         action_frame = tk.Frame(self, bg="#222", borderwidth=2, relief="raised")
         # .place() o ancora no canto inferior direito
         action_frame.place(relx=0.99, rely=0.99, anchor="se")
+        self.action_frame = action_frame
 
         tk.Label(action_frame, text=f"Calibrando Perfil:",
                  font=("Arial", 14), bg="#222", fg="white").pack(pady=(10,0), padx=10)
@@ -94,6 +95,22 @@ class CalibrationScreenFrame(tk.Frame):
 
         self._calib_job = self.controller.after(33, self._update_camera_feed)
 
+    def show_target(self, u, v):
+        """
+        Move o '+' para (u, v) em fração da tela (calibração multiponto).
+        Fora do centro o preview some e o painel vai para o canto oposto
+        ao alvo, para não cobrir os pontos perto das bordas.
+        """
+        self.center_dot_label.place_configure(relx=u, rely=v)
+        if (u, v) == (0.5, 0.5):
+            self.camera_feed_label.place(relx=0.01, rely=0.99, anchor="sw")
+            self.action_frame.place_configure(relx=0.99, rely=0.99, anchor="se")
+            return
+        self.camera_feed_label.place_forget()
+        relx, rely = (0.01 if u > 0.5 else 0.99), (0.01 if v > 0.5 else 0.99)
+        anchor = ("n" if rely < 0.5 else "s") + ("w" if relx < 0.5 else "e")
+        self.action_frame.place_configure(relx=relx, rely=rely, anchor=anchor)
+
     def on_destroy(self):
         """Método de limpeza chamado pelo controller antes de destruir."""
         if self._calib_job:
@@ -3,6 +3,10 @@ import tkinter as tk
 import cv2
 from PIL import Image, ImageTk
 
+from tracking.camera_manager import acquire_camera
+from tracking.screen_mapping import CALIBRATION_POINT_COUNTS
+from tracking.head_pose import HEAD_POSE_ESTIMATORS, DEFAULT_HEAD_POSE
+
 PREVIEW_SIZE = (320, 240)
 
 class CalibratorFrame(tk.Frame):
@@ -74,6 +78,21 @@ class CalibratorFrame(tk.Frame):
         tk.OptionMenu(self, self.controller.camera_var, *cam_labels, 
                       command=_on_calib_cam_change).pack(pady=10)
 
+        # --- Pontos de Calibração (opcional: mapeamento ajustado em vários pontos) ---
+        tk.Label(self, text="Pontos de Calibração:",
+                 font=("Arial", 14), bg="#222", fg="white").pack(pady=(10, 5))
+        point_options = ["Só o centro"] + [f"{n} pontos" for n in CALIBRATION_POINT_COUNTS]
+        self.controller.calib_points_var = tk.StringVar(self)
+        self.controller.calib_points_var.set(point_options[0])
+        tk.OptionMenu(self, self.controller.calib_points_var, *point_options).pack(pady=10)
+
+        # --- Pose da Cabeça (fica no perfil; trocar exige nova calibração) ---
+        tk.Label(self, text="Pose da Cabeça:",
+                 font=("Arial", 14), bg="#222", fg="white").pack(pady=(10, 5))
+        self.controller.head_pose_var = tk.StringVar(self)
+        self.controller.head_pose_var.set(HEAD_POSE_ESTIMATORS[DEFAULT_HEAD_POSE])
+        tk.OptionMenu(self, self.controller.head_pose_var, *HEAD_POSE_ESTIMATORS.values()).pack(pady=10)
+
         # --- Botão Criar ---
         tk.Button(self, text="Criar Novo Perfil e Calibrar",
                   font=("Arial", 18), command=self.controller.run_calibration).pack(pady=20)
@@ -91,13 +110,13 @@ class CalibratorFrame(tk.Frame):
 
     def _start_calib_preview(self, cam_index: int):
         self._stop_calib_preview()
-        self._calib_cap = cv2.VideoCapture(cam_index)
+        self._calib_cap = acquire_camera(cam_index)  # Compartilhada com o tracker
         self._calib_preview_loop()
 
     def _calib_preview_loop(self):
         if not self._calib_cap:
             return
-        ret, frame = self._calib_cap.read()
+        ret, frame = self._calib_cap.read_latest()
         if ret:
             frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             img = Image.fromarray(frame).resize(PREVIEW_SIZE)
@@ -56,7 +56,6 @@ class DashboardFrame(tk.Frame):
         active_profile = "Nenhum (Calibração Volátil)"
         if self.controller.tracker and getattr(self.controller.tracker, "loaded_profile_name", None):
             active_profile = self.controller.tracker.loaded_profile_name
-        mon = self.controller.get_active_monitor()
 
         header = tk.Frame(self, bg=self.cor_fundo)
         header.pack(fill="x", padx=20, pady=(10, 0))
@@ -66,9 +65,9 @@ class DashboardFrame(tk.Frame):
                  font=("Poppins", 22, "bold"),
                  bg=self.cor_fundo, fg="white").pack(side="left")
 
-        tk.Label(header,
-                 text=f"Perfil: {active_profile}   |   Monitor: {self.controller.selected_monitor_index} ({mon.width}x{mon.height})",
-                 font=("Poppins", 14), bg=self.cor_fundo, fg="white").pack(side="right")
+        self.profile_label = tk.Label(header, font=("Poppins", 14), bg=self.cor_fundo, fg="white")
+        self.profile_label.pack(side="right")
+        self.update_profile_label(active_profile)
 
         # Área central: grade 2x2 de tiles grandes
         grid_frame = tk.Frame(self, bg=self.cor_fundo)
@@ -142,6 +141,12 @@ class DashboardFrame(tk.Frame):
         """Atualiza o texto do label de status (ativado/desativado)."""
         self.status_label.config(text=text)
 
+    def update_profile_label(self, profile_name):
+        """Atualiza o perfil/monitor do cabeçalho (troca de perfil nas Configurações)."""
+        mon = self.controller.get_active_monitor()
+        self.profile_label.config(
+            text=f"Perfil: {profile_name}   |   Monitor: {self.controller.selected_monitor_index} ({mon.width}x{mon.height})")
+
     def on_destroy(self):
         """Método de limpeza chamado pelo controller."""
         pass
\ No newline at end of file
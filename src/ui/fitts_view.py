@@ -0,0 +1,150 @@
+# src/ui/fitts_view.py
+import tkinter as tk
+
+from interaction.fitts import FittsSession, FITTS_TRIAL_TIMEOUT
+
+
+class FittsFrame(tk.Frame):
+    """
+    A "Visão" (View) do Teste de Seleção (lei de Fitts).
+    Mostra um círculo de alvos; o alvo da vez fica laranja e deve ser
+    selecionado com olhar + piscada. Os cliques chegam pelo controller
+    (on_gaze_click) e as medidas ficam na FittsSession (interaction/fitts.py).
+    """
+    BG = "#111111"
+    TARGET_BG = "#555555"
+    ACTIVE_BG = "#FF8C00"
+
+    def __init__(self, parent, controller):
+        self.controller = controller
+        super().__init__(parent, bg=self.BG)
+
+        self.info_label = tk.Label(self, text="Teste de Seleção: olhe o alvo laranja e pisque para clicar.",
+                                   font=("Poppins", 16, "bold"), bg=self.BG, fg="white")
+        self.info_label.pack(side="top", pady=10)
+        self.progress_label = tk.Label(self, text="", font=("Poppins", 12), bg=self.BG, fg="#BBBBBB")
+        self.progress_label.pack(side="top")
+
+        self.session = None
+        self.targets = []
+        self._focusable_widgets = []  # Mesma lista usada pelo controller (alterada no lugar)
+        self._last_gaze = None        # Último olhar antes da piscada (coordenadas do frame)
+        self._timeout_job = None
+        self._show_job = None
+        self._start_job = self.after(300, self._start)
+
+    # --- Sessão ---
+
+    def _start(self):
+        self._start_job = None
+        self.update_idletasks()
+        center = (self.winfo_width() / 2, self.winfo_height() / 2 + 30)
+        self.session = FittsSession(center)
+        self._build_targets()
+        self._timeout_job = self.after(500, self._check_timeout)
+
+    def _build_targets(self):
+        for t in self.targets:
+            t.destroy()
+        _, width = self.session.condition
+        self.targets = []
+        for x, y in self.session.positions():
+            btn = tk.Button(self, bg=self.TARGET_BG, activebackground=self.TARGET_BG,
+                            bd=0, relief="flat", highlightthickness=0)
+            btn.place(x=x - width / 2, y=y - width / 2, width=width, height=width)
+            self.targets.append(btn)
+        self._focusable_widgets[:] = self.targets
+        self._show_current()
+
+    def _show_current(self):
+        """Destaca o próximo alvo assim que o congelamento pós-clique termina."""
+        self._show_job = None
+        if self.controller.click_machine.frozen:
+            for btn in self.targets:
+                btn.configure(bg=self.TARGET_BG, activebackground=self.TARGET_BG)
+            self.progress_label.config(text="Aguarde...")
+            self._show_job = self.after(50, self._show_current)
+            return
+        current = self.session.target_index()
+        for i, btn in enumerate(self.targets):
+            color = self.ACTIVE_BG if i == current else self.TARGET_BG
+            btn.configure(bg=color, activebackground=color)
+        distance, width = self.session.condition
+        step = "alvo inicial" if self.session.step == 0 else f"alvo {self.session.step}/{self.session.n_targets}"
+        self.progress_label.config(
+            text=f"Condição {self.session.condition_index + 1}/{len(self.session.conditions)} "
+                 f"(distância {distance}px, largura {width}px) — {step}")
+        self.session.present()
+
+    def _advance(self, clicked_index):
+        condition = self.session.condition_index
+        # Ponto final: olhar de antes da piscada (histórico do tracker) ou a última amostra
+        end = self._last_gaze
+        point = self.controller.blink_gaze_point if clicked_index is not None else None
+        if point is not None:
+            end = (point[0] - self.winfo_rootx(), point[1] - self.winfo_rooty())
+        self.session.record(clicked_index, end, self.controller.get_gaze_latency())
+        if self.session.finished:
+            self._finish()
+        elif self.session.condition_index != condition:
+            self._build_targets()
+        else:
+            self._show_current()
+
+    def _check_timeout(self):
+        self._timeout_job = None
+        if self.session is None or self.session.finished:
+            return
+        if self._show_job is None and self.session.timed_out():
+            print(f"[Fitts] Sem seleção em {FITTS_TRIAL_TIMEOUT:.0f}s: contado como erro.")
+            self._advance(None)
+        self._timeout_job = self.after(500, self._check_timeout)
+
+    def _finish(self):
+        for t in self.targets:
+            t.destroy()
+        self.targets = []
+        summary = self.session.summary()
+        self.controller.save_fitts_results(summary)
+
+        lines = ["Resultado do Teste de Seleção", ""]
+        if summary["throughput_bps"] is not None:
+            lines.append(f"Vazão efetiva: {summary['throughput_bps']:.2f} bits/s")
+        if summary["mean_mt"] is not None:
+            lines.append(f"Tempo médio por alvo: {summary['mean_mt']:.2f} s")
+        if summary["error_rate"] is not None:
+            lines.append(f"Erros: {100 * summary['error_rate']:.0f}%")
+        if summary["tracker_latency_ms"] is not None:
+            lines.append(f"Latência do tracker: {summary['tracker_latency_ms']:.0f} ms")
+        self.info_label.config(text="\n".join(lines))
+        self.progress_label.config(text="Resultados salvos no perfil.")
+
+        back = tk.Button(self, text="Voltar", font=("Poppins", 18, "bold"), width=12,
+                         command=self.controller.create_dashboard)
+        back.pack(pady=40)
+        self._focusable_widgets[:] = [back]
+
+    # --- Métodos para o controller acessar ---
+
+    def get_focusable_widgets(self):
+        return self._focusable_widgets
+
+    def on_gaze_sample(self, x, y):
+        """Olhar atual em coordenadas de tela (só chega fora das piscadas)."""
+        self._last_gaze = (x - self.winfo_rootx(), y - self.winfo_rooty())
+
+    def on_gaze_click(self, widget):
+        """Clique por piscada num alvo. Retorna True se a tela tratou o clique."""
+        if self.session is None or self.session.finished or widget not in self.targets:
+            return False
+        if self._show_job:
+            return True  # Alvo ainda não apresentado: ignora
+        self._advance(self.targets.index(widget))
+        return True
+
+    def on_destroy(self):
+        """Método de limpeza chamado pelo controller."""
+        for job in (self._start_job, self._timeout_job, self._show_job):
+            if job:
+                try: self.after_cancel(job)
+                except tk.TclError: pass
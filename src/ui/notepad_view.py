@@ -1,6 +1,18 @@
 # src/ui/notepad_view.py
 import tkinter as tk
 
+from interaction.scan_order import SUGGESTION_LABEL
+
+# Layout das teclas (QWERTY)
+KEY_ROWS = [
+    ['`', '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=', 'Backspace'],
+    ['Tab', 'q', 'w', 'e', 'r', 't', 'y', 'u', 'i', 'o', 'p', '[', ']', '\\'],
+    ['Caps', 'a', 's', 'd', 'f', 'g', 'h', 'j', 'k', 'l', ';', "'", 'Enter'],
+    ['Shift', 'z', 'x', 'c', 'v', 'b', 'n', 'm', ',', '.', '/', 'Shift'],
+    ['Space']
+]
+SUGGESTION_COUNT = 4  # Botões na linha de sugestões de palavras
+
 
 class NotepadFrame(tk.Frame):
     """
@@ -16,6 +28,8 @@ class NotepadFrame(tk.Frame):
         # Lista de widgets que esta tela expõe ao tracker
         self._focusable_widgets = []
         self._scan_key_list = []  # Lista interna para teclas
+        self._scan_rows = []      # Índices (em _scan_key_list) de cada linha do teclado
+        self._suggestion_buttons = []
 
         # --- Layout Principal ---
         main_frame = tk.Frame(self, bg=self.cor_fundo)
@@ -133,18 +147,25 @@ class NotepadFrame(tk.Frame):
         special_key_style["bg"] = "#CCCCCC"
         special_key_style["highlightbackground"] = "#CCCCCC" # Cor de fundo especial
 
-        # Layout das teclas (QWERTY)
-        key_rows = [
-            ['`', '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=', 'Backspace'],
-            ['Tab', 'q', 'w', 'e', 'r', 't', 'y', 'u', 'i', 'o', 'p', '[', ']', '\\'],
-            ['Caps', 'a', 's', 'd', 'f', 'g', 'h', 'j', 'k', 'l', ';', "'", 'Enter'],
-            ['Shift', 'z', 'x', 'c', 'v', 'b', 'n', 'm', ',', '.', '/', 'Shift'],
-            ['Space']
-        ]
-
-        for r_idx, row in enumerate(key_rows):
+        # Linha de sugestões (predição de palavras): primeira linha do scanner
+        suggestion_style = key_style.copy()
+        suggestion_style["font"] = ("Arial", 16, "bold")
+        suggestion_frame = tk.Frame(parent_frame, bg=parent_frame.cget("bg"))
+        suggestion_frame.pack(fill="x")
+        self._scan_rows.append([])
+        for i in range(SUGGESTION_COUNT):
+            btn = tk.Button(suggestion_frame, text="", **suggestion_style,
+                            command=lambda i=i: self.controller.accept_suggestion(i))
+            btn.pack(side="left", fill="x", expand=True, padx=2, pady=2)
+            self._scan_rows[-1].append(len(self._scan_key_list))
+            self._scan_key_list.append(btn)
+            self._suggestion_buttons.append(btn)
+            self._focusable_widgets.append(btn)  # Também selecionáveis pelo snap
+
+        for r_idx, row in enumerate(KEY_ROWS):
             row_frame = tk.Frame(parent_frame, bg=parent_frame.cget("bg"))
             row_frame.pack(fill="x")
+            self._scan_rows.append([])
 
             for key_char in row:
                 is_special = len(key_char) > 1 or not key_char.isalnum()
@@ -157,6 +178,7 @@ class NotepadFrame(tk.Frame):
 
                 btn.pack(side="left", fill="x", expand=True, padx=2, pady=2)
                 
+                self._scan_rows[-1].append(len(self._scan_key_list))
                 self._scan_key_list.append(btn)
 
                 if key_char == 'Shift':
@@ -225,6 +247,7 @@ class NotepadFrame(tk.Frame):
 
         # 2. AUDIO (NOVO BLOCO)
         if action_performed:
+            self.controller.record_key_press(key_char)  # Aprende a ordem de varredura
             self.controller.play_sound('key')
         # FIM DO NOVO BLOCO
 
@@ -240,6 +263,20 @@ class NotepadFrame(tk.Frame):
         """Retorna a lista ordenada de teclas para o scanner."""
         return self._scan_key_list
 
+    def get_scan_rows(self):
+        """Retorna as linhas do teclado como listas de índices de get_scan_keys()."""
+        return self._scan_rows
+
+    def get_scan_labels(self):
+        """Rótulo de cada tecla de get_scan_keys() (as sugestões têm um rótulo fixo)."""
+        return [SUGGESTION_LABEL if btn in self._suggestion_buttons else btn.cget("text")
+                for btn in self._scan_key_list]
+
+    def set_suggestions(self, words):
+        """Atualiza o texto dos botões de sugestão (vazios quando não há palavra)."""
+        for i, btn in enumerate(self._suggestion_buttons):
+            btn.configure(text=words[i] if i < len(words) else "")
+
     def update_status_label(self, text):
         self.status_label.config(text=text)
 